@@ -0,0 +1,176 @@
+"""Deterministic stand-ins for the network and audio devices"""
+import asyncio
+import json
+import os
+import random
+import re
+import time
+from typing import AsyncIterator, Dict, Optional, Tuple
+
+import numpy as np
+
+from constants import SAMPLE_RATE
+from llm_provider import GroqProvider
+from rate_limiter import RateLimitScheduler
+from stt_backends import STTBackend
+from tts_backends import TTSBackend
+
+_COMMAND = re.compile(r'Parse the command: "(.*)"')
+_SPOKEN = re.compile(r"voice assistant for accounts receivable")
+_TARGET = re.compile(r"\bto ([A-Za-z0-9 &'.-]+?)\s*$", re.IGNORECASE)
+
+EMAIL_BODY = (
+    "Dear customer,\n\nThis is a friendly reminder that your invoice is now "
+    "past due. Please arrange payment at your earliest convenience.\n\n"
+    "Kind regards,\nAccounts Receivable"
+)
+
+SPOKEN_ANSWER = (
+    "I can check your overdue invoices or read the aging report. "
+    "I can also send payment reminders to one customer or to all of them."
+)
+
+class FakeGroqProvider(GroqProvider):
+    """GroqProvider with the network call replaced by a seeded sleep
+
+    Cache, scheduler, retry, hedging and fallback logic are the real ones;
+    only _request and _stream_request are faked. A tail_rate share of
+    calls takes tail_latency instead, an error_rate share fails, and the
+    fallback model answers in fallback_latency, failing at
+    fallback_error_rate (error_rate unless given). Streams yield their first
+    word after that latency and one word per token_interval after it.
+    Parse prompts get a keyword-based JSON answer, spoken-reply prompts a
+    fixed answer and everything else a fixed reminder email.
+    """
+
+    def __init__(
+        self,
+        latency: float = 0.2,
+        jitter: float = 0.05,
+        seed: int = 0,
+        cache=None,
+        max_concurrency: int = 64,
+        error_rate: float = 0.0,
+        tail_rate: float = 0.0,
+        tail_latency: float = 2.0,
+        fallback_latency: Optional[float] = None,
+        fallback_error_rate: Optional[float] = None,
+        token_interval: float = 0.01,
+        **kwargs
+    ):
+        os.environ.setdefault("GROQ_API_KEY", "benchmark")
+        # Quotas far above anything a benchmark sends; concurrency still applies
+        scheduler = RateLimitScheduler(1e9, 1e12, max_concurrency)
+        super().__init__(cache=cache, scheduler=scheduler, **kwargs)
+        self.latency = latency
+        self.jitter = jitter
+        self.error_rate = error_rate
+        self.tail_rate = tail_rate
+        self.tail_latency = tail_latency
+        self.fallback_latency = latency / 2 if fallback_latency is None else fallback_latency
+        self.fallback_error_rate = error_rate if fallback_error_rate is None else fallback_error_rate
+        self.token_interval = token_interval
+        self._rng = random.Random(seed)
+        self.calls = 0
+        self.errors = 0
+        self.seconds = 0.0
+
+    async def _request(
+        self, model: str, prompt: str, max_tokens: int, temperature: float
+    ) -> Tuple[str, Optional[int]]:
+        await self._wait(model)
+        text = self._answer(prompt)
+        return text, len(prompt) // 4 + len(text) // 4
+
+    async def _stream_request(
+        self, model: str, prompt: str, max_tokens: int, temperature: float
+    ) -> AsyncIterator[str]:
+        await self._wait(model)
+        for i, word in enumerate(self._answer(prompt).split(" ")):
+            if i:
+                await asyncio.sleep(self.token_interval)
+            # Tokens carry their leading space, like the real API
+            yield word if not i else " " + word
+
+    async def _wait(self, model: str):
+        """Sleep for one call's latency, then fail if this call was picked to"""
+        primary = model == self.model
+        base = self.latency if primary else self.fallback_latency
+        if self._rng.random() < self.tail_rate:
+            base = self.tail_latency
+        delay = max(0.0, base + self._rng.uniform(-self.jitter, self.jitter))
+        failed = self._rng.random() < (self.error_rate if primary else self.fallback_error_rate)
+        start = time.perf_counter()
+        try:
+            await asyncio.sleep(delay)
+        finally:
+            self.calls += 1
+            self.seconds += time.perf_counter() - start
+        if failed:
+            self.errors += 1
+            raise ConnectionError(f"injected failure from {model}")
+
+    def _answer(self, prompt: str) -> str:
+        if _COMMAND.search(prompt):
+            return self._parse_answer(prompt)
+        if _SPOKEN.search(prompt):
+            return SPOKEN_ANSWER
+        return EMAIL_BODY
+
+    @staticmethod
+    def _parse_answer(prompt: str) -> str:
+        command = _COMMAND.search(prompt).group(1).lower()
+        answer: Dict[str, Optional[str]] = {"intent": "other", "company_name": None}
+        if "remind" in command:
+            target = _TARGET.search(command)
+            if "everyone" in command or "all" in command.split():
+                answer["intent"] = "remind_all"
+            else:
+                answer["intent"] = "send_reminder"
+                if target and target.group(1) not in ("them", "him", "her", "it"):
+                    answer["company_name"] = target.group(1).title()
+        elif "aging" in command:
+            answer["intent"] = "aging_summary"
+        elif "invoice" in command or "overdue" in command or "owe" in command:
+            answer["intent"] = "check_invoices"
+        elif "help" in command or "can you" in command:
+            answer["intent"] = "help"
+        return json.dumps(answer)
+
+class FakeSTTBackend(STTBackend):
+    """Returns the expected transcript at a fixed real-time speed
+
+    The harness sets transcript before each utterance, since the fake
+    cannot actually recognize the fixture audio.
+    """
+
+    name = "fake-stt"
+
+    def __init__(self, speed: float = 10.0):
+        super().__init__(model_size="fake")
+        self.simulated_speed = speed
+        self.transcript = ""
+
+    def _load(self):
+        return object()
+
+    def _transcribe(self, audio: np.ndarray) -> str:
+        time.sleep(len(audio) / SAMPLE_RATE / self.simulated_speed)
+        return self.transcript
+
+class FakeTTSBackend(TTSBackend):
+    """Silence of a plausible length, produced at a fixed real-time factor"""
+
+    name = "fake-tts"
+    sample_rate = 22050
+    words_per_second = 2.5
+
+    def __init__(self, rtf: float = 0.1):
+        super().__init__()
+        self.simulated_rtf = rtf
+
+    def _synthesize(self, text: str) -> Tuple[np.ndarray, int]:
+        duration = max(0.3, len(text.split()) / self.words_per_second)
+        time.sleep(duration * self.simulated_rtf)
+        frames = int(duration * self.sample_rate)
+        return np.zeros((frames, 1), dtype=np.float32), self.sample_rate
@@ -0,0 +1,55 @@
+"""WAV fixtures standing in for the microphone
+
+Real recordings can be dropped into benchmarks/fixtures/ as 16 kHz WAV
+files listed in fixtures.json ({"file.wav": "expected transcript"}).
+Otherwise speech-like fixtures are generated: a short lead-in of room
+noise, a voiced burst as long as the command would take to say, and
+trailing silence for the endpointer to detect.
+"""
+import json
+from pathlib import Path
+from typing import List, Tuple
+
+import numpy as np
+import soundfile as sf
+
+from constants import SAMPLE_RATE
+
+FIXTURE_DIR = Path(__file__).resolve().parent / "fixtures"
+MANIFEST = "fixtures.json"
+
+COMMANDS = [
+    "check overdue invoices",
+    "show me the aging report",
+    "send a reminder to Acme Corp",
+    "send them a reminder too",
+    "what can you do",
+    "how is our cash flow looking this month",
+]
+
+def _speech_like(text: str, seed: int) -> np.ndarray:
+    rng = np.random.default_rng(seed)
+    words = len(text.split())
+    voiced = int(SAMPLE_RATE * (0.35 * words + 0.2))
+    t = np.arange(voiced) / SAMPLE_RATE
+    # A wandering pitch with syllable-rate amplitude modulation
+    pitch = 140 + 30 * np.sin(2 * np.pi * 0.7 * t)
+    envelope = 0.5 + 0.5 * np.abs(np.sin(2 * np.pi * 3.5 * t))
+    burst = 0.25 * envelope * np.sin(2 * np.pi * np.cumsum(pitch) / SAMPLE_RATE)
+    lead = 0.002 * rng.standard_normal(int(SAMPLE_RATE * 0.3))
+    tail = 0.002 * rng.standard_normal(int(SAMPLE_RATE * 1.0))
+    return np.concatenate([lead, burst, tail]).astype(np.float32)
+
+def load_fixtures(directory: Path = FIXTURE_DIR) -> List[Tuple[Path, str]]:
+    """(wav path, expected transcript) pairs, generating them if missing"""
+    manifest = directory / MANIFEST
+    if not manifest.exists():
+        directory.mkdir(parents=True, exist_ok=True)
+        entries = {}
+        for i, text in enumerate(COMMANDS):
+            name = f"command_{i:02d}.wav"
+            sf.write(directory / name, _speech_like(text, seed=i), SAMPLE_RATE)
+            entries[name] = text
+        manifest.write_text(json.dumps(entries, indent=2))
+    entries = json.loads(manifest.read_text())
+    return [(directory / name, text) for name, text in entries.items()]
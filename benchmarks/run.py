@@ -0,0 +1,361 @@
+"""Offline end-to-end latency benchmarks
+
+    python benchmarks/run.py
+    python benchmarks/run.py --ledger-sizes 1000 100000 --concurrency 1 8 32 \\
+        --llm-latency-ms 250 --llm-jitter-ms 80
+    python benchmarks/run.py --baseline benchmarks/results/previous.json
+
+Agent runs drive InvoiceAgent.process from concurrent sessions against a
+seeded fake Groq provider and MockMCPClient, at each ledger size and
+concurrency level. The voice run feeds WAV fixtures through
+listen_from_wav -> process_stream -> speak_stream with playback stubbed
+out, so "agent" is the time to the first reply chunk and "first_audio" is
+when the first sentence would start playing.
+
+Results (per-stage p50/p95/p99, throughput, settings, git revision) are
+written as JSON; --baseline prints the change against an earlier file.
+"""
+import argparse
+import asyncio
+import json
+import platform
+import random
+import subprocess
+import sys
+import time
+from collections import defaultdict
+from datetime import datetime, timezone
+from pathlib import Path
+from typing import Dict, List
+
+ROOT = Path(__file__).resolve().parent.parent
+sys.path.insert(0, str(ROOT / "src"))
+
+from loguru import logger  # noqa: E402
+
+from agent import InvoiceAgent  # noqa: E402
+from llm_cache import CompletionCache  # noqa: E402
+from session import Session  # noqa: E402
+from conversation import ConversationContext  # noqa: E402
+from utils.timing import percentile  # noqa: E402
+from fakes import FakeGroqProvider, FakeSTTBackend, FakeTTSBackend  # noqa: E402
+from fixtures import load_fixtures  # noqa: E402
+
+RESULTS_DIR = Path(__file__).resolve().parent / "results"
+# Differences below this are timer noise, whatever the ratio
+NOISE_FLOOR_MS = 0.5
+
+class StageTimes:
+    """Durations per stage name"""
+
+    def __init__(self):
+        self.samples: Dict[str, List[float]] = defaultdict(list)
+
+    def add(self, stage: str, seconds: float):
+        self.samples[stage].append(seconds)
+
+    def summary(self) -> dict:
+        return {
+            stage: {
+                "count": len(values),
+                "mean_ms": round(sum(values) / len(values) * 1000, 2),
+                "p50_ms": round(percentile(values, 50) * 1000, 2),
+                "p95_ms": round(percentile(values, 95) * 1000, 2),
+                "p99_ms": round(percentile(values, 99) * 1000, 2),
+            }
+            for stage, values in sorted(self.samples.items())
+        }
+
+class TimedMCP:
+    """Times every call_tool; everything else passes through"""
+
+    def __init__(self, mcp, stages: StageTimes):
+        self._mcp = mcp
+        self._stages = stages
+
+    def __getattr__(self, name):
+        return getattr(self._mcp, name)
+
+    async def call_tool(self, server: str, tool: str, params=None):
+        start = time.perf_counter()
+        try:
+            return await self._mcp.call_tool(server, tool, params)
+        finally:
+            elapsed = time.perf_counter() - start
+            self._stages.add("mcp", elapsed)
+            self._stages.add(f"mcp.{tool}", elapsed)
+
+def time_llm(llm: FakeGroqProvider, stages: StageTimes):
+    """Record every complete() and stream() call, cache hits included"""
+    complete, stream = llm.complete, llm.stream
+
+    async def timed(*args, **kwargs):
+        start = time.perf_counter()
+        try:
+            return await complete(*args, **kwargs)
+        finally:
+            stages.add("llm", time.perf_counter() - start)
+
+    async def timed_stream(*args, **kwargs):
+        start = time.perf_counter()
+        try:
+            async for token in stream(*args, **kwargs):
+                yield token
+        finally:
+            stages.add("llm.stream", time.perf_counter() - start)
+
+    llm.complete = timed
+    llm.stream = timed_stream
+
+class BenchConfig(dict):
+    """Config stand-in: plain settings, no .env or validation"""
+
+    def get(self, key, default=None):
+        return super().get(key, default)
+
+def build_agent(args, ledger_size: int, stages: StageTimes) -> InvoiceAgent:
+    from mcp_client_mock import MockMCPClient
+
+    config = BenchConfig(
+        MOCK_LEDGER_SIZE=ledger_size,
+        BULK_REMINDER_CHECKPOINT=None,
+        LLM_CACHE_ENABLED=args.llm_cache,
+        SPECULATION_ENABLED=not args.no_speculation
+    )
+    llm = FakeGroqProvider(
+        latency=args.llm_latency_ms / 1000,
+        jitter=args.llm_jitter_ms / 1000,
+        seed=args.seed,
+        cache=CompletionCache.from_config(config),
+        error_rate=args.llm_error_rate,
+        tail_rate=args.llm_tail_rate,
+        tail_latency=args.llm_tail_ms / 1000,
+        fallback_model=args.fallback_model
+    )
+    time_llm(llm, stages)
+    start = time.perf_counter()
+    mcp = MockMCPClient(config)
+    stages.add("setup.ledger", time.perf_counter() - start)
+    return InvoiceAgent(config, llm=llm, mcp=TimedMCP(mcp, stages))
+
+def session_script(rng: random.Random, customers: List[str], turns: int) -> List[str]:
+    """A plausible conversation: lookups, a named reminder and a follow-up"""
+    script = []
+    for i in range(turns):
+        step = i % 5
+        if step == 0:
+            script.append("check overdue invoices")
+        elif step == 1:
+            script.append("show me the aging report")
+        elif step == 2:
+            script.append(f"send a reminder to {rng.choice(customers)}")
+        elif step == 3:
+            script.append("send them a reminder again")
+        else:
+            script.append("what can you do")
+    return script
+
+async def run_agent(args, ledger_size: int, concurrency: int) -> dict:
+    stages = StageTimes()
+    agent = build_agent(args, ledger_size, stages)
+    start = time.perf_counter()
+    await agent.warm_up()
+    stages.add("setup.warm_up", time.perf_counter() - start)
+    rng = random.Random(args.seed)
+    customers = agent.mcp.store.customers()
+
+    async def user(script: List[str]):
+        session = Session(context=ConversationContext())
+        for text in script:
+            turn_start = time.perf_counter()
+            await agent.process(text, session)
+            stages.add("turn", time.perf_counter() - turn_start)
+
+    scripts = [session_script(rng, customers, args.turns) for _ in range(concurrency)]
+    start = time.perf_counter()
+    await asyncio.gather(*(user(script) for script in scripts))
+    elapsed = time.perf_counter() - start
+    await agent.aclose()
+
+    turns = concurrency * args.turns
+    return {
+        "kind": "agent",
+        "ledger_size": ledger_size,
+        "concurrency": concurrency,
+        "turns": turns,
+        "elapsed_s": round(elapsed, 3),
+        "throughput_tps": round(turns / elapsed, 2) if elapsed else 0.0,
+        "llm_calls": agent.llm.calls,
+        "llm_errors": agent.llm.errors,
+        "stages": stages.summary(),
+    }
+
+async def run_voice(args, ledger_size: int) -> dict:
+    from voice_handler import VoiceHandler
+
+    stages = StageTimes()
+    agent = build_agent(args, ledger_size, stages)
+    await agent.warm_up()
+    # Constructing the real backends is cheap; fakes replace them before loading
+    voice = VoiceHandler(BenchConfig(
+        STT_BACKEND=args.stt, TTS_BACKEND=args.tts, TTS_CACHE_ENABLED=False
+    ))
+    if args.stt == "fake":
+        voice.stt = FakeSTTBackend(speed=args.stt_speed)
+    if args.tts == "fake":
+        voice.tts = FakeTTSBackend(rtf=args.tts_rtf)
+    await voice.start_loading()
+
+    first_audio = {}
+
+    async def play(pcm, sample_rate):
+        first_audio.setdefault("at", time.perf_counter())
+
+    voice._play = play
+    session = Session(context=ConversationContext())
+    fixtures = load_fixtures()
+    for _ in range(args.voice_rounds):
+        for path, transcript in fixtures:
+            if isinstance(voice.stt, FakeSTTBackend):
+                voice.stt.transcript = transcript
+            first_audio.clear()
+            start = time.perf_counter()
+            text = await voice.listen_from_wav(str(path))
+            heard = time.perf_counter()
+            answered = {}
+
+            async def reply():
+                async for chunk in agent.process_stream(text, session):
+                    answered.setdefault("at", time.perf_counter())
+                    yield chunk
+
+            await voice.speak_stream(reply())
+            spoken = time.perf_counter()
+            answered = answered.get("at", spoken)
+            stages.add("stt", heard - start)
+            stages.add("agent", answered - heard)
+            stages.add("tts.first_audio", first_audio.get("at", spoken) - answered)
+            stages.add("tts.total", spoken - answered)
+            stages.add("turn.first_audio", first_audio.get("at", spoken) - start)
+
+    voice.cleanup()
+    await agent.aclose()
+    return {
+        "kind": "voice",
+        "ledger_size": ledger_size,
+        "turns": args.voice_rounds * len(fixtures),
+        "stt": voice.stt.stats(),
+        "tts": voice.tts.stats(),
+        "stages": stages.summary(),
+    }
+
+def git_revision() -> str:
+    try:
+        return subprocess.run(
+            ["git", "rev-parse", "--short", "HEAD"],
+            cwd=ROOT, capture_output=True, text=True, check=True
+        ).stdout.strip()
+    except (OSError, subprocess.CalledProcessError):
+        return "unknown"
+
+def compare(results: dict, baseline: dict, threshold: float):
+    """Print p50/p99 changes for runs present in both files"""
+    def key(run):
+        return (run["kind"], run["ledger_size"], run.get("concurrency"))
+
+    previous = {key(run): run for run in baseline.get("runs", [])}
+    print(f"\nAgainst {baseline.get('revision', '?')} (flagging changes over {threshold:.0%}):")
+    for run in results["runs"]:
+        old = previous.get(key(run))
+        if old is None:
+            continue
+        for stage, stats in run["stages"].items():
+            before = old["stages"].get(stage)
+            if not before:
+                continue
+            for metric in ("p50_ms", "p99_ms"):
+                if not before[metric] or abs(stats[metric] - before[metric]) < NOISE_FLOOR_MS:
+                    continue
+                change = stats[metric] / before[metric] - 1
+                flag = "  <-- slower" if change > threshold else ""
+                if abs(change) > threshold:
+                    print(
+                        f"  {key(run)} {stage} {metric}: "
+                        f"{before[metric]} -> {stats[metric]} ({change:+.0%}){flag}"
+                    )
+
+def print_run(run: dict):
+    label = f"{run['kind']} ledger={run['ledger_size']}"
+    if run["kind"] == "agent":
+        label += f" concurrency={run['concurrency']} ({run['throughput_tps']} turns/s)"
+    print(f"\n{label}")
+    for stage, stats in run["stages"].items():
+        print(
+            f"  {stage:<28} n={stats['count']:<5} p50 {stats['p50_ms']:>9.2f} ms"
+            f"  p95 {stats['p95_ms']:>9.2f} ms  p99 {stats['p99_ms']:>9.2f} ms"
+        )
+
+async def main():
+    parser = argparse.ArgumentParser(description="Offline latency benchmarks")
+    parser.add_argument("--ledger-sizes", type=int, nargs="+", default=[0, 10000])
+    parser.add_argument("--concurrency", type=int, nargs="+", default=[1, 8, 32])
+    parser.add_argument("--turns", type=int, default=10, help="turns per session")
+    parser.add_argument("--llm-latency-ms", type=float, default=200.0)
+    parser.add_argument("--llm-jitter-ms", type=float, default=50.0)
+    parser.add_argument("--llm-cache", action="store_true", help="enable the completion cache")
+    parser.add_argument("--llm-error-rate", type=float, default=0.0,
+                        help="share of fake LLM calls that fail")
+    parser.add_argument("--llm-tail-rate", type=float, default=0.0,
+                        help="share of fake LLM calls that take --llm-tail-ms")
+    parser.add_argument("--llm-tail-ms", type=float, default=2000.0)
+    parser.add_argument("--fallback-model", default="",
+                        help="fallback model name (answers in half the LLM latency)")
+    parser.add_argument("--no-speculation", action="store_true",
+                        help="run agent stages strictly in sequence")
+    parser.add_argument("--voice-rounds", type=int, default=2,
+                        help="passes over the WAV fixtures (0 skips the voice run)")
+    parser.add_argument("--stt", default="fake", help="fake, whisper or faster-whisper")
+    parser.add_argument("--stt-speed", type=float, default=10.0,
+                        help="fake STT: audio seconds per wall second")
+    parser.add_argument("--tts", default="fake", help="fake, gtts, piper or espeak")
+    parser.add_argument("--tts-rtf", type=float, default=0.1, help="fake TTS real-time factor")
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument("--output", type=Path, help="results file (default: results/<time>.json)")
+    parser.add_argument("--baseline", type=Path, help="earlier results file to compare with")
+    parser.add_argument("--threshold", type=float, default=0.10,
+                        help="relative change reported by --baseline")
+    args = parser.parse_args()
+
+    logger.remove()
+    logger.add(sys.stderr, level="WARNING")
+
+    runs = []
+    for ledger_size in args.ledger_sizes:
+        for concurrency in args.concurrency:
+            runs.append(await run_agent(args, ledger_size, concurrency))
+            print_run(runs[-1])
+        if args.voice_rounds:
+            runs.append(await run_voice(args, ledger_size))
+            print_run(runs[-1])
+
+    results = {
+        "revision": git_revision(),
+        "created_at": datetime.now(timezone.utc).isoformat(timespec="seconds"),
+        "python": platform.python_version(),
+        "machine": platform.machine(),
+        "settings": {
+            key: str(value) if isinstance(value, Path) else value
+            for key, value in vars(args).items()
+        },
+        "runs": runs,
+    }
+    output = args.output or RESULTS_DIR / f"{datetime.now():%Y%m%d-%H%M%S}-{results['revision']}.json"
+    output.parent.mkdir(parents=True, exist_ok=True)
+    output.write_text(json.dumps(results, indent=2))
+    print(f"\nResults written to {output}")
+
+    if args.baseline:
+        compare(results, json.loads(args.baseline.read_text()), args.threshold)
+
+if __name__ == "__main__":
+    asyncio.run(main())
@@ -0,0 +1,95 @@
+"""Load-test the multi-session agent server
+
+    python src/server.py &
+    python scripts/load_test.py --sessions 200 --turns 5 --concurrency 50
+
+Each simulated user opens a session and sends a few commands in turn.
+Reports throughput, p50/p99 latency and how many requests were shed.
+"""
+import argparse
+import asyncio
+import json
+import random
+import sys
+import time
+from collections import Counter
+from pathlib import Path
+
+import httpx
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent / "src"))
+from utils.timing import percentile  # noqa: E402
+
+COMMANDS = [
+    "check overdue invoices",
+    "how much is overdue",
+    "show me the aging report",
+    "send a reminder to Acme Corp",
+    "what can you do",
+]
+
+async def run_user(
+    client: httpx.AsyncClient, commands: list, turns: int, latencies: list, statuses: Counter
+):
+    response = await client.post("/sessions")
+    statuses[response.status_code] += 1
+    if response.status_code != 200:
+        return
+    session_id = response.json()["session_id"]
+    for _ in range(turns):
+        start = time.perf_counter()
+        response = await client.post(
+            f"/sessions/{session_id}/messages", json={"text": random.choice(commands)}
+        )
+        statuses[response.status_code] += 1
+        if response.status_code == 200:
+            latencies.append(time.perf_counter() - start)
+
+async def main():
+    parser = argparse.ArgumentParser(description="Load-test the agent server")
+    parser.add_argument("--url", default="http://127.0.0.1:8080")
+    parser.add_argument("--sessions", type=int, default=100, help="simulated users")
+    parser.add_argument("--turns", type=int, default=5, help="messages per user")
+    parser.add_argument("--concurrency", type=int, default=50, help="users active at once")
+    parser.add_argument("--command", action="append", dest="commands",
+                        help="command to send (repeatable); defaults to a built-in mix")
+    parser.add_argument("--json", action="store_true", help="print results as JSON")
+    args = parser.parse_args()
+
+    latencies, statuses = [], Counter()
+    limits = httpx.Limits(max_connections=args.concurrency, max_keepalive_connections=args.concurrency)
+    gate = asyncio.Semaphore(args.concurrency)
+
+    async def user():
+        async with gate:
+            await run_user(client, args.commands or COMMANDS, args.turns, latencies, statuses)
+
+    async with httpx.AsyncClient(base_url=args.url, limits=limits, timeout=60) as client:
+        start = time.perf_counter()
+        await asyncio.gather(*(user() for _ in range(args.sessions)))
+        elapsed = time.perf_counter() - start
+        health = (await client.get("/health")).json()
+
+    results = {
+        "sessions": args.sessions,
+        "turns": len(latencies),
+        "elapsed_s": round(elapsed, 2),
+        "throughput_rps": round(len(latencies) / elapsed, 1) if elapsed else 0.0,
+        "p50_ms": round(percentile(latencies, 50) * 1000, 1),
+        "p99_ms": round(percentile(latencies, 99) * 1000, 1),
+        "status_codes": dict(statuses),
+        "server": health,
+    }
+    if args.json:
+        print(json.dumps(results, indent=2))
+        return
+    print(
+        f"{results['turns']} turns in {results['elapsed_s']}s "
+        f"({results['throughput_rps']} req/s) | "
+        f"p50 {results['p50_ms']} ms | p99 {results['p99_ms']} ms | "
+        f"status {results['status_codes']} | "
+        f"rejected {health['rejected']}, sessions {health['sessions']['active']}"
+    )
+
+if __name__ == "__main__":
+    asyncio.run(main())
@@ -10,7 +10,6 @@ setup(
         "gtts>=2.5.0",
         "sounddevice>=0.4.6",
         "soundfile>=0.12.1",
-        "pydub>=0.25.1",
         "httpx>=0.26.0",
         "pydantic>=2.5.0",
         "python-dotenv>=1.0.0",
@@ -18,6 +17,12 @@ setup(
         "loguru>=0.7.0",
         "rich>=13.7.0",
     ],
+    extras_require={
+        # Local CPU text-to-speech (TTS_BACKEND=piper)
+        "local-tts": ["piper-tts>=1.2.0"],
+        # Quantized CTranslate2 Whisper (STT_BACKEND=faster-whisper)
+        "fast-stt": ["faster-whisper>=1.0.0"],
+    },
     python_requires=">=3.8",
     author="Utkarsh Singh",
     author_email="utkarsh.workmail.1@gmail.com",
@@ -1,9 +1,19 @@
-from typing import Optional
-from pydantic import BaseModel
+import asyncio
+from typing import AsyncIterator, Optional, Union
 from loguru import logger
 
 from llm_provider import GroqProvider
+from mcp_client import MCPClient
 from mcp_client_mock import MockMCPClient
+from models import Invoice
+from bulk_reminders import BulkReminderRunner
+from overdue_summary import OverdueSummary
+from session import Session
+from speculation import Speculator
+from resilience import Deadline
+from conversation import ConversationContext
+from utils.tracing import tracer
+from utils.logger import ThrottledLogger
 from utils.formatters import (
     format_currency_for_voice,
     format_email_for_voice, 
@@ -14,60 +24,139 @@ from utils.validators import (
     validate_company_name,
     validate_email_content
 )
-from prompts.system_prompts import SystemPrompts
 from prompts.templates import EmailTemplates
+from prompts.responses import Responses
+from prompts.system_prompts import SystemPrompts
+from command_parser import ParsedCommand, build_parse_prompt, parse_command_response
+from intent_classifier import LocalIntentClassifier
 from exceptions import ValidationError, LLMError, MCPError
-from constants import MAX_INVOICES_TO_DISPLAY, MAX_TOKENS_INTENT
+from constants import (
+    MAX_INVOICES_TO_DISPLAY, MAX_TOKENS_PARSE, MAX_TOKENS_REPLY, PRIORITY_BACKGROUND,
+    BULK_REMINDER_CONCURRENCY, BULK_REMINDER_BATCH_SIZE, BULK_REMINDER_CHECKPOINT_TTL,
+    INVOICE_PAGE_SIZE,
+    OVERDUE_SUMMARY_TTL, LLM_TURN_DEADLINE, LLM_PARSE_DEADLINE
+)
+
+# Intents safe to act on from the local guess when the LLM is unavailable
+_CANNED_INTENTS = {"check_invoices", "aging_summary", "help"}
 
-class Invoice(BaseModel):
-    id: str
-    customer_name: str
-    customer_email: str
-    amount: float
-    due_date: str
-    status: str
-    days_overdue: int = 0
+_bulk_log = ThrottledLogger()
 
 class InvoiceAgent:
-    def __init__(self, config):
+    """Invoice assistant; one instance can serve many sessions
+    
+    The LLM provider, MCP client and caches are shared by every session.
+    Per-conversation state lives in a Session passed to process(); the
+    single-user REPLs use the built-in default session.
+    """
+    
+    def __init__(self, config, llm: Optional[GroqProvider] = None, mcp=None):
         self.config = config
-        self.llm = GroqProvider()
-        self.mcp = MockMCPClient(config)
-        self.conversation_history = []
+        self.llm = llm or GroqProvider.from_config(config)
+        if mcp is not None:
+            self.mcp = mcp
+        elif config.get("MCP_MODE") == "http":
+            self.mcp = MCPClient(config)
+        else:
+            self.mcp = MockMCPClient(config)
+        self.overdue = OverdueSummary(
+            self.mcp, ttl=config.get("OVERDUE_SUMMARY_TTL", OVERDUE_SUMMARY_TTL)
+        )
+        self.bulk_reminders = BulkReminderRunner(
+            self.llm,
+            self.mcp,
+            concurrency=config.get("BULK_REMINDER_CONCURRENCY", BULK_REMINDER_CONCURRENCY),
+            batch_size=config.get("BULK_REMINDER_BATCH_SIZE", BULK_REMINDER_BATCH_SIZE),
+            checkpoint_path=config.get("BULK_REMINDER_CHECKPOINT"),
+            checkpoint_ttl=config.get(
+                "BULK_REMINDER_CHECKPOINT_TTL", BULK_REMINDER_CHECKPOINT_TTL
+            )
+        )
+        self.fast_path = LocalIntentClassifier(config.get("FAST_PATH_CONFIDENCE", 0.85))
+        self.speculate = config.get("SPECULATION_ENABLED", True)
+        self.turn_deadline = config.get("LLM_TURN_DEADLINE", LLM_TURN_DEADLINE)
+        self.parse_deadline = config.get("LLM_PARSE_DEADLINE", LLM_PARSE_DEADLINE)
+        self._customers_loaded = False
+        # One bulk run at a time across all sessions; they share the checkpoint
+        self._bulk_lock = asyncio.Lock()
+        self.session = Session("local", ConversationContext.from_config(config))
         logger.info("Agent initialized")
     
-    async def process(self, user_input: str) -> str:
+    async def warm_up(self):
+        """Prepare MCP-backed state before the first request"""
+        await self._load_customers()
+    
+    async def aclose(self):
+        """Release pooled LLM and MCP connections"""
+        await self.llm.aclose()
+        await self.mcp.aclose()
+    
+    async def process(self, user_input: str, session: Optional[Session] = None) -> str:
         """Process user request with validation"""
+        return "".join([chunk async for chunk in self.process_stream(user_input, session)])
+    
+    async def process_stream(
+        self, user_input: str, session: Optional[Session] = None
+    ) -> AsyncIterator[str]:
+        """Like process(), yielding the reply as it is produced
+        
+        Open-ended requests get a generated answer streamed token by token,
+        so speech can start on its first sentence; every other reply
+        arrives as one chunk. Iterate it to the end from a single task.
+        """
+        session = session or self.session
+        async with tracer.turn("agent.process"):
+            async with session.lock:
+                session.turns += 1
+                try:
+                    response = await self._process(user_input, session)
+                    if isinstance(response, str):
+                        yield response
+                    else:
+                        async for chunk in response:
+                            yield chunk
+                finally:
+                    session.touch()
+    
+    async def _process(
+        self, user_input: str, session: Session
+    ) -> Union[str, AsyncIterator[str]]:
+        spec = Speculator()
+        # Budget for this turn's LLM calls; MCP keeps its own timeouts
+        deadline = Deadline(self.turn_deadline)
         try:
             # Validate input
             user_input = validate_user_input(user_input)
             
-            # Add to conversation history
-            self.conversation_history.append({
-                "role": "user",
-                "content": user_input
-            })
-            
-            # Classify intent
-            intent = await self._classify_intent(user_input)
+            # Intent and entities in a single LLM call
+            async with tracer.span("agent.parse"):
+                command = await self._parse_command(
+                    user_input, session.context, spec, deadline
+                )
             
             # Route to handler
-            if intent == "check_invoices":
-                response = await self._handle_check_invoices()
-            elif intent == "send_reminder":
-                company = await self._extract_company_name(user_input)
-                if company:
-                    response = await self._handle_send_reminder(company)
+            async with tracer.span(f"agent.{command.intent}"):
+                if command.intent == "check_invoices":
+                    response = await self._handle_check_invoices(spec)
+                elif command.intent == "aging_summary":
+                    response = await self._handle_aging_summary(spec)
+                elif command.intent == "send_reminder":
+                    if command.company_name:
+                        response = await self._handle_send_reminder(
+                            command.company_name, spec, deadline
+                        )
+                    else:
+                        response = Responses.ASK_COMPANY
+                elif command.intent == "remind_all":
+                    response = await self._handle_bulk_reminders()
+                elif command.intent == "other":
+                    # Streams after this returns; it records the turn itself
+                    return self._spoken_reply(user_input, command, session.context, deadline)
                 else:
-                    response = "Which company should I send a reminder to?"
-            else:
-                response = "I can check invoices or send reminders. What would you like?"
-            
-            # Add response to history
-            self.conversation_history.append({
-                "role": "assistant",
-                "content": response
-            })
+                    response = Responses.HELP
+            
+            # Remember the turn for follow-ups like "send them a reminder"
+            session.context.record(user_input, response, command)
             
             return response
             
@@ -76,54 +165,122 @@ class InvoiceAgent:
             return f"Invalid input: {str(e)}"
         except LLMError as e:
             logger.error(f"LLM error: {e}")
-            return "I'm having trouble understanding. Please try again."
+            return Responses.LLM_ERROR
         except MCPError as e:
             logger.error(f"MCP error: {e}")
-            return "I'm having trouble accessing invoice data. Please try again."
+            return Responses.MCP_ERROR
         except Exception as e:
             logger.error(f"Unexpected error: {e}")
-            return "An unexpected error occurred. Please try again."
+            return Responses.UNEXPECTED_ERROR
+        finally:
+            spec.cancel_rest()
+            spec.report()
     
-    async def _classify_intent(self, text: str) -> str:
-        """Classify user intent"""
-        prompt = SystemPrompts.INTENT_CLASSIFICATION.format(user_input=text)
+    async def _parse_command(
+        self,
+        text: str,
+        context: ConversationContext,
+        spec: Optional[Speculator] = None,
+        deadline: Optional[Deadline] = None
+    ) -> ParsedCommand:
+        """Classify intent and extract entities in one completion"""
+        await self._load_customers()
+        command = self.fast_path.try_resolve(text)
+        if command:
+            tracer.count("agent.fast_path")
+            return context.resolve(text, command)
+        
+        if spec is not None and self.speculate:
+            self._start_speculation(text, context, spec)
+        # Without the LLM, fall back on the local guess unless it would act
+        guess, _ = self.fast_path.classify(text)
+        fallback = guess.model_dump_json() if guess.intent in _CANNED_INTENTS else None
+        # Context is capped by its token budget, so the prompt stays small
         response = await self.llm.complete(
-            prompt, 
-            max_tokens=MAX_TOKENS_INTENT,
-            temperature=0.1
+            build_parse_prompt(text, context.render()),
+            max_tokens=MAX_TOKENS_PARSE,
+            temperature=0,
+            deadline=deadline.child(self.parse_deadline) if deadline is not None else None,
+            fallback=fallback
         )
+        command = context.resolve(text, parse_command_response(response))
+        logger.debug("Parsed command: {}", command)
+        return command
+    
+    def _start_speculation(self, text: str, context: ConversationContext, spec: Speculator):
+        """Start the read-only lookups the LLM's answer will most likely need
         
-        intent = response.strip().lower()
-        valid = ["check_invoices", "send_reminder", "help", "other"]
-        return intent if intent in valid else "other"
+        Only used when the fast path misses, so the guesses run hidden
+        behind the parse completion. Whatever the parsed intent does not
+        use is cancelled at the end of the turn.
+        """
+        guess, _ = self.fast_path.classify(text)
+        company = (
+            guess.company_name
+            or self.fast_path.mentioned_company(text)
+            or context.resolve(text, guess).company_name
+        )
+        if company:
+            spec.start(f"search:{company}", self._search_overdue(company))
+        if guess.intent == "aging_summary":
+            spec.start("aging", self._fetch_aging_summary())
+        elif not company and self.overdue.stale:
+            spec.start("overdue", self.overdue.ensure_fresh())
     
-    async def _handle_check_invoices(self) -> str:
+    async def _spoken_reply(
+        self, text: str, command: ParsedCommand, context: ConversationContext, deadline: Deadline
+    ) -> AsyncIterator[str]:
+        """Short generated answer for requests no handler covers"""
+        rendered = context.render()
+        prompt = SystemPrompts.SPOKEN_REPLY.format(
+            context=SystemPrompts.PARSE_CONTEXT.format(context=rendered) if rendered else "",
+            user_input=text
+        )
+        parts = []
+        async for chunk in self.llm.stream(
+            prompt, max_tokens=MAX_TOKENS_REPLY, temperature=0.3,
+            deadline=deadline, fallback=Responses.HELP
+        ):
+            parts.append(chunk)
+            yield chunk
+        context.record(text, "".join(parts), command)
+    
+    async def _load_customers(self):
+        """Give the fast path the known customer list (once)"""
+        if self._customers_loaded:
+            return
+        try:
+            customers = await self.mcp.call_tool("stripe", "list_customers")
+            self.fast_path.set_customers(customers)
+            self._customers_loaded = True
+        except Exception as e:
+            logger.warning(f"Could not load customers for fast path: {e}")
+    
+    async def _handle_check_invoices(self, spec: Speculator) -> str:
         """Fetch and report overdue invoices"""
         try:
-            invoices_data = await self.mcp.call_tool(
-                "stripe", "list_invoices", {"status": "past_due"}
-            )
-            
-            if not invoices_data:
-                return "No overdue invoices!"
+            # Answered from the in-process summary; MCP is only hit when stale
+            await spec.take("overdue", self.overdue.ensure_fresh)
+            summary = self.overdue.snapshot(MAX_INVOICES_TO_DISPLAY)
+            count = summary["count"]
             
-            invoices = [Invoice(**inv) for inv in invoices_data]
-            total = sum(inv.amount for inv in invoices)
+            if not count:
+                return Responses.NO_OVERDUE
             
-            response = f"You have {len(invoices)} overdue invoice"
-            response += "s" if len(invoices) > 1 else ""
-            response += f", totaling {format_currency_for_voice(total)}. "
+            response = f"You have {count} overdue invoice"
+            response += "s" if count > 1 else ""
+            response += f", totaling {format_currency_for_voice(summary['total'])}. "
             
-            # Show top N invoices
-            for inv in invoices[:MAX_INVOICES_TO_DISPLAY]:
+            # Show the largest N invoices
+            for inv in (Invoice(**row) for row in summary["top"]):
                 response += (
                     f"{inv.customer_name}, "
                     f"{format_currency_for_voice(inv.amount)}, "
                     f"due {format_date_for_voice(inv.due_date)}. "
                 )
             
-            if len(invoices) > MAX_INVOICES_TO_DISPLAY:
-                response += f"And {len(invoices) - MAX_INVOICES_TO_DISPLAY} more. "
+            if count > MAX_INVOICES_TO_DISPLAY:
+                response += f"And {count - MAX_INVOICES_TO_DISPLAY} more. "
             
             return response
             
@@ -131,22 +288,53 @@ class InvoiceAgent:
             logger.error(f"Error fetching invoices: {e}")
             raise MCPError("Failed to fetch invoice data")
     
-    async def _handle_send_reminder(self, company_name: str) -> str:
+    async def _handle_aging_summary(self, spec: Speculator) -> str:
+        """Report overdue balances by age bucket and the largest debtors"""
+        try:
+            summary = await spec.take("aging", self._fetch_aging_summary)
+        except Exception as e:
+            logger.error(f"Error fetching aging summary: {e}")
+            raise MCPError("Failed to fetch aging summary")
+        
+        if not summary["count"]:
+            return Responses.NO_OVERDUE
+        
+        response = (
+            f"Aging for {summary['count']} overdue invoices, "
+            f"totaling {format_currency_for_voice(summary['total'])}. "
+        )
+        for bucket in summary["buckets"]:
+            if bucket["count"]:
+                label = bucket["label"].replace("-", " to ").replace("+", " plus")
+                response += (
+                    f"{label} days: {bucket['count']}, "
+                    f"{format_currency_for_voice(bucket['total'])}. "
+                )
+        
+        debtors = ", ".join(
+            f"{c['customer_name']} with {format_currency_for_voice(c['total'])}"
+            for c in summary["top_customers"]
+        )
+        response += f"Largest balances: {debtors}."
+        return response
+    
+    async def _handle_send_reminder(
+        self, company_name: str, spec: Speculator, deadline: Optional[Deadline] = None
+    ) -> str:
         """Send payment reminder email"""
         try:
             # Validate company name
             company_name = validate_company_name(company_name)
             
-            invoice_data = await self.mcp.call_tool(
-                "stripe", "search_invoices",
-                {"customer_name": company_name, "status": "past_due"}
+            invoice_data = await spec.take(
+                f"search:{company_name}", lambda: self._search_overdue(company_name)
             )
             
             if not invoice_data:
                 return f"No overdue invoices for {company_name}."
             
             invoice = Invoice(**invoice_data[0])
-            email_body = await self._generate_reminder_email(invoice)
+            email_body = await self._generate_reminder_email(invoice, deadline)
             
             # Validate email content
             if not validate_email_content(email_body):
@@ -169,27 +357,83 @@ class InvoiceAgent:
             logger.error(f"Error sending reminder: {e}")
             raise MCPError("Failed to send reminder")
     
-    async def _generate_reminder_email(self, invoice: Invoice) -> str:
-        """Generate polite payment reminder"""
-        prompt = EmailTemplates.PAYMENT_REMINDER.format(
+    async def _fetch_aging_summary(self) -> dict:
+        return await self.mcp.call_tool(
+            "stripe", "aging_summary", {
+                "status": "past_due",
+                "top_customers": MAX_INVOICES_TO_DISPLAY
+            }
+        )
+    
+    async def _search_overdue(self, company_name: str) -> list:
+        return await self.mcp.call_tool(
+            "stripe", "search_invoices",
+            {"customer_name": company_name, "status": "past_due"}
+        )
+    
+    async def _list_all_invoices(self, status: str) -> list:
+        """Page through list_invoices with the MCP cursor"""
+        invoices, cursor = [], None
+        while True:
+            params = {"status": status, "limit": INVOICE_PAGE_SIZE}
+            if cursor:
+                params["cursor"] = cursor
+            page = await self.mcp.call_tool("stripe", "list_invoices", params)
+            invoices.extend(Invoice(**row) for row in page["data"])
+            cursor = page.get("next_cursor")
+            if not page.get("has_more") or not cursor:
+                return invoices
+    
+    async def _handle_bulk_reminders(self) -> str:
+        """Remind every overdue customer with one consolidated email each"""
+        if self._bulk_lock.locked():
+            return Responses.BULK_ALREADY_RUNNING
+        async with self._bulk_lock:
+            return await self._run_bulk_reminders()
+    
+    async def _run_bulk_reminders(self) -> str:
+        try:
+            invoices = await self._list_all_invoices("past_due")
+            
+            sent, failed = [], []
+            async for outcome in self.bulk_reminders.run(invoices):
+                (sent if outcome.status == "sent" else failed).append(outcome)
+                _bulk_log.info(
+                    "Bulk reminder {}: {} {}",
+                    len(sent) + len(failed), outcome.customer_name, outcome.status
+                )
+            
+        except Exception as e:
+            logger.error(f"Error sending bulk reminders: {e}")
+            raise MCPError("Failed to send bulk reminders")
+        
+        if not sent and not failed:
+            return Responses.NO_CUSTOMERS_TO_REMIND
+        
+        response = f"Sent reminders to {len(sent)} customer"
+        response += "s" if len(sent) != 1 else ""
+        response += f" covering {sum(len(o.invoice_ids) for o in sent)} invoices. "
+        if failed:
+            names = ", ".join(o.customer_name for o in failed[:MAX_INVOICES_TO_DISPLAY])
+            response += f"{len(failed)} failed, including {names}. Ask again to retry them."
+        return response
+    
+    async def _generate_reminder_email(
+        self, invoice: Invoice, deadline: Optional[Deadline] = None
+    ) -> str:
+        """Generate polite payment reminder; a plain template if the LLM is out of time"""
+        fields = dict(
             customer_name=invoice.customer_name,
             invoice_id=invoice.id,
             amount=invoice.amount,
             due_date=invoice.due_date,
             days_overdue=invoice.days_overdue
         )
-        return await self.llm.complete(prompt, max_tokens=400, temperature=0.7)
-    
-    async def _extract_company_name(self, text: str) -> Optional[str]:
-        """Extract company name from user input"""
-        prompt = f'Extract company name from: "{text}". Return only the name or "NONE".'
-        company = await self.llm.complete(prompt, max_tokens=50, temperature=0)
-        company = company.strip()
-        
-        if company == "NONE":
-            return None
-        
-        try:
-            return validate_company_name(company)
-        except ValidationError:
-            return None
+        async with tracer.span("agent.email"):
+            return await self.llm.complete(
+                EmailTemplates.PAYMENT_REMINDER.format(**fields),
+                max_tokens=400, temperature=0.7,
+                use_cache=False, priority=PRIORITY_BACKGROUND,
+                deadline=deadline,
+                fallback=EmailTemplates.FALLBACK_REMINDER.format(**fields)
+            )
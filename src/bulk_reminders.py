@@ -0,0 +1,208 @@
+"""Bulk "remind all overdue customers" workflow"""
+import asyncio
+import time
+import uuid
+from itertools import zip_longest
+from pathlib import Path
+from typing import AsyncIterator, Dict, List, Optional, Set
+from pydantic import BaseModel
+from loguru import logger
+
+from models import Invoice
+from prompts.templates import EmailTemplates
+from utils.validators import validate_email_content
+from constants import (
+    MAX_TOKENS_EMAIL, PRIORITY_BACKGROUND,
+    BULK_REMINDER_CONCURRENCY, BULK_REMINDER_BATCH_SIZE, BULK_REMINDER_CHECKPOINT_TTL
+)
+
+class ReminderOutcome(BaseModel):
+    """Result of reminding one customer"""
+    customer_name: str
+    customer_email: str
+    invoice_ids: List[str]
+    total: float
+    status: str  # "sent" or "failed"
+    error: Optional[str] = None
+
+class _Checkpoint(BaseModel):
+    """Progress of one run: the invoices already reminded"""
+    run_id: str
+    created_at: float
+    sent_invoice_ids: List[str] = []
+
+class _Draft(BaseModel):
+    invoices: List[Invoice]
+    body: Optional[str] = None
+    error: Optional[str] = None
+
+class BulkReminderRunner:
+    """Draft and send one consolidated reminder per overdue customer
+    
+    Drafts are generated concurrently (bounded by concurrency) and sent
+    in batches as they complete. Invoice ids are checkpointed after every
+    batch, so an interrupted run resumes where it stopped: invoices sent
+    by it are skipped, and anything newly overdue is reminded as well.
+    A checkpoint is discarded once older than checkpoint_ttl.
+    """
+
+    def __init__(
+        self,
+        llm,
+        mcp,
+        concurrency: int = BULK_REMINDER_CONCURRENCY,
+        batch_size: int = BULK_REMINDER_BATCH_SIZE,
+        checkpoint_path: Optional[str] = None,
+        checkpoint_ttl: float = BULK_REMINDER_CHECKPOINT_TTL
+    ):
+        self.llm = llm
+        self.mcp = mcp
+        self.concurrency = concurrency
+        self.batch_size = batch_size
+        self.checkpoint_path = Path(checkpoint_path) if checkpoint_path else None
+        self.checkpoint_ttl = checkpoint_ttl
+
+    async def run(self, invoices: List[Invoice]) -> AsyncIterator[ReminderOutcome]:
+        """Yield an outcome per customer as each batch is sent"""
+        checkpoint = self._load_checkpoint()
+        # Paid invoices stay recorded, in case they fall overdue again this run
+        sent = set(checkpoint.sent_invoice_ids)
+        skipped = [inv for inv in invoices if inv.id in sent]
+        groups = self._group(inv for inv in invoices if inv.id not in sent)
+        if skipped:
+            logger.info(
+                f"Resuming bulk reminder run {checkpoint.run_id}, "
+                f"{len(skipped)} invoices already sent"
+            )
+        logger.info(f"Bulk reminders ({checkpoint.run_id}): {len(groups)} customers to remind")
+
+        semaphore = asyncio.Semaphore(self.concurrency)
+        tasks = [asyncio.create_task(self._draft(group, semaphore)) for group in groups]
+        batch: List[_Draft] = []
+        failures = 0
+        try:
+            for next_draft in asyncio.as_completed(tasks):
+                batch.append(await next_draft)
+                if len(batch) < self.batch_size:
+                    continue
+                for outcome in await self._send_batch(batch, checkpoint, sent):
+                    failures += outcome.status != "sent"
+                    yield outcome
+                batch = []
+            if batch:
+                for outcome in await self._send_batch(batch, checkpoint, sent):
+                    failures += outcome.status != "sent"
+                    yield outcome
+        finally:
+            for task in tasks:
+                task.cancel()
+
+        # Clean run: the next one starts fresh. Otherwise keep the
+        # checkpoint so asking again only retries the failures.
+        if not failures and self.checkpoint_path and self.checkpoint_path.exists():
+            self.checkpoint_path.unlink()
+
+    @staticmethod
+    def _group(invoices) -> List[List[Invoice]]:
+        """One group per customer email, largest balances first"""
+        by_customer: Dict[str, List[Invoice]] = {}
+        for invoice in invoices:
+            by_customer.setdefault(invoice.customer_email.lower(), []).append(invoice)
+        return sorted(by_customer.values(), key=lambda g: -sum(inv.amount for inv in g))
+
+    async def _draft(self, invoices: List[Invoice], semaphore: asyncio.Semaphore) -> _Draft:
+        """Generate one consolidated email; failures are recorded, not raised"""
+        lines = "\n".join(
+            EmailTemplates.INVOICE_LINE.format(
+                invoice_id=inv.id,
+                amount=inv.amount,
+                due_date=inv.due_date,
+                days_overdue=inv.days_overdue
+            )
+            for inv in invoices
+        )
+        prompt = EmailTemplates.CONSOLIDATED_REMINDER.format(
+            customer_name=invoices[0].customer_name,
+            invoice_lines=lines,
+            total=sum(inv.amount for inv in invoices)
+        )
+        async with semaphore:
+            try:
+                body = await self.llm.complete(
+                    prompt, max_tokens=MAX_TOKENS_EMAIL, temperature=0.7,
+                    use_cache=False, priority=PRIORITY_BACKGROUND
+                )
+            except Exception as e:
+                return _Draft(invoices=invoices, error=f"Draft failed: {e}")
+        if not validate_email_content(body):
+            return _Draft(invoices=invoices, error="Generated email content failed validation")
+        return _Draft(invoices=invoices, body=body)
+
+    async def _send_batch(
+        self, drafts: List[_Draft], checkpoint: _Checkpoint, sent: Set[str]
+    ) -> List[ReminderOutcome]:
+        """Send the ready drafts in one batched MCP call"""
+        ready = [d for d in drafts if d.body is not None]
+        messages = [
+            {
+                "to": d.invoices[0].customer_email,
+                "subject": "Payment Reminder - " + ", ".join(inv.id for inv in d.invoices),
+                "body": d.body
+            }
+            for d in ready
+        ]
+        errors: Dict[int, str] = {}
+        if messages:
+            try:
+                results = await self.mcp.call_tool("gmail", "send_batch", {"messages": messages})
+                for draft, result in zip_longest(ready, results or []):
+                    if draft is None:
+                        break
+                    if result is None:
+                        # Unconfirmed: leave it out of the checkpoint so it is retried
+                        errors[id(draft)] = "No send result returned"
+                    elif result.get("status") != "sent":
+                        errors[id(draft)] = result.get("error", "Send failed")
+            except Exception as e:
+                logger.error(f"Batch send failed: {e}")
+                errors.update({id(d): f"Send failed: {e}" for d in ready})
+
+        outcomes = []
+        for draft in drafts:
+            error = draft.error or errors.get(id(draft))
+            if error is None:
+                sent.update(inv.id for inv in draft.invoices)
+            outcomes.append(ReminderOutcome(
+                customer_name=draft.invoices[0].customer_name,
+                customer_email=draft.invoices[0].customer_email,
+                invoice_ids=[inv.id for inv in draft.invoices],
+                total=sum(inv.amount for inv in draft.invoices),
+                status="failed" if error else "sent",
+                error=error
+            ))
+        checkpoint.sent_invoice_ids = sorted(sent)
+        self._save_checkpoint(checkpoint)
+        return outcomes
+
+    def _load_checkpoint(self) -> _Checkpoint:
+        """The unfinished run, else a fresh one"""
+        fresh = _Checkpoint(run_id=uuid.uuid4().hex[:12], created_at=time.time())
+        if not self.checkpoint_path or not self.checkpoint_path.exists():
+            return fresh
+        try:
+            checkpoint = _Checkpoint.model_validate_json(self.checkpoint_path.read_text())
+        except ValueError as e:
+            logger.warning(f"Ignoring unreadable reminder checkpoint: {e}")
+            return fresh
+        if time.time() - checkpoint.created_at > self.checkpoint_ttl:
+            logger.info(f"Discarding expired reminder checkpoint {checkpoint.run_id}")
+            return fresh
+        return checkpoint
+
+    def _save_checkpoint(self, checkpoint: _Checkpoint):
+        if not self.checkpoint_path:
+            return
+        self.checkpoint_path.parent.mkdir(parents=True, exist_ok=True)
+        tmp = self.checkpoint_path.with_suffix(".tmp")
+        tmp.write_text(checkpoint.model_dump_json())
+        tmp.replace(self.checkpoint_path)
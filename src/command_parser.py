@@ -0,0 +1,80 @@
+"""Structured command parsing (intent + entities in one LLM call)"""
+import json
+import re
+from typing import Optional
+from pydantic import BaseModel, field_validator
+from loguru import logger
+
+from prompts.system_prompts import SystemPrompts
+from utils.validators import validate_company_name
+from exceptions import ValidationError
+
+_JSON_OBJECT = re.compile(r"\{.*\}", re.DOTALL)
+_EMPTY_VALUES = {"", "none", "null", "n/a", "unknown"}
+
+class ParsedCommand(BaseModel):
+    """Validated result of parsing one user command"""
+    intent: str = "other"
+    company_name: Optional[str] = None
+    invoice_id: Optional[str] = None
+    amount: Optional[float] = None
+
+    @field_validator("intent", mode="before")
+    @classmethod
+    def _normalize_intent(cls, value):
+        intent = str(value or "").strip().lower()
+        return intent if intent in SystemPrompts.INTENTS else "other"
+
+    @field_validator("company_name", "invoice_id", mode="before")
+    @classmethod
+    def _normalize_empty(cls, value):
+        if value is None or str(value).strip().lower() in _EMPTY_VALUES:
+            return None
+        return str(value).strip()
+
+    @field_validator("company_name")
+    @classmethod
+    def _validate_company(cls, value):
+        if value is None:
+            return None
+        try:
+            return validate_company_name(value)
+        except ValidationError:
+            return None
+
+    @field_validator("amount", mode="before")
+    @classmethod
+    def _parse_amount(cls, value):
+        try:
+            return float(str(value).replace("$", "").replace(",", ""))
+        except (TypeError, ValueError):
+            return None
+
+def build_parse_prompt(user_input: str, context: str = "") -> str:
+    """Build the single-call parsing prompt, optionally with conversation context"""
+    return SystemPrompts.COMMAND_PARSING.format(
+        context=SystemPrompts.PARSE_CONTEXT.format(context=context) if context else "",
+        user_input=user_input,
+        intents=", ".join(SystemPrompts.INTENTS),
+        fields=", ".join(ParsedCommand.model_fields)
+    )
+
+def parse_command_response(raw: str) -> ParsedCommand:
+    """Parse LLM output into a ParsedCommand, falling back on bare labels"""
+    match = _JSON_OBJECT.search(raw or "")
+    if match:
+        try:
+            data = json.loads(match.group(0))
+            if isinstance(data, dict):
+                return ParsedCommand.model_validate(data)
+        except ValueError as e:
+            logger.warning(f"Malformed parser output: {e}")
+
+    # Model ignored the format; accept a bare intent label if present
+    text = (raw or "").strip().lower()
+    for intent in SystemPrompts.INTENTS:
+        if intent in text:
+            return ParsedCommand(intent=intent)
+
+    logger.warning(f"Unparseable parser output: {raw!r}")
+    return ParsedCommand()
@@ -1,19 +1,97 @@
 """Application constants"""
 
 # Voice settings
-MAX_RECORDING_DURATION = 5  # seconds
+MAX_RECORDING_DURATION = 15  # seconds, upper bound; VAD usually stops sooner
 SAMPLE_RATE = 16000  # Hz
 
+# Speech-to-text backends
+STT_BACKENDS = ["whisper", "faster-whisper"]
+STT_LANGUAGE = "en"  # pinned; skips language detection
+STT_BEAM_SIZE = 1  # greedy decoding is enough for short commands
+STT_CPU_THREADS = 0  # 0 lets the library decide
+STT_COMPUTE_TYPE = "int8"  # faster-whisper weight quantization
+
+# Voice activity detection
+VAD_FRAME_MS = 30
+VAD_SILENCE_MS = 700  # trailing silence that ends an utterance
+VAD_PRE_ROLL_MS = 200  # audio kept before detected speech onset
+VAD_MIN_SPEECH_MS = 90  # speech needed to count as onset
+VAD_ENERGY_THRESHOLD = 0.01  # minimum RMS treated as speech
+VAD_NOISE_RATIO = 3.0  # speech must be this much louder than the noise floor
+
 # Agent settings
 MAX_USER_INPUT_LENGTH = 500  # characters
 MAX_INVOICES_TO_DISPLAY = 3
+INVOICE_PAGE_SIZE = 500  # rows per list_invoices page
+OVERDUE_SUMMARY_TTL = 60  # seconds; only used when MCP can't push changes
 MAX_COMPANY_NAME_LENGTH = 100
 
+# Multi-session server
+SERVER_HOST = "127.0.0.1"
+SERVER_PORT = 8080
+SERVER_MAX_SESSIONS = 1000
+SERVER_MAX_INFLIGHT = 64  # concurrent turns before new requests get 503
+SESSION_IDLE_TIMEOUT = 900  # seconds
+
+# Conversation context injected into the parse prompt
+CONTEXT_WINDOW_TURNS = 4  # recent turns kept verbatim
+CONTEXT_TOKEN_BUDGET = 150  # tokens of context added to each parse prompt
+CONTEXT_SUMMARY_FACTS = 6  # one-line facts kept about older turns
+CONTEXT_MESSAGE_CHARS = 200  # each stored message is truncated to this
+
+# MCP client
+MCP_MODES = ["mock", "http"]
+MCP_MAX_CONNECTIONS = 20  # pooled keep-alive connections to PFMCP
+MCP_TIMEOUT = 10  # seconds, for tools without their own entry below
+MCP_TOOL_TIMEOUTS = {
+    "search_invoices": 3,
+    "summarize_invoices": 5,
+    "aging_summary": 5,
+    "list_invoices": 10,
+    "list_customers": 10,
+    "send_email": 15,
+    "send_batch": 30,
+}
+# Safe to coalesce: concurrent identical calls share one request
+MCP_READ_ONLY_TOOLS = {
+    "list_invoices", "summarize_invoices", "aging_summary",
+    "search_invoices", "list_customers",
+}
+
+# Mock data
+MOCK_LEDGER_SIZE = 0  # synthetic invoices added to the demo ones
+
 # LLM settings
 GROQ_MODEL = "llama-3.1-8b-instant"
-MAX_TOKENS_INTENT = 50
+MAX_TOKENS_PARSE = 100
 MAX_TOKENS_EMAIL = 400
-MAX_TOKENS_COMPANY = 50
+MAX_TOKENS_REPLY = 120  # spoken answer to an open-ended request
+
+# Groq quotas (free tier for llama-3.1-8b-instant)
+GROQ_REQUESTS_PER_MINUTE = 30
+GROQ_TOKENS_PER_MINUTE = 6000
+GROQ_MAX_CONCURRENCY = 8
+GROQ_RATE_LIMIT_REQUEUES = 5
+GROQ_TIMEOUT = 30  # seconds
+
+# LLM deadlines, hedging and circuit breaking
+GROQ_FALLBACK_MODEL = ""  # faster/cheaper model tried when the primary can't answer in time
+LLM_TURN_DEADLINE = 8.0  # seconds the agent gives the LLM calls of one voice turn
+LLM_PARSE_DEADLINE = 3.0  # seconds for the command parse within that
+LLM_HEDGE_PERCENTILE = 95  # duplicate a request still running past this latency percentile; 0 disables
+LLM_HEDGE_MIN_SAMPLES = 20  # latencies needed before hedging starts
+LLM_LATENCY_WINDOW = 200  # recent successful calls used for the percentile
+LLM_BREAKER_FAILURES = 5  # consecutive failures that open a model's circuit
+LLM_BREAKER_RESET = 30  # seconds before an open circuit lets a trial call through
+
+# LLM call priorities (lower runs first)
+PRIORITY_INTERACTIVE = 0
+PRIORITY_BACKGROUND = 10
+
+# Bulk reminders
+BULK_REMINDER_CONCURRENCY = 5  # drafts generated at once
+BULK_REMINDER_BATCH_SIZE = 20  # emails per send_batch call
+BULK_REMINDER_CHECKPOINT_TTL = 3600  # seconds a partial run can still be resumed
 
 # Retry settings
 MAX_RETRIES = 3
@@ -23,3 +101,27 @@ RETRY_MAX_WAIT = 10  # seconds
 # Audio settings
 AUDIO_FORMAT = "mp3"
 VOICE_LANGUAGE = "en"
+
+# Text-to-speech backends
+TTS_BACKENDS = ["gtts", "piper", "espeak"]
+PIPER_MODEL = "data/voices/en_US-lessac-medium.onnx"
+ESPEAK_RATE = 175  # words per minute
+
+# Synthesized speech cache
+TTS_CACHE_MEMORY_MB = 32
+TTS_CACHE_DISK_MB = 256
+
+# Logging
+LOG_LEVELS = ["TRACE", "DEBUG", "INFO", "SUCCESS", "WARNING", "ERROR", "CRITICAL"]
+LOG_FORMATS = ["text", "json"]
+LOG_DROP_POLICIES = ["drop_new", "drop_oldest", "block"]
+LOG_FILE = "data/logs/agent.log"
+LOG_ROTATION_MB = 10
+LOG_QUEUE_SIZE = 10000  # messages buffered for the writer thread; 0 writes inline
+LOG_DROP_POLICY = "drop_new"
+LOG_THROTTLE_INTERVAL = 1.0  # seconds between messages from one throttled call site
+
+# Tracing
+TRACE_BUCKETS = (0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0, 30.0)  # seconds
+TRACE_RECENT_TURNS = 50  # turns kept whole for /metrics?format=json
+TRACE_MAX_SPANS_PER_TURN = 200  # bulk runs beyond this only feed histograms
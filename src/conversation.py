@@ -0,0 +1,124 @@
+"""Bounded conversation context for follow-up commands"""
+import re
+from collections import deque
+from typing import Deque, List, Optional, Tuple
+
+from command_parser import ParsedCommand
+from constants import (
+    CONTEXT_WINDOW_TURNS, CONTEXT_TOKEN_BUDGET, CONTEXT_SUMMARY_FACTS,
+    CONTEXT_MESSAGE_CHARS
+)
+
+# Words that point back at an earlier company or invoice
+_BACK_REFERENCE = re.compile(
+    r"\b(them|they|their|it|its|him|her|that (?:company|customer|client|invoice)|"
+    r"the same(?: one)?|same (?:company|customer))\b",
+    re.IGNORECASE
+)
+
+_FACTS = {
+    "check_invoices": "checked overdue invoices",
+    "aging_summary": "reviewed the aging report",
+    "send_reminder": "sent a reminder to {company}",
+    "remind_all": "reminded every overdue customer",
+}
+
+def estimate_tokens(text: str) -> int:
+    """Same rough 4-characters-per-token rule the LLM provider uses"""
+    return (len(text) + 3) // 4
+
+class ConversationContext:
+    """Recent turns, a compact summary of older ones, and resolved entities
+
+    Memory is fixed by the window and fact limits, and render() never
+    exceeds the token budget, so prompt size stays flat however long the
+    session runs.
+    """
+
+    def __init__(
+        self,
+        window_turns: int = CONTEXT_WINDOW_TURNS,
+        token_budget: int = CONTEXT_TOKEN_BUDGET
+    ):
+        self.token_budget = token_budget
+        self.turns: Deque[Tuple[str, str, ParsedCommand]] = deque(maxlen=window_turns)
+        self.facts: Deque[str] = deque(maxlen=CONTEXT_SUMMARY_FACTS)
+        self.last_company: Optional[str] = None
+        self.last_invoice_id: Optional[str] = None
+
+    @classmethod
+    def from_config(cls, config) -> "ConversationContext":
+        return cls(
+            window_turns=config.get("CONTEXT_WINDOW_TURNS", CONTEXT_WINDOW_TURNS),
+            token_budget=config.get("CONTEXT_TOKEN_BUDGET", CONTEXT_TOKEN_BUDGET)
+        )
+
+    def __len__(self) -> int:
+        return len(self.turns)
+
+    def record(self, user_input: str, response: str, command: ParsedCommand):
+        """Add a finished turn; the oldest one is folded into the summary"""
+        if len(self.turns) == self.turns.maxlen:
+            self._fold(self.turns[0][2])
+        self.turns.append((
+            user_input[:CONTEXT_MESSAGE_CHARS],
+            response[:CONTEXT_MESSAGE_CHARS],
+            command
+        ))
+        if command.company_name:
+            self.last_company = command.company_name
+        if command.invoice_id:
+            self.last_invoice_id = command.invoice_id
+
+    def resolve(self, text: str, command: ParsedCommand) -> ParsedCommand:
+        """Fill entities the user referred to indirectly ("send them a reminder")"""
+        if not _BACK_REFERENCE.search(text):
+            return command
+        updates = {}
+        if command.company_name is None and self.last_company:
+            updates["company_name"] = self.last_company
+        if command.invoice_id is None and self.last_invoice_id:
+            updates["invoice_id"] = self.last_invoice_id
+        return command.model_copy(update=updates) if updates else command
+
+    def render(self, token_budget: Optional[int] = None) -> str:
+        """Context block for the parse prompt, newest turns kept first"""
+        budget = self.token_budget if token_budget is None else token_budget
+        header: List[str] = []
+        entities = []
+        if self.last_company:
+            entities.append(f"company={self.last_company}")
+        if self.last_invoice_id:
+            entities.append(f"invoice={self.last_invoice_id}")
+        if entities:
+            header.append("Last mentioned: " + ", ".join(entities))
+        if self.facts:
+            header.append("Earlier: " + "; ".join(self.facts))
+
+        lines, used = [], 0
+        for line in header:
+            cost = estimate_tokens(line) + 1
+            if used + cost > budget:
+                break
+            lines.append(line)
+            used += cost
+
+        recent: List[str] = []
+        for user_input, response, _ in reversed(self.turns):
+            turn = f"User: {user_input}\nAgent: {response}"
+            cost = estimate_tokens(turn) + 1
+            if used + cost > budget:
+                break
+            recent.append(turn)
+            used += cost
+        return "\n".join(lines + recent[::-1])
+
+    def _fold(self, command: ParsedCommand):
+        template = _FACTS.get(command.intent)
+        if template is None or (template.count("{") and not command.company_name):
+            return
+        fact = template.format(company=command.company_name)
+        # Repeats move to the end instead of crowding out other facts
+        if fact in self.facts:
+            self.facts.remove(fact)
+        self.facts.append(fact)
@@ -8,14 +8,34 @@ class LLMError(AgentException):
     """Error related to LLM operations"""
     pass
 
+class DeadlineExceededError(LLMError):
+    """The LLM could not answer within the caller's deadline"""
+    pass
+
+class RateLimitedError(LLMError):
+    """Groq kept rate limiting the call after every requeue"""
+    pass
+
+class CircuitOpenError(LLMError):
+    """Every model's circuit breaker is open"""
+    pass
+
 class MCPError(AgentException):
     """Error related to MCP operations"""
     pass
 
+class SessionLimitError(AgentException):
+    """No room for another session or request"""
+    pass
+
 class VoiceInputError(AgentException):
     """Error related to voice input"""
     pass
 
+class VoiceOutputError(AgentException):
+    """Error related to speech synthesis or playback"""
+    pass
+
 class ValidationError(AgentException):
     """Error related to input validation"""
     pass
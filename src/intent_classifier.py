@@ -0,0 +1,130 @@
+"""Local keyword classifier that resolves obvious commands without the LLM"""
+import re
+from typing import Dict, Iterable, List, Optional, Tuple
+from loguru import logger
+
+from command_parser import ParsedCommand
+from utils.formatters import normalize_company_name
+
+_REMINDER = re.compile(r"\b(remind|reminder|reminders|nudge|chase|follow up)\b")
+_OVERDUE = re.compile(r"\b(overdue|past due|outstanding|unpaid|late)\b")
+_INVOICE = re.compile(r"\b(invoice|invoices|bill|bills|payments?)\b")
+_QUERY = re.compile(r"\b(check|show|list|what|which|any|how many|tell)\b")
+_EVERYONE = re.compile(r"\b(all|every|everyone|everybody)\b")
+_AGING = re.compile(r"\b(aging|ageing|aged|age breakdown|aging report)\b")
+_HELP = re.compile(r"\b(help|what can you do)\b")
+_CHECK = re.compile(r"^(please )?(check|show|list)( me)?( the| my| our| all)? (invoices|bills)( please)?$")
+_NEGATION = re.compile(r"\b(not|don t|dont|never|no|stop|cancel|without)\b")
+_QUESTION = re.compile(
+    r"^(did|do|does|should|shall|can|could|would|will|is|are|was|were|has|have|"
+    r"what|which|who|when|why|how)\b"
+)
+_NON_WORD = re.compile(r"[^a-z0-9&\s]")
+
+_STOPWORDS = {"the", "a", "an", "and", "of", "to", "for", "them", "their"}
+
+# Ceiling for reminders phrased as a question or negated; always left to the LLM
+SIDE_EFFECT_CAP = 0.5
+
+def _normalize(text: str) -> str:
+    return " ".join(_NON_WORD.sub(" ", text.lower()).split())
+
+class LocalIntentClassifier:
+    """Rule-based fast path; the LLM is only used below the threshold"""
+
+    def __init__(self, threshold: float = 0.85):
+        self.threshold = threshold
+        self.hits = 0
+        self.misses = 0
+        self._customers: Dict[str, str] = {}      # normalized -> display name
+        self._by_token: Dict[str, List[str]] = {}  # first token -> normalized names
+
+    def set_customers(self, names: Iterable[str]):
+        """Load the known customer list used to resolve company names"""
+        self._customers = {}
+        self._by_token = {}
+        for name in names:
+            normalized = normalize_company_name(name)
+            if not normalized:
+                continue
+            self._customers[normalized] = name
+            self._by_token.setdefault(normalized.split()[0], []).append(normalized)
+        logger.info(f"Fast path loaded {len(self._customers)} customers")
+
+    def match_company(self, text: str) -> Tuple[Optional[str], float]:
+        """Find a known customer mentioned in text"""
+        padded = f" {text} "
+        best, confidence = None, 0.0
+        for token in set(text.split()):
+            for normalized in self._by_token.get(token, ()):
+                if f" {normalized} " in padded:
+                    # Prefer the longest full-name match
+                    if confidence < 1.0 or len(normalized) > len(best):
+                        best, confidence = normalized, 1.0
+                elif (
+                    confidence < 1.0
+                    and len(token) >= 3
+                    and token not in _STOPWORDS
+                    and len(self._by_token[token]) == 1
+                ):
+                    # Unique distinctive first word, e.g. "acme" for "Acme Corp"
+                    best, confidence = normalized, 0.9
+        if best is None:
+            return None, 0.0
+        return self._customers[best], confidence
+
+    def mentioned_company(self, text: str) -> Optional[str]:
+        """Known customer named anywhere in raw text, whatever the intent"""
+        company, _ = self.match_company(_normalize(text))
+        return company
+
+    def classify(self, text: str) -> Tuple[ParsedCommand, float]:
+        """Classify text and return the command with a confidence score"""
+        asked = text.rstrip().endswith("?")
+        text = _normalize(text)
+        reminder = bool(_REMINDER.search(text))
+        overdue = bool(_OVERDUE.search(text))
+        invoice = bool(_INVOICE.search(text))
+
+        if reminder:
+            # Reminders send email: questions and negations never skip the LLM
+            cap = SIDE_EFFECT_CAP if asked or _QUESTION.search(text) or _NEGATION.search(text) else 1.0
+            if _EVERYONE.search(text) and (overdue or "customer" in text):
+                return ParsedCommand(intent="remind_all"), min(0.9, cap)
+            company, match = self.match_company(text)
+            if company:
+                command = ParsedCommand(intent="send_reminder", company_name=company)
+                return command, min(0.95 * match, cap)
+            # Unknown company: let the LLM decide
+            return ParsedCommand(intent="send_reminder"), min(0.5, cap)
+
+        if _AGING.search(text):
+            return ParsedCommand(intent="aging_summary"), 0.9
+        if (overdue and invoice) or _CHECK.search(text):
+            return ParsedCommand(intent="check_invoices"), 0.9
+        if invoice and _QUERY.search(text):
+            return ParsedCommand(intent="check_invoices"), 0.75
+        if _HELP.search(text):
+            return ParsedCommand(intent="help"), 0.9
+        return ParsedCommand(), 0.0
+
+    def try_resolve(self, text: str) -> Optional[ParsedCommand]:
+        """Return a command if confident enough, otherwise None"""
+        command, confidence = self.classify(text)
+        if confidence >= self.threshold:
+            self.hits += 1
+            logger.debug("Fast path hit ({:.2f}): {}", confidence, command.intent)
+            return command
+        self.misses += 1
+        logger.debug("Fast path miss ({:.2f}), falling back to LLM", confidence)
+        return None
+
+    def stats(self) -> dict:
+        """Hit/miss counters for threshold tuning"""
+        total = self.hits + self.misses
+        return {
+            "hits": self.hits,
+            "misses": self.misses,
+            "hit_rate": self.hits / total if total else 0.0,
+            "threshold": self.threshold,
+        }
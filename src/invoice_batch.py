@@ -0,0 +1,150 @@
+"""Columnar invoice batches with vectorized aging analytics"""
+from datetime import date, datetime
+from typing import Dict, Iterable, List, Optional
+import numpy as np
+
+# Upper-inclusive day ranges; the last bucket is open-ended
+AGING_BUCKETS = ["0-30", "31-60", "61-90", "90+"]
+_AGING_EDGES = np.array([31, 61, 91])
+
+class InvoiceBatch:
+    """Invoices as NumPy columns instead of one object per row
+
+    amount and days_overdue are dense arrays; customers and statuses are
+    interned into integer codes that index the customers/statuses lists.
+    """
+
+    def __init__(
+        self,
+        ids: np.ndarray,
+        amount: np.ndarray,
+        days_overdue: np.ndarray,
+        due_ordinal: np.ndarray,
+        customer_codes: np.ndarray,
+        customers: List[tuple],
+        status_codes: np.ndarray,
+        statuses: List[str]
+    ):
+        self.ids = ids
+        self.amount = amount
+        self.days_overdue = days_overdue
+        self.due_ordinal = due_ordinal
+        self.customer_codes = customer_codes
+        self.customers = customers  # (name, email) per code
+        self.status_codes = status_codes
+        self.statuses = statuses
+
+    @classmethod
+    def from_records(cls, records: Iterable[dict]) -> "InvoiceBatch":
+        """Build a batch from invoice dicts, interning repeated strings"""
+        ids, amounts, days, dues, customer_codes, status_codes = [], [], [], [], [], []
+        customers: Dict[tuple, int] = {}
+        statuses: Dict[str, int] = {}
+        for record in records:
+            customer = (record["customer_name"], record["customer_email"])
+            ids.append(record["id"])
+            amounts.append(record["amount"])
+            days.append(record.get("days_overdue", 0))
+            due = datetime.fromisoformat(str(record["due_date"]).replace("Z", "+00:00"))
+            dues.append(due.toordinal())
+            customer_codes.append(customers.setdefault(customer, len(customers)))
+            status_codes.append(statuses.setdefault(record["status"], len(statuses)))
+        return cls(
+            ids=np.array(ids, dtype=object),
+            amount=np.array(amounts, dtype=np.float64),
+            days_overdue=np.array(days, dtype=np.int32),
+            due_ordinal=np.array(dues, dtype=np.int32),
+            customer_codes=np.array(customer_codes, dtype=np.int32),
+            customers=list(customers),
+            status_codes=np.array(status_codes, dtype=np.int8),
+            statuses=list(statuses)
+        )
+
+    def __len__(self) -> int:
+        return len(self.amount)
+
+    def select(self, mask: np.ndarray) -> "InvoiceBatch":
+        """Rows where mask is true, sharing the interned categories"""
+        positions = np.flatnonzero(mask)
+        return InvoiceBatch(
+            ids=self.ids[positions],
+            amount=self.amount[positions],
+            days_overdue=self.days_overdue[positions],
+            due_ordinal=self.due_ordinal[positions],
+            customer_codes=self.customer_codes[positions],
+            customers=self.customers,
+            status_codes=self.status_codes[positions],
+            statuses=self.statuses
+        )
+
+    def with_status(self, status: Optional[str]) -> "InvoiceBatch":
+        """Rows with the given status (all rows for None)"""
+        if status is None:
+            return self
+        if status not in self.statuses:
+            return self.select(np.zeros(len(self), dtype=bool))
+        return self.select(self.status_codes == self.statuses.index(status))
+
+    def total(self) -> float:
+        return round(float(self.amount.sum()), 2)
+
+    def aging_buckets(self) -> List[dict]:
+        """Count and total per 0-30/31-60/61-90/90+ days-overdue bucket"""
+        buckets = np.digitize(self.days_overdue, _AGING_EDGES)
+        counts = np.bincount(buckets, minlength=len(AGING_BUCKETS))
+        totals = np.bincount(buckets, weights=self.amount, minlength=len(AGING_BUCKETS))
+        return [
+            {"label": label, "count": int(counts[i]), "total": round(float(totals[i]), 2)}
+            for i, label in enumerate(AGING_BUCKETS)
+        ]
+
+    def customer_rollup(self, top_n: Optional[int] = None) -> List[dict]:
+        """Outstanding balance per customer, largest first"""
+        size = len(self.customers)
+        totals = np.bincount(self.customer_codes, weights=self.amount, minlength=size)
+        counts = np.bincount(self.customer_codes, minlength=size)
+        codes = np.flatnonzero(counts)
+        order = codes[self._largest(totals[codes], top_n)]
+        return [
+            {
+                "customer_name": self.customers[code][0],
+                "customer_email": self.customers[code][1],
+                "total": round(float(totals[code]), 2),
+                "count": int(counts[code]),
+            }
+            for code in order
+        ]
+
+    def top(self, n: int, order_by: str = "amount") -> List[dict]:
+        """The n largest invoices by amount or days overdue"""
+        if order_by == "amount":
+            key = self.amount
+        elif order_by == "days_overdue":
+            # Older due date first; works even when days_overdue is unset
+            key = -self.due_ordinal.astype(np.int64)
+        else:
+            raise ValueError(f"Cannot order by {order_by}")
+        return [self.record(i) for i in self._largest(key, n)]
+
+    def record(self, i: int) -> dict:
+        """One row back as an invoice dict"""
+        name, email = self.customers[self.customer_codes[i]]
+        return {
+            "id": self.ids[i],
+            "customer_name": name,
+            "customer_email": email,
+            "amount": float(self.amount[i]),
+            "due_date": date.fromordinal(int(self.due_ordinal[i])).isoformat(),
+            "status": self.statuses[self.status_codes[i]],
+            "days_overdue": int(self.days_overdue[i]),
+        }
+
+    @staticmethod
+    def _largest(values: np.ndarray, n: Optional[int]) -> np.ndarray:
+        """Positions of the n largest values, sorted descending, in O(len)"""
+        if n is None or n >= len(values):
+            return np.argsort(-values, kind="stable")
+        if n <= 0:
+            return np.zeros(0, dtype=np.intp)
+        candidates = np.argpartition(-values, n - 1)[:n]
+        return candidates[np.argsort(-values[candidates], kind="stable")]
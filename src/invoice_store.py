@@ -0,0 +1,389 @@
+"""Indexed in-memory invoice ledger used behind the mock MCP client"""
+import bisect
+import random
+import time
+from datetime import date, datetime, timedelta
+from typing import Dict, Iterable, Iterator, List, Optional, Sequence, Set, Tuple
+from loguru import logger
+import numpy as np
+
+from invoice_batch import InvoiceBatch
+from exceptions import ValidationError
+
+from utils.formatters import normalize_company_name
+
+STATUSES = ["past_due", "open", "paid"]
+
+_PREFIX_LIMIT = 50  # tokens expanded per prefix lookup
+_MIN_FUZZY_LENGTH = 4  # shorter tokens only match exactly or by prefix
+_MAX_CUSTOMER_MATCHES = 20
+
+def _deletions(token: str) -> Set[str]:
+    """All strings one deletion away from token"""
+    return {token[:i] + token[i + 1:] for i in range(len(token))}
+
+def _within_one_edit(a: str, b: str) -> bool:
+    """True if a and b differ by at most one insert, delete or substitution"""
+    if abs(len(a) - len(b)) > 1:
+        return False
+    if len(a) > len(b):
+        a, b = b, a
+    i = 0
+    while i < len(a) and a[i] == b[i]:
+        i += 1
+    return a[i:] == b[i + 1:] or (len(a) == len(b) and a[i + 1:] == b[i + 1:])
+
+class InvoiceStore:
+    """Ledger built once, indexed by status and normalized customer name
+
+    Rows are compact tuples; days_overdue is derived from a fixed as_of
+    snapshot rather than the clock. Customer search resolves exact,
+    prefix and one-typo token matches from indexes, never scanning rows.
+    """
+
+    def __init__(self, as_of: Optional[date] = None):
+        self.as_of = as_of or date.today()
+        # Row: (id, customer index, amount, due date ordinal, status)
+        self._rows: List[Tuple[str, int, float, int, str]] = []
+        self._row_by_id: Dict[str, int] = {}
+        self._customers: List[Tuple[str, str]] = []  # (name, email)
+        self._customer_by_key: Dict[Tuple[str, str], int] = {}
+        # Sorted row numbers per status, so pages can seek by row number
+        self._by_status: Dict[str, List[int]] = {s: [] for s in STATUSES}
+        # Dicts used as insertion-ordered sets of row numbers
+        self._by_customer: Dict[int, Dict[int, None]] = {}
+        self._by_name: Dict[str, List[int]] = {}  # normalized name -> customers
+        self._tokens: Dict[str, Set[str]] = {}  # token -> normalized names
+        self._sorted_tokens: List[str] = []
+        self._deletes: Dict[str, Set[str]] = {}  # deletion variant -> tokens
+        self._statuses: List[str] = list(STATUSES)  # status codes used by the columns
+        self._status_codes: Dict[str, int] = {s: i for i, s in enumerate(STATUSES)}
+        # NumPy mirror of _rows, built on first use and patched row by row on writes
+        self._columns: Optional[Dict[str, np.ndarray]] = None
+
+    @classmethod
+    def from_invoices(cls, invoices: Iterable[dict], as_of: Optional[date] = None) -> "InvoiceStore":
+        """Build and index a store in one pass"""
+        start = time.perf_counter()
+        store = cls(as_of)
+        for invoice in invoices:
+            store.add(invoice, _defer_sort=True)
+        store._sorted_tokens = sorted(store._tokens)
+        logger.info(
+            f"Invoice store: {len(store)} invoices, {len(store._customers)} customers "
+            f"indexed in {time.perf_counter() - start:.2f}s"
+        )
+        return store
+
+    def __len__(self) -> int:
+        return len(self._rows)
+
+    def add(self, invoice: dict, _defer_sort: bool = False) -> dict:
+        """Insert or replace an invoice"""
+        customer = self._customer_index(invoice["customer_name"], invoice["customer_email"], _defer_sort)
+        due = datetime.fromisoformat(str(invoice["due_date"]).replace("Z", "+00:00")).date()
+        row = (invoice["id"], customer, float(invoice["amount"]), due.toordinal(), invoice["status"])
+
+        number = self._row_by_id.get(invoice["id"])
+        if number is None:
+            number = len(self._rows)
+            self._rows.append(row)
+            self._row_by_id[invoice["id"]] = number
+        else:
+            self._unindex(number)
+            self._rows[number] = row
+        bisect.insort(self._by_status.setdefault(row[4], []), number)
+        self._by_customer.setdefault(customer, {})[number] = None
+        self._sync_columns(number)
+        return self._to_dict(row)
+
+    def get(self, invoice_id: str) -> Optional[dict]:
+        number = self._row_by_id.get(invoice_id)
+        return None if number is None else self._to_dict(self._rows[number])
+
+    def update_status(self, invoice_id: str, status: str) -> Optional[dict]:
+        """Move an invoice to a new status, keeping indexes in sync"""
+        number = self._row_by_id.get(invoice_id)
+        if number is None:
+            return None
+        self._unindex(number)
+        row = self._rows[number][:4] + (status,)
+        self._rows[number] = row
+        bisect.insort(self._by_status.setdefault(status, []), number)
+        self._by_customer[row[1]][number] = None
+        self._sync_columns(number)
+        return self._to_dict(row)
+
+    def list(self, status: Optional[str] = None) -> List[dict]:
+        """All invoices, or those with the given status"""
+        return [self._to_dict(self._rows[n]) for n in self._row_numbers(status)]
+
+    def page(self, status: Optional[str] = None, limit: int = 100, cursor: Optional[str] = None) -> dict:
+        """One page of invoices in ledger order, Stripe-style
+
+        The cursor is the last row number returned, so pages stay stable
+        while statuses change underneath. Filtered pages seek into the
+        status index, so each page costs O(limit).
+        """
+        if cursor and not (isinstance(cursor, str) and cursor.isdigit()):
+            raise ValidationError(f"Invalid cursor: {cursor!r}")
+        numbers = self._row_numbers(status)
+        start = bisect.bisect_right(numbers, int(cursor)) if cursor else 0
+        chunk = numbers[start:start + limit]
+        has_more = start + limit < len(numbers)
+        return {
+            "data": [self._to_dict(self._rows[n]) for n in chunk],
+            "has_more": has_more,
+            "next_cursor": str(chunk[-1]) if has_more else None,
+        }
+
+    def batch(self) -> InvoiceBatch:
+        """Columnar view of the whole ledger
+
+        The columns are built once; later writes update their row in
+        place, so the view is only valid until the next write.
+        """
+        if self._columns is None:
+            self._build_columns()
+        count, columns = len(self._rows), self._columns
+        return InvoiceBatch(
+            ids=columns["ids"][:count],
+            amount=columns["amount"][:count],
+            days_overdue=columns["days_overdue"][:count],
+            due_ordinal=columns["due_ordinal"][:count],
+            customer_codes=columns["customer_codes"][:count],
+            customers=self._customers,
+            status_codes=columns["status_codes"][:count],
+            statuses=self._statuses
+        )
+
+    def summarize(self, status: Optional[str] = None, top_n: int = 3, order_by: str = "amount") -> dict:
+        """Count, total and top-N invoices without materializing the rest"""
+        batch = self.batch().with_status(status)
+        return {
+            "count": len(batch),
+            "total": batch.total(),
+            "top": batch.top(top_n, order_by),
+        }
+
+    def aging_summary(self, status: Optional[str] = "past_due", top_customers: int = 3) -> dict:
+        """Aging buckets and largest customer balances, vectorized"""
+        batch = self.batch().with_status(status)
+        return {
+            "count": len(batch),
+            "total": batch.total(),
+            "buckets": batch.aging_buckets(),
+            "top_customers": batch.customer_rollup(top_customers),
+        }
+
+    def customers(self) -> List[str]:
+        """Distinct customer names"""
+        return sorted({name for name, _ in self._customers})
+
+    def search(self, query: str, status: Optional[str] = None) -> List[dict]:
+        """Invoices of the customers best matching query"""
+        results = []
+        for customer in self.find_customers(query):
+            for number in self._by_customer.get(customer, ()):
+                row = self._rows[number]
+                if status is None or row[4] == status:
+                    results.append(self._to_dict(row))
+        return results
+
+    def find_customers(self, query: str, limit: int = _MAX_CUSTOMER_MATCHES) -> List[int]:
+        """Customer indexes whose names best match query
+
+        Each query token matches exactly, as a prefix or within one typo;
+        every token must match, and only the best-scoring names are kept.
+        """
+        normalized = normalize_company_name(query)
+        if not normalized:
+            return []
+        if normalized in self._by_name:
+            return list(self._by_name[normalized])
+
+        scores: Optional[Dict[str, float]] = None
+        for token in normalized.split():
+            token_scores = self._match_token(token)
+            if scores is None:
+                scores = token_scores
+            else:
+                scores = {
+                    name: score + token_scores[name]
+                    for name, score in scores.items() if name in token_scores
+                }
+            if not scores:
+                return []
+
+        best = max(scores.values())
+        names = sorted(name for name, score in scores.items() if score == best)[:limit]
+        return [c for name in names for c in self._by_name[name]]
+
+    def _match_token(self, token: str) -> Dict[str, float]:
+        """Score normalized names containing something close to token"""
+        scores: Dict[str, float] = {}
+
+        def credit(matched_token: str, score: float):
+            for name in self._tokens.get(matched_token, ()):
+                if scores.get(name, 0.0) < score:
+                    scores[name] = score
+
+        credit(token, 1.0)
+
+        start = bisect.bisect_left(self._sorted_tokens, token)
+        for candidate in self._sorted_tokens[start:start + _PREFIX_LIMIT]:
+            if not candidate.startswith(token):
+                break
+            credit(candidate, 0.8)
+
+        if len(token) >= _MIN_FUZZY_LENGTH:
+            candidates: Set[str] = set()
+            for variant in _deletions(token) | {token}:
+                candidates |= self._deletes.get(variant, set())
+            for candidate in candidates:
+                if candidate != token and _within_one_edit(token, candidate):
+                    credit(candidate, 0.6)
+        return scores
+
+    def _customer_index(self, name: str, email: str, defer_sort: bool) -> int:
+        key = (name, email.lower())
+        index = self._customer_by_key.get(key)
+        if index is not None:
+            return index
+
+        index = len(self._customers)
+        self._customers.append((name, email))
+        self._customer_by_key[key] = index
+        normalized = normalize_company_name(name)
+        self._by_name.setdefault(normalized, []).append(index)
+        for token in normalized.split():
+            if token not in self._tokens:
+                self._tokens[token] = set()
+                if not defer_sort:
+                    bisect.insort(self._sorted_tokens, token)
+                if len(token) >= _MIN_FUZZY_LENGTH:
+                    for variant in _deletions(token) | {token}:
+                        self._deletes.setdefault(variant, set()).add(token)
+            self._tokens[token].add(normalized)
+        return index
+
+    def _status_code(self, status: str) -> int:
+        code = self._status_codes.get(status)
+        if code is None:
+            code = self._status_codes[status] = len(self._statuses)
+            self._statuses.append(status)
+        return code
+
+    def _build_columns(self):
+        rows, count = self._rows, len(self._rows)
+        due = np.fromiter((row[3] for row in rows), dtype=np.int32, count=count)
+        status_codes = np.fromiter(
+            (self._status_code(row[4]) for row in rows), dtype=np.int8, count=count
+        )
+        overdue = np.maximum(self.as_of.toordinal() - due, 0)
+        past_due = status_codes == self._status_codes["past_due"]
+        self._columns = {
+            "ids": np.array([row[0] for row in rows], dtype=object),
+            "amount": np.fromiter((row[2] for row in rows), dtype=np.float64, count=count),
+            "days_overdue": np.where(past_due, overdue, 0).astype(np.int32),
+            "due_ordinal": due,
+            "customer_codes": np.fromiter((row[1] for row in rows), dtype=np.int32, count=count),
+            "status_codes": status_codes,
+        }
+
+    def _sync_columns(self, number: int):
+        """Copy one written row into the columns, growing them when it is new"""
+        columns = self._columns
+        if columns is None:
+            return
+        capacity = len(columns["amount"])
+        if number >= capacity:
+            # Doubling keeps appends amortized O(1)
+            capacity = max(number + 1, 2 * capacity)
+            for name, column in columns.items():
+                grown = np.zeros(capacity, dtype=column.dtype)
+                grown[:len(column)] = column
+                columns[name] = grown
+        invoice_id, customer, amount, due_ordinal, status = self._rows[number]
+        columns["ids"][number] = invoice_id
+        columns["amount"][number] = amount
+        columns["due_ordinal"][number] = due_ordinal
+        columns["customer_codes"][number] = customer
+        columns["status_codes"][number] = self._status_code(status)
+        overdue = self.as_of.toordinal() - due_ordinal
+        columns["days_overdue"][number] = max(0, overdue) if status == "past_due" else 0
+
+    def _unindex(self, number: int):
+        _, customer, _, _, status = self._rows[number]
+        numbers = self._by_status.get(status, [])
+        position = bisect.bisect_left(numbers, number)
+        if position < len(numbers) and numbers[position] == number:
+            del numbers[position]
+        self._by_customer.get(customer, {}).pop(number, None)
+
+    def _row_numbers(self, status: Optional[str]) -> Sequence[int]:
+        """Row numbers in ledger order, all or of one status"""
+        if status is None:
+            return range(len(self._rows))
+        return self._by_status.get(status, [])
+
+    def _to_dict(self, row: Tuple[str, int, float, int, str]) -> dict:
+        invoice_id, customer, amount, due_ordinal, status = row
+        name, email = self._customers[customer]
+        overdue = self.as_of.toordinal() - due_ordinal
+        return {
+            "id": invoice_id,
+            "customer_name": name,
+            "customer_email": email,
+            "amount": amount,
+            "due_date": date.fromordinal(due_ordinal).isoformat(),
+            "status": status,
+            "days_overdue": max(0, overdue) if status == "past_due" else 0,
+        }
+
+# Shares no word with the hand-written demo customers (Acme Corp, Beta Industries)
+_NAME_PARTS = [
+    "Summit", "Vertex", "Nimbus", "Orion", "Pioneer", "Quantum", "Redwood",
+    "Sierra", "Titan", "Umbra", "Vanguard", "Willow", "Zenith", "Atlas",
+    "Beacon", "Cobalt", "Falcon", "Granite", "Harbor", "Iris", "Juniper",
+    "Keystone", "Lumen", "Meridian", "Northwind", "Onyx", "Pinnacle", "Aurora",
+    "Crescent", "Evergreen", "Gamma", "Apex",
+]
+_NAME_SUFFIXES = ["Inc", "Labs", "Group", "Systems", "Holdings", "LLC"]
+
+def generate_invoices(
+    count: int,
+    customers: Optional[int] = None,
+    seed: int = 0,
+    as_of: Optional[date] = None
+) -> Iterator[dict]:
+    """Yield a deterministic synthetic ledger of count invoices
+
+    Every synthetic customer name carries its number, so none can merge
+    with a demo customer or with each other.
+    """
+    rng = random.Random(seed)
+    as_of = as_of or date.today()
+    customers = customers or max(1, count // 20)
+
+    names = []
+    for i in range(customers):
+        first = _NAME_PARTS[i % len(_NAME_PARTS)]
+        second = _NAME_PARTS[(i // len(_NAME_PARTS)) % len(_NAME_PARTS)]
+        name = f"{first} {second}" if first != second else first
+        name += f" {i + 1} {_NAME_SUFFIXES[i % len(_NAME_SUFFIXES)]}"
+        slug = name.lower().replace(" ", "")
+        names.append((name, f"billing@{slug}.com"))
+
+    for i in range(count):
+        name, email = names[rng.randrange(customers)]
+        days_ago = rng.randint(-30, 180)
+        status = "paid" if rng.random() < 0.3 else ("past_due" if days_ago > 0 else "open")
+        yield {
+            "id": f"inv_{i + 1:07d}",
+            "customer_name": name,
+            "customer_email": email,
+            "amount": round(rng.uniform(50, 20000), 2),
+            "due_date": (as_of - timedelta(days=days_ago)).isoformat(),
+            "status": status,
+        }
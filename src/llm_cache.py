@@ -0,0 +1,118 @@
+"""LLM completion cache with LRU eviction, TTL and optional disk backend"""
+import hashlib
+import json
+import sqlite3
+import time
+from collections import OrderedDict
+from pathlib import Path
+from typing import Optional, Tuple
+from loguru import logger
+
+class CompletionCache:
+    """Bounded in-memory LRU cache, optionally backed by SQLite"""
+
+    def __init__(self, max_entries: int = 1024, ttl: float = 3600, path: Optional[str] = None):
+        self.max_entries = max_entries
+        self.ttl = ttl
+        # key -> (expires_at, completion, original latency)
+        self._entries: "OrderedDict[str, Tuple[float, str, float]]" = OrderedDict()
+        self.hits = 0
+        self.misses = 0
+        self.saved_latency = 0.0
+        self._db = self._open_db(path) if path else None
+
+    @classmethod
+    def from_config(cls, config) -> Optional["CompletionCache"]:
+        """Build a cache from Config, or None when disabled"""
+        if not config.get("LLM_CACHE_ENABLED", True):
+            return None
+        return cls(
+            max_entries=config.get("LLM_CACHE_MAX_ENTRIES", 1024),
+            ttl=config.get("LLM_CACHE_TTL", 3600),
+            path=config.get("LLM_CACHE_PATH") or None
+        )
+
+    @staticmethod
+    def make_key(model: str, prompt: str, max_tokens: int, temperature: float) -> str:
+        """Stable key over everything that affects the completion"""
+        raw = json.dumps([model, prompt, max_tokens, temperature])
+        return hashlib.sha256(raw.encode("utf-8")).hexdigest()
+
+    def get(self, key: str) -> Optional[str]:
+        """Return a fresh cached completion or None"""
+        now = time.time()
+        entry = self._entries.get(key)
+        if entry is None and self._db is not None:
+            entry = self._load(key)
+            if entry is not None:
+                self._remember(key, entry)
+
+        if entry is None or entry[0] < now:
+            if entry is not None:
+                self._entries.pop(key, None)
+            self.misses += 1
+            return None
+
+        self._entries.move_to_end(key)
+        self.hits += 1
+        self.saved_latency += entry[2]
+        logger.debug("LLM cache hit (saved {:.2f}s)", entry[2])
+        return entry[1]
+
+    def put(self, key: str, completion: str, latency: float):
+        """Store a completion along with how long it took to produce"""
+        entry = (time.time() + self.ttl, completion, latency)
+        self._remember(key, entry)
+        if self._db is not None:
+            try:
+                with self._db:
+                    self._db.execute(
+                        "INSERT OR REPLACE INTO completions VALUES (?, ?, ?, ?)",
+                        (key, entry[0], completion, latency)
+                    )
+            except sqlite3.Error as e:
+                logger.warning(f"LLM cache write failed: {e}")
+
+    def stats(self) -> dict:
+        """Hit rate and latency saved so far"""
+        total = self.hits + self.misses
+        return {
+            "entries": len(self._entries),
+            "hits": self.hits,
+            "misses": self.misses,
+            "hit_rate": self.hits / total if total else 0.0,
+            "saved_latency_s": round(self.saved_latency, 3),
+        }
+
+    def _remember(self, key: str, entry: Tuple[float, str, float]):
+        self._entries[key] = entry
+        self._entries.move_to_end(key)
+        while len(self._entries) > self.max_entries:
+            self._entries.popitem(last=False)
+
+    def _open_db(self, path: str) -> Optional[sqlite3.Connection]:
+        try:
+            Path(path).parent.mkdir(parents=True, exist_ok=True)
+            db = sqlite3.connect(path)
+            with db:
+                db.execute(
+                    "CREATE TABLE IF NOT EXISTS completions ("
+                    "key TEXT PRIMARY KEY, expires_at REAL, completion TEXT, latency REAL)"
+                )
+                db.execute("DELETE FROM completions WHERE expires_at < ?", (time.time(),))
+            logger.info(f"LLM cache persisted at {path}")
+            return db
+        except sqlite3.Error as e:
+            logger.warning(f"LLM disk cache unavailable, using memory only: {e}")
+            return None
+
+    def _load(self, key: str) -> Optional[Tuple[float, str, float]]:
+        try:
+            row = self._db.execute(
+                "SELECT expires_at, completion, latency FROM completions WHERE key = ?",
+                (key,)
+            ).fetchone()
+        except sqlite3.Error as e:
+            logger.warning(f"LLM cache read failed: {e}")
+            return None
+        return tuple(row) if row else None
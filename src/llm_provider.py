@@ -1,55 +1,442 @@
 """Groq LLM Provider with retry logic"""
-import os
 import asyncio
-from groq import Groq
+import os
+import time
+from typing import AsyncIterator, Dict, Optional, Tuple
+import httpx
+from groq import AsyncGroq, RateLimitError
 from loguru import logger
-from tenacity import retry, stop_after_attempt, wait_exponential
+from tenacity import (
+    AsyncRetrying, retry_if_not_exception_type, stop_after_attempt, wait_exponential
+)
+from tenacity.stop import stop_base
 
-from exceptions import LLMError
+from exceptions import LLMError, DeadlineExceededError, CircuitOpenError, RateLimitedError
+from llm_cache import CompletionCache
+from rate_limiter import RateLimitScheduler
+from resilience import Deadline, LatencyTracker, CircuitBreaker
+from utils.tracing import tracer
+from utils.logger import ThrottledLogger
 from constants import (
-    GROQ_MODEL, MAX_RETRIES, RETRY_MIN_WAIT, RETRY_MAX_WAIT
+    GROQ_MODEL, GROQ_FALLBACK_MODEL, MAX_RETRIES, RETRY_MIN_WAIT, RETRY_MAX_WAIT,
+    GROQ_RATE_LIMIT_REQUEUES, GROQ_TIMEOUT,
+    LLM_HEDGE_PERCENTILE, LLM_HEDGE_MIN_SAMPLES, LLM_BREAKER_FAILURES, LLM_BREAKER_RESET,
+    PRIORITY_INTERACTIVE
 )
 
+_RETRY_WAIT = wait_exponential(multiplier=1, min=RETRY_MIN_WAIT, max=RETRY_MAX_WAIT)
+
+_fallback_log = ThrottledLogger()
+
+def _estimate_tokens(prompt: str, max_tokens: int) -> int:
+    """Rough token cost charged against the quota before the call"""
+    return len(prompt) // 4 + max_tokens
+
+def _remaining(deadline: Optional[Deadline]) -> Optional[float]:
+    return deadline.remaining() if deadline is not None else None
+
+def _retry_after(error: RateLimitError) -> float:
+    """Seconds Groq asked us to wait, defaulting to a short pause"""
+    try:
+        return float(error.response.headers.get("retry-after", 1))
+    except (AttributeError, TypeError, ValueError):
+        return 1.0
+
+class _stop_for_deadline(stop_base):
+    """Stop retrying once the backoff plus a typical call would miss the deadline"""
+
+    def __init__(self, deadline: Optional[Deadline], latency: LatencyTracker):
+        self.deadline = deadline
+        self.latency = latency
+
+    def __call__(self, retry_state) -> bool:
+        if self.deadline is None:
+            return False
+        needed = _RETRY_WAIT(retry_state) + self.latency.percentile(50)
+        return self.deadline.remaining() < needed
+
 class GroqProvider:
-    """Groq LLM provider with proper async and retry"""
+    """Groq LLM provider with native async, pooling and rate-limit scheduling
+    
+    Calls given a deadline never run past it: retries stop when another
+    attempt would not fit, a request still running at the hedge
+    percentile of recent latencies gets a duplicate, and the fallback
+    model answers when the primary one cannot in time. Each model has a
+    circuit breaker, so an outage fails fast instead of eating deadlines.
+    """
     
-    def __init__(self):
+    def __init__(
+        self,
+        cache: Optional[CompletionCache] = None,
+        scheduler: Optional[RateLimitScheduler] = None,
+        http_client: Optional[httpx.AsyncClient] = None,
+        fallback_model: Optional[str] = GROQ_FALLBACK_MODEL,
+        hedge_percentile: float = LLM_HEDGE_PERCENTILE,
+        breaker_failures: int = LLM_BREAKER_FAILURES,
+        breaker_reset: float = LLM_BREAKER_RESET
+    ):
         api_key = os.getenv("GROQ_API_KEY")
         if not api_key:
             raise ValueError("GROQ_API_KEY not found")
-        self.client = Groq(api_key=api_key)
+        self.scheduler = scheduler or RateLimitScheduler()
+        # One keep-alive pool shared by every call; the scheduler does retries on 429
+        self.http_client = http_client or httpx.AsyncClient(
+            limits=httpx.Limits(
+                max_connections=self.scheduler.max_concurrency,
+                max_keepalive_connections=self.scheduler.max_concurrency
+            ),
+            timeout=GROQ_TIMEOUT
+        )
+        self.client = AsyncGroq(api_key=api_key, http_client=self.http_client, max_retries=0)
         self.model = GROQ_MODEL
-        logger.info(f"Groq initialized: {self.model}")
+        self.models = [self.model]
+        if fallback_model and fallback_model != self.model:
+            self.models.append(fallback_model)
+        self.hedge_percentile = hedge_percentile
+        self.latencies: Dict[str, LatencyTracker] = {m: LatencyTracker() for m in self.models}
+        self.breakers: Dict[str, CircuitBreaker] = {
+            m: CircuitBreaker(f"llm.{m}", breaker_failures, breaker_reset) for m in self.models
+        }
+        self.cache = cache
+        logger.info(f"Groq initialized: {' -> '.join(self.models)}")
+    
+    @classmethod
+    def from_config(cls, config) -> "GroqProvider":
+        """Build a provider, its cache and its scheduler from Config"""
+        return cls(
+            cache=CompletionCache.from_config(config),
+            scheduler=RateLimitScheduler.from_config(config),
+            fallback_model=config.get("GROQ_FALLBACK_MODEL", GROQ_FALLBACK_MODEL),
+            hedge_percentile=config.get("LLM_HEDGE_PERCENTILE", LLM_HEDGE_PERCENTILE),
+            breaker_failures=config.get("LLM_BREAKER_FAILURES", LLM_BREAKER_FAILURES),
+            breaker_reset=config.get("LLM_BREAKER_RESET", LLM_BREAKER_RESET)
+        )
+    
+    async def aclose(self):
+        """Close the pooled HTTP connections"""
+        await self.http_client.aclose()
     
-    @retry(
-        stop=stop_after_attempt(MAX_RETRIES),
-        wait=wait_exponential(multiplier=1, min=RETRY_MIN_WAIT, max=RETRY_MAX_WAIT),
-        reraise=True
-    )
     async def complete(
         self, 
         prompt: str, 
         max_tokens: int = 1000, 
-        temperature: float = 0.7
+        temperature: float = 0.7,
+        use_cache: Optional[bool] = None,
+        priority: int = PRIORITY_INTERACTIVE,
+        deadline: Optional[Deadline] = None,
+        fallback: Optional[str] = None
     ) -> str:
-        """Generate completion with retry logic"""
-        try:
-            # Run in executor for proper async
-            loop = asyncio.get_event_loop()
-            response = await loop.run_in_executor(
-                None,
-                lambda: self.client.chat.completions.create(
-                    model=self.model,
-                    messages=[{"role": "user", "content": prompt}],
-                    max_tokens=max_tokens,
-                    temperature=temperature
+        """Generate completion, serving repeated deterministic prompts from cache
+        
+        use_cache defaults to caching only temperature-0 calls; sampled
+        calls (e.g. email drafting) always go to the network. With a
+        fallback, that canned text is returned instead of raising LLMError.
+        """
+        if use_cache is None:
+            use_cache = temperature == 0
+        async with tracer.span("llm.complete"):
+            try:
+                return await self._cached_complete(
+                    prompt, max_tokens, temperature, use_cache, priority, deadline
                 )
+            except LLMError as e:
+                if fallback is None:
+                    raise
+                logger.warning("LLM unavailable ({}), using the canned answer", e)
+                tracer.count("llm.canned")
+                return fallback
+    
+    async def stream(
+        self,
+        prompt: str,
+        max_tokens: int = 1000,
+        temperature: float = 0.7,
+        use_cache: Optional[bool] = None,
+        priority: int = PRIORITY_INTERACTIVE,
+        deadline: Optional[Deadline] = None,
+        fallback: Optional[str] = None
+    ) -> AsyncIterator[str]:
+        """Yield completion tokens as Groq produces them
+        
+        Same cache, scheduler, breaker and deadline as complete(); a cache
+        hit arrives as one chunk. If the stream fails before its first
+        token, complete() answers instead (retries, fallback model, canned
+        text). Once tokens have been yielded they stand: a later failure
+        ends the reply early when there is a fallback, else raises.
+        """
+        if use_cache is None:
+            use_cache = temperature == 0
+        key = None
+        if self.cache is not None and use_cache:
+            key = CompletionCache.make_key(self.model, prompt, max_tokens, temperature)
+            cached = self.cache.get(key)
+            if cached is not None:
+                tracer.count("llm.cache_hit")
+                yield cached
+                return
+            tracer.count("llm.cache_miss")
+        
+        parts = []
+        start = time.perf_counter()
+        try:
+            async for token in self._stream(prompt, max_tokens, temperature, priority, deadline):
+                parts.append(token)
+                yield token
+        except LLMError as e:
+            if parts:
+                if fallback is None:
+                    raise
+                logger.warning("LLM stream cut off ({}), ending the reply early", e)
+                return
+            logger.warning("LLM stream failed ({}), completing instead", e)
+            tracer.count("llm.stream_fallback")
+            yield await self.complete(
+                prompt, max_tokens, temperature, use_cache, priority, deadline, fallback
             )
-            
-            result = response.choices[0].message.content
-            logger.debug(f"Groq response: {result[:100]}...")
+            return
+        # Timed by hand: a span would stay open across the consumer's awaits
+        tracer.observe("llm.stream", time.perf_counter() - start)
+        if key is not None:
+            self.cache.put(key, "".join(parts), time.perf_counter() - start)
+    
+    async def _stream(
+        self, prompt: str, max_tokens: int, temperature: float, priority: int,
+        deadline: Optional[Deadline]
+    ) -> AsyncIterator[str]:
+        """Tokens from the primary model, inside one slot and its breaker"""
+        breaker = self.breakers[self.model]
+        if not breaker.allow():
+            raise CircuitOpenError(f"Circuit open for {self.model}")
+        requesting = False
+        try:
+            async with self.scheduler.slot(
+                _estimate_tokens(prompt, max_tokens), priority, _remaining(deadline)
+            ):
+                requesting = True
+                tokens = self._stream_request(self.model, prompt, max_tokens, temperature)
+                try:
+                    while True:
+                        try:
+                            token = await asyncio.wait_for(
+                                tokens.__anext__(), _remaining(deadline)
+                            )
+                        except StopAsyncIteration:
+                            break
+                        yield token
+                finally:
+                    await tokens.aclose()
+        except RateLimitError as e:
+            tracer.count("llm.rate_limited")
+            self.scheduler.penalize(_retry_after(e))
+            raise RateLimitedError(f"Rate limited while streaming: {str(e)}")
+        except asyncio.TimeoutError:
+            if not requesting:
+                raise DeadlineExceededError("No LLM slot freed up before the deadline")
+            breaker.record_failure()
+            raise DeadlineExceededError(f"{self.model} stream stalled past the deadline")
+        except Exception as e:
+            breaker.record_failure()
+            logger.error(f"Groq stream error: {e}")
+            raise LLMError(f"Failed to stream LLM response: {str(e)}")
+        breaker.record_success()
+    
+    async def _cached_complete(
+        self, prompt: str, max_tokens: int, temperature: float, use_cache: bool,
+        priority: int, deadline: Optional[Deadline]
+    ) -> str:
+        if self.cache is None or not use_cache:
+            result, _ = await self._complete(prompt, max_tokens, temperature, priority, deadline)
             return result
+        
+        key = CompletionCache.make_key(self.model, prompt, max_tokens, temperature)
+        cached = self.cache.get(key)
+        if cached is not None:
+            tracer.count("llm.cache_hit")
+            return cached
+        tracer.count("llm.cache_miss")
+        
+        start = time.perf_counter()
+        result, model = await self._complete(prompt, max_tokens, temperature, priority, deadline)
+        # Keyed by the primary model, so fallback answers are not kept
+        if model == self.model:
+            self.cache.put(key, result, time.perf_counter() - start)
+        return result
+    
+    async def _complete(
+        self, prompt: str, max_tokens: int, temperature: float, priority: int,
+        deadline: Optional[Deadline]
+    ) -> Tuple[str, str]:
+        """Answer from the first model that can: (text, model)"""
+        error: LLMError = CircuitOpenError("No LLM model available")
+        fallback = self.models[-1]
+        for model in self.models:
+            budget = deadline
+            if deadline is not None:
+                if model != fallback:
+                    # Leave the fallback model its typical latency (half the time until known)
+                    reserve = self.latencies[fallback]
+                    budget = deadline.child(deadline.remaining() - (
+                        reserve.percentile(50) if len(reserve) else deadline.remaining() / 2
+                    ))
+                if budget.remaining() < max(self.latencies[model].percentile(50), 1e-3):
+                    error = DeadlineExceededError(f"Too little time left for {model}")
+                    continue
+            if model != self.model:
+                _fallback_log.info("Falling back to {}: {}", model, error)
+                tracer.count("llm.model_fallback")
+            try:
+                retrying = AsyncRetrying(
+                    stop=stop_after_attempt(MAX_RETRIES)
+                    | _stop_for_deadline(budget, self.latencies[model]),
+                    wait=_RETRY_WAIT,
+                    # Rate limits were already waited out by the scheduler's pauses
+                    retry=retry_if_not_exception_type(
+                        (DeadlineExceededError, CircuitOpenError, RateLimitedError)
+                    ),
+                    before_sleep=lambda state: tracer.count("llm.retry"),
+                    reraise=True
+                )
+                return await retrying(
+                    self._attempt, model, prompt, max_tokens, temperature, priority, budget
+                ), model
+            except LLMError as e:
+                error = e
+        raise error
+    
+    async def _attempt(
+        self, model: str, prompt: str, max_tokens: int, temperature: float,
+        priority: int, deadline: Optional[Deadline]
+    ) -> str:
+        """One try against one model, within the deadline"""
+        breaker = self.breakers[model]
+        if not breaker.allow():
+            raise CircuitOpenError(f"Circuit open for {model}")
+        estimate = _estimate_tokens(prompt, max_tokens)
+        try:
+            for _ in range(GROQ_RATE_LIMIT_REQUEUES):
+                async with self.scheduler.slot(estimate, priority, _remaining(deadline)):
+                    start = time.perf_counter()
+                    try:
+                        async with tracer.span("llm.request"):
+                            result, used_tokens = await asyncio.wait_for(
+                                self._hedged_request(
+                                    model, prompt, max_tokens, temperature, estimate,
+                                    priority, deadline
+                                ),
+                                _remaining(deadline)
+                            )
+                    except RateLimitError as e:
+                        # Requeue behind the pause instead of sleeping blindly
+                        tracer.count("llm.rate_limited")
+                        self.scheduler.penalize(_retry_after(e))
+                        continue
+                    except asyncio.TimeoutError:
+                        breaker.record_failure()
+                        raise DeadlineExceededError(f"{model} did not answer before the deadline")
+                    except Exception as e:
+                        breaker.record_failure()
+                        logger.error(f"Groq API error: {e}")
+                        raise LLMError(f"Failed to get LLM response: {str(e)}")
+                
+                breaker.record_success()
+                self.latencies[model].record(time.perf_counter() - start)
+                if used_tokens is not None:
+                    self.scheduler.settle(estimate, used_tokens)
+                logger.debug("Groq response: {}...", result[:100])
+                return result
             
-        except Exception as e:
-            logger.error(f"Groq API error: {e}")
-            raise LLMError(f"Failed to get LLM response: {str(e)}")
+            raise RateLimitedError("Rate limited by Groq; giving up after requeues")
+        
+        except asyncio.TimeoutError:
+            raise DeadlineExceededError("No LLM slot freed up before the deadline")
+    
+    def _hedge_delay(self, model: str, deadline: Optional[Deadline]) -> Optional[float]:
+        """When to send a duplicate request, or None to send just one
+        
+        Only deadline-bound calls hedge, and only while nothing is queued
+        for a slot, so background work never doubles the load on Groq.
+        """
+        latency = self.latencies[model]
+        if (
+            deadline is None
+            or self.hedge_percentile <= 0
+            or len(latency) < LLM_HEDGE_MIN_SAMPLES
+            or self.scheduler.queued
+        ):
+            return None
+        delay = latency.percentile(self.hedge_percentile)
+        return delay if delay < deadline.remaining() else None
+    
+    async def _hedged_request(
+        self, model: str, prompt: str, max_tokens: int, temperature: float,
+        estimate: int, priority: int, deadline: Optional[Deadline]
+    ) -> Tuple[str, Optional[int]]:
+        """_request, duplicated if it is slower than usual; first answer wins"""
+        delay = self._hedge_delay(model, deadline)
+        if delay is None:
+            return await self._request(model, prompt, max_tokens, temperature)
+        
+        first = asyncio.ensure_future(self._request(model, prompt, max_tokens, temperature))
+        tasks = [first]
+        try:
+            done, _ = await asyncio.wait(tasks, timeout=delay)
+            if done:
+                return first.result()
+            
+            tracer.count("llm.hedged")
+            logger.debug("Hedging {} request after {:.0f}ms", model, delay * 1000)
+            tasks.append(asyncio.ensure_future(
+                self._slotted_request(model, prompt, max_tokens, temperature, estimate, priority)
+            ))
+            pending = set(tasks)
+            while True:
+                done, pending = await asyncio.wait(pending, return_when=asyncio.FIRST_COMPLETED)
+                for task in done:
+                    if task.exception() is None:
+                        return task.result()
+                # A failed copy only matters once the other has failed too
+                if not pending:
+                    return done.pop().result()
+        finally:
+            for task in tasks:
+                task.cancel()
+    
+    async def _slotted_request(
+        self, model: str, prompt: str, max_tokens: int, temperature: float,
+        estimate: int, priority: int
+    ) -> Tuple[str, Optional[int]]:
+        """_request in a slot of its own, so hedges count against the quota"""
+        async with self.scheduler.slot(estimate, priority):
+            return await self._request(model, prompt, max_tokens, temperature)
+    
+    async def _request(
+        self, model: str, prompt: str, max_tokens: int, temperature: float
+    ) -> Tuple[str, Optional[int]]:
+        """One chat completion: (text, total tokens used if reported)"""
+        response = await self.client.chat.completions.create(
+            model=model,
+            messages=[{"role": "user", "content": prompt}],
+            max_tokens=max_tokens,
+            temperature=temperature
+        )
+        usage = response.usage.total_tokens if response.usage else None
+        return response.choices[0].message.content, usage
+    
+    async def _stream_request(
+        self, model: str, prompt: str, max_tokens: int, temperature: float
+    ) -> AsyncIterator[str]:
+        """One streamed chat completion, yielding text deltas"""
+        response = await self.client.chat.completions.create(
+            model=model,
+            messages=[{"role": "user", "content": prompt}],
+            max_tokens=max_tokens,
+            temperature=temperature,
+            stream=True
+        )
+        try:
+            async for chunk in response:
+                delta = chunk.choices[0].delta.content if chunk.choices else None
+                if delta:
+                    yield delta
+        finally:
+            await response.close()
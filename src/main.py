@@ -3,6 +3,7 @@ Invoice Reminder Agent - Main Entry Point
 """
 import asyncio
 import os
+from typing import AsyncIterator
 from rich.console import Console
 from rich.panel import Panel
 from dotenv import load_dotenv
@@ -11,11 +12,21 @@ from voice_handler import VoiceHandler
 from agent import InvoiceAgent
 from utils.logger import setup_logger
 from utils.config import Config
+from utils.timing import StartupTimer
+from utils.tracing import tracer, setup_tracing
+from prompts.responses import Responses
 
 load_dotenv()
 console = Console()
 logger = setup_logger()
 
+async def echo(chunks: AsyncIterator[str]) -> AsyncIterator[str]:
+    """Print a reply as it streams, passing it on unchanged"""
+    async for chunk in chunks:
+        console.print(chunk, end="", markup=False, highlight=False)
+        yield chunk
+    console.print()
+
 async def main():
     console.print(Panel.fit(
         "[bold cyan]🎙️ Invoice Reminder Agent[/bold cyan]\n"
@@ -29,10 +40,26 @@ async def main():
     ))
     
     try:
-        config = Config()
+        timer = StartupTimer()
+        with timer.phase("config"):
+            config = Config()
+            setup_logger(config)
+            setup_tracing(config)
         voice = VoiceHandler(config)
-        agent = InvoiceAgent(config)
-        logger.info("Agent initialized")
+        
+        async def start_agent() -> InvoiceAgent:
+            agent = InvoiceAgent(config)
+            await agent.warm_up()
+            return agent
+        
+        # The STT model loads on its own thread while the agent and MCP come up
+        _, agent = await asyncio.gather(
+            timer.track("stt", voice.start_loading()),
+            timer.track("agent", start_agent())
+        )
+        timer.report()
+        # Fixed replies are synthesized while the user speaks the first command
+        presynthesis = asyncio.create_task(voice.presynthesize(Responses.FIXED))
         console.print("✅ [green]Ready![/green]\n")
     except Exception as e:
         console.print(f"❌ [red]Error: {e}[/red]")
@@ -40,28 +67,33 @@ async def main():
     
     while True:
         try:
-            console.print("\n[yellow]🎤 Listening...[/yellow]")
-            user_input = await voice.listen()
-            
-            if not user_input:
-                continue
-            
-            console.print(f"[bold]👤 You:[/bold] {user_input}")
-            
-            if any(word in user_input.lower() for word in ['exit', 'quit', 'bye']):
-                farewell = "Goodbye!"
-                console.print(f"[bold]🤖 Agent:[/bold] {farewell}")
-                await voice.speak(farewell)
-                break
-            
-            response = await agent.process(user_input)
-            console.print(f"[bold]🤖 Agent:[/bold] {response}")
-            await voice.speak(response)
+            # One trace per spoken exchange: capture, STT, agent, TTS, playback
+            async with tracer.turn("voice.turn"):
+                console.print("\n[yellow]🎤 Listening...[/yellow]")
+                user_input = await voice.listen()
+                
+                if not user_input:
+                    continue
+                
+                console.print(f"[bold]👤 You:[/bold] {user_input}")
+                
+                if any(word in user_input.lower() for word in ['exit', 'quit', 'bye']):
+                    farewell = Responses.GOODBYE
+                    console.print(f"[bold]🤖 Agent:[/bold] {farewell}")
+                    await voice.speak(farewell)
+                    break
+                
+                # Generated replies start playing from their first sentence
+                console.print("[bold]🤖 Agent:[/bold] ", end="")
+                await voice.speak_stream(echo(agent.process_stream(user_input)))
             
         except KeyboardInterrupt:
             break
         except Exception as e:
             console.print(f"[red]❌ {e}[/red]")
+    
+    presynthesis.cancel()
+    await agent.aclose()
 
 if __name__ == "__main__":
     asyncio.run(main())
@@ -3,6 +3,7 @@ import asyncio
 from agent import InvoiceAgent
 from utils.config import Config
 from utils.logger import setup_logger
+from utils.tracing import setup_tracing
 from rich.console import Console
 
 console = Console()
@@ -11,7 +12,10 @@ logger = setup_logger()
 async def main():
     console.print("[cyan]🤖 Invoice Agent (Text Mode)[/cyan]\n")
     config = Config()
+    setup_logger(config)
+    setup_tracing(config)
     agent = InvoiceAgent(config)
+    await agent.warm_up()
     console.print("Commands: 'check invoices', 'send reminder to [company]', 'exit'\n")
     
     while True:
@@ -21,6 +25,8 @@ async def main():
             break
         response = await agent.process(user_input)
         console.print(f"[green]Agent:[/green] {response}\n")
+    
+    await agent.aclose()
 
 if __name__ == "__main__":
     asyncio.run(main())
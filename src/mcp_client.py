@@ -0,0 +1,131 @@
+"""HTTP MCP client for the PFMCP server"""
+import asyncio
+import json
+from typing import Any, Dict, List, Optional, Sequence, Tuple
+import httpx
+from loguru import logger
+
+from exceptions import MCPError
+from utils.tracing import tracer
+from utils.logger import ThrottledLogger
+from constants import (
+    MCP_MAX_CONNECTIONS, MCP_TIMEOUT, MCP_TOOL_TIMEOUTS, MCP_READ_ONLY_TOOLS
+)
+
+ToolCall = Tuple[str, str, Optional[Dict]]
+
+_coalesced_log = ThrottledLogger()
+
+class MCPClient:
+    """Same call_tool interface as MockMCPClient, over pooled HTTP
+
+    Identical concurrent calls to read-only tools are coalesced into one
+    request (single flight); every waiter gets the same result object, so
+    callers must not mutate it.
+    """
+
+    def __init__(self, config, http_client: Optional[httpx.AsyncClient] = None):
+        max_connections = config.get("MCP_MAX_CONNECTIONS", MCP_MAX_CONNECTIONS)
+        self.http_client = http_client or httpx.AsyncClient(
+            base_url=config.get("PFMCP_BASE_URL"),
+            limits=httpx.Limits(
+                max_connections=max_connections,
+                max_keepalive_connections=max_connections
+            ),
+            timeout=MCP_TIMEOUT
+        )
+        self._inflight: Dict[str, asyncio.Future] = {}
+        self.requests = 0
+        self.coalesced = 0
+        logger.info(f"MCP client: {self.http_client.base_url}")
+
+    async def aclose(self):
+        """Close the pooled HTTP connections"""
+        await self.http_client.aclose()
+
+    async def call_tool(self, server: str, tool: str, params: Optional[Dict] = None) -> Any:
+        async with tracer.span(f"mcp.{tool}"):
+            return await self._call_tool(server, tool, params or {})
+
+    async def _call_tool(self, server: str, tool: str, params: Dict) -> Any:
+        if tool not in MCP_READ_ONLY_TOOLS:
+            return await self._request(server, tool, params)
+
+        key = json.dumps([server, tool, params], sort_keys=True, default=str)
+        inflight = self._inflight.get(key)
+        if inflight is not None:
+            self.coalesced += 1
+            tracer.count("mcp.coalesced")
+            _coalesced_log.debug("MCP {}/{} joined an in-flight request", server, tool)
+            return await asyncio.shield(inflight)
+
+        task = asyncio.ensure_future(self._request(server, tool, params))
+        self._inflight[key] = task
+        task.add_done_callback(lambda done: self._settle(key, done))
+        # Shielded so one cancelled waiter does not fail the others
+        return await asyncio.shield(task)
+
+    async def call_tools(
+        self, calls: Sequence[ToolCall], return_exceptions: bool = False
+    ) -> List[Any]:
+        """Run several tool calls in one round trip via the batch endpoint
+
+        Results come back in call order. A failed call raises MCPError, or
+        is returned in place when return_exceptions is true.
+        """
+        if not calls:
+            return []
+        timeout = max(MCP_TOOL_TIMEOUTS.get(tool, MCP_TIMEOUT) for _, tool, _ in calls)
+        payload = {"calls": [
+            {"server": server, "tool": tool, "params": params or {}}
+            for server, tool, params in calls
+        ]}
+        async with tracer.span("mcp.batch"):
+            body = await self._post("/batch", payload, timeout, f"batch of {len(calls)}")
+
+        results = []
+        for (server, tool, _), item in zip(calls, body["results"]):
+            if "error" in item:
+                error = MCPError(f"{server}/{tool} failed: {item['error']}")
+                if not return_exceptions:
+                    raise error
+                results.append(error)
+            else:
+                results.append(item["result"])
+        return results
+
+    def stats(self) -> dict:
+        return {
+            "requests": self.requests,
+            "coalesced": self.coalesced,
+            "inflight": len(self._inflight),
+        }
+
+    async def _request(self, server: str, tool: str, params: Dict) -> Any:
+        timeout = MCP_TOOL_TIMEOUTS.get(tool, MCP_TIMEOUT)
+        body = await self._post(f"/tools/{server}/{tool}", params, timeout, f"{server}/{tool}")
+        return body["result"]
+
+    async def _post(self, path: str, payload: Any, timeout: float, label: str) -> dict:
+        self.requests += 1
+        try:
+            response = await self.http_client.post(path, json=payload, timeout=timeout)
+        except httpx.TimeoutException:
+            raise MCPError(f"MCP {label} timed out after {timeout}s")
+        except httpx.HTTPError as e:
+            raise MCPError(f"MCP {label} failed: {e}")
+
+        try:
+            body = response.json()
+        except ValueError:
+            body = {}
+        if response.is_error:
+            detail = body.get("error", response.reason_phrase)
+            raise MCPError(f"MCP {label} returned {response.status_code}: {detail}")
+        return body
+
+    def _settle(self, key: str, task: asyncio.Future):
+        self._inflight.pop(key, None)
+        # Mark the outcome retrieved even if every waiter was cancelled
+        if not task.cancelled():
+            task.exception()
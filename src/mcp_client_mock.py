@@ -1,41 +1,132 @@
 """Mock MCP Client"""
-from typing import Dict, Any, Optional
+import asyncio
+from typing import Any, Callable, Dict, List, Optional, Sequence, Tuple
 from loguru import logger
-from datetime import datetime, timedelta
+from datetime import date, timedelta
+from itertools import chain
+
+from invoice_store import InvoiceStore, generate_invoices
+from exceptions import MCPError
+from utils.tracing import tracer
+from utils.logger import ThrottledLogger
+from constants import INVOICE_PAGE_SIZE, MOCK_LEDGER_SIZE
+
+_call_log = ThrottledLogger()
+
+def _demo_invoices(as_of: date):
+    """The two hand-written invoices used in the demo script"""
+    return [
+        {"id": "inv_001", "customer_name": "Acme Corp",
+         "customer_email": "john@acme.com", "amount": 500.00,
+         "due_date": (as_of - timedelta(days=10)).isoformat(),
+         "status": "past_due"},
+        {"id": "inv_002", "customer_name": "Beta Industries",
+         "customer_email": "jane@beta.com", "amount": 600.00,
+         "due_date": (as_of - timedelta(days=15)).isoformat(),
+         "status": "past_due"},
+    ]
 
 class MockMCPClient:
         def __init__(self, config):
+            size = config.get("MOCK_LEDGER_SIZE", MOCK_LEDGER_SIZE) if config else MOCK_LEDGER_SIZE
+            as_of = date.today()
+            # Built once; every call reads the same indexed ledger
+            invoices = chain(_demo_invoices(as_of), generate_invoices(size, as_of=as_of))
+            self.store = InvoiceStore.from_invoices(invoices, as_of=as_of)
+            self._subscribers: List[Callable[[dict], None]] = []
             logger.info("✅ Mock MCP (no server needed)")
-    
+
+        def subscribe(self, callback: Callable[[dict], None]):
+            """Receive invoice change events, like Stripe webhooks"""
+            self._subscribers.append(callback)
+
+        def _publish(
+            self, event_type: str, invoice: Optional[dict], previous_status: Optional[str] = None
+        ) -> Optional[dict]:
+            if invoice is not None:
+                event = {"type": event_type, "invoice": invoice}
+                if previous_status is not None:
+                    # Like Stripe's data.previous_attributes
+                    event["previous_attributes"] = {"status": previous_status}
+                for callback in self._subscribers:
+                    callback(event)
+            return invoice
+
+        def _set_status(self, event_type: str, invoice_id: str, status: str) -> Optional[dict]:
+            before = self.store.get(invoice_id)
+            invoice = self.store.update_status(invoice_id, status)
+            return self._publish(event_type, invoice, before and before["status"])
+
         async def call_tool(self, server: str, tool: str, params: Optional[Dict] = None) -> Any:
-            logger.info(f"[MOCK] {server}/{tool}")
-            params = params or {}
-    
-            all_invoices = [
-                 {"id": "inv_001", "customer_name": "Acme Corp", 
-                   "customer_email": "john@acme.com", "amount": 500.00,
-                   "due_date": (datetime.now() - timedelta(days=10)).isoformat(),
-                   "status": "past_due", "days_overdue": 10},
-                 {"id": "inv_002", "customer_name": "Beta Industries",
-                    "customer_email": "jane@beta.com", "amount": 600.00,
-                    "due_date": (datetime.now() - timedelta(days=15)).isoformat(),
-                    "status": "past_due", "days_overdue": 15}
-            ]
-    
+            with tracer.span(f"mcp.{tool}"):
+                return self._call_tool(server, tool, params or {})
+
+        def _call_tool(self, server: str, tool: str, params: Dict) -> Any:
+            _call_log.debug("[MOCK] {}/{}", server, tool)
+
             if server == "stripe":
                 if tool == "list_invoices":
-                    return all_invoices                      # Return all
-        
+                    return self.store.page(
+                        params.get("status"),
+                        params.get("limit", INVOICE_PAGE_SIZE),
+                        params.get("cursor")
+                    )
+
+                elif tool == "summarize_invoices":
+                    return self.store.summarize(
+                        params.get("status"),
+                        top_n=params.get("top_n", 3),
+                        order_by=params.get("order_by", "amount")
+                    )
+
+                elif tool == "aging_summary":
+                    return self.store.aging_summary(
+                        params.get("status", "past_due"),
+                        top_customers=params.get("top_customers", 3)
+                    )
+
                 elif tool == "search_invoices":
-                    customer = params.get("customer_name", "").lower()
-                    filtered = [
-                        inv for inv in all_invoices
-                        if customer in inv["customer_name"].lower()
-                    ]
-                    logger.info(f"[MOCK] Searching for '{customer}' → {len(filtered)} results")
-                    return filtered                          # Return filtered!
-    
+                    customer = params.get("customer_name", "")
+                    filtered = self.store.search(customer, params.get("status"))
+                    logger.debug("[MOCK] Searching for '{}' → {} results", customer, len(filtered))
+                    return filtered
+
+                elif tool == "list_customers":
+                    return self.store.customers()
+
+                elif tool == "create_invoice":
+                    return self._publish("invoice.created", self.store.add(params["invoice"]))
+
+                elif tool == "update_invoice":
+                    return self._set_status("invoice.updated", params["id"], params["status"])
+
+                elif tool == "record_payment":
+                    return self._set_status("invoice.paid", params["id"], "paid")
+
             elif server == "gmail":
+                if tool == "send_batch":
+                    messages = params.get("messages", [])
+                    logger.info("[MOCK] Sending {} emails", len(messages))
+                    return [{"status": "sent", "to": m.get("to")} for m in messages]
                 return {"status": "sent", "to": params.get("to")}
-    
-            return {"status": "ok"}
\ No newline at end of file
+
+            return {"status": "ok"}
+
+        async def call_tools(
+            self, calls: Sequence[Tuple[str, str, Optional[Dict]]], return_exceptions: bool = False
+        ) -> List[Any]:
+            """Batch interface of MCPClient; runs the calls locally"""
+            results = await asyncio.gather(
+                *(self.call_tool(*call) for call in calls), return_exceptions=True
+            )
+            outcomes = []
+            for (server, tool, _), result in zip(calls, results):
+                if isinstance(result, Exception):
+                    result = MCPError(f"{server}/{tool} failed: {result}")
+                    if not return_exceptions:
+                        raise result
+                outcomes.append(result)
+            return outcomes
+
+        async def aclose(self):
+            pass
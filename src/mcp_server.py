@@ -0,0 +1,101 @@
+"""Local HTTP stand-in for the PFMCP server, backed by the mock ledger
+
+    python src/mcp_server.py --port 8000 --ledger-size 100000
+
+Serves the MockMCPClient tools as POST /tools/<server>/<tool> and
+POST /batch, so MCPClient can be exercised and load-tested offline.
+"""
+import argparse
+import asyncio
+import time
+from typing import Optional
+
+from mcp_client_mock import MockMCPClient
+from utils.http_server import JSONHTTPServer
+
+class MCPStandInServer:
+    """HTTP front for a MockMCPClient with optional simulated latency"""
+
+    def __init__(
+        self,
+        mcp: Optional[MockMCPClient] = None,
+        host: str = "127.0.0.1",
+        port: int = 8000,
+        latency: float = 0.0
+    ):
+        self.mcp = mcp or MockMCPClient(None)
+        self.latency = latency
+        self.http = JSONHTTPServer(self.handle, host, port)
+        self.requests = 0
+        self.tool_calls = 0
+        self._started = time.monotonic()
+
+    @property
+    def port(self) -> int:
+        return self.http.port
+
+    async def start(self):
+        await self.http.start()
+
+    async def serve_forever(self):
+        await self.http.serve_forever()
+
+    async def close(self):
+        await self.http.close()
+
+    async def handle(self, method: str, path: str, body: Optional[dict]):
+        self.requests += 1
+        parts = path.strip("/").split("/")
+
+        if method == "GET" and parts == ["stats"]:
+            return 200, {
+                "requests": self.requests,
+                "tool_calls": self.tool_calls,
+                "uptime_s": round(time.monotonic() - self._started, 1),
+            }
+        if method != "POST":
+            return 405, {"error": f"{method} not allowed"}
+
+        if parts == ["batch"]:
+            calls = body.get("calls") if isinstance(body, dict) else None
+            if not isinstance(calls, list) or not all(isinstance(c, dict) for c in calls):
+                return 400, {"error": "Expected {\"calls\": [...]}"}
+            results = await asyncio.gather(
+                *(self._call(c["server"], c["tool"], c.get("params")) for c in calls),
+                return_exceptions=True
+            )
+            return 200, {"results": [
+                {"error": str(r)} if isinstance(r, Exception) else {"result": r}
+                for r in results
+            ]}
+
+        if len(parts) == 3 and parts[0] == "tools":
+            try:
+                return 200, {"result": await self._call(parts[1], parts[2], body)}
+            except Exception as e:
+                return 400, {"error": str(e)}
+
+        return 404, {"error": f"No route for {path}"}
+
+    async def _call(self, server: str, tool: str, params: Optional[dict]):
+        self.tool_calls += 1
+        if self.latency:
+            await asyncio.sleep(self.latency)
+        return await self.mcp.call_tool(server, tool, params)
+
+async def _main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--host", default="127.0.0.1")
+    parser.add_argument("--port", type=int, default=8000)
+    parser.add_argument("--ledger-size", type=int, default=0,
+                        help="synthetic invoices added to the demo ones")
+    parser.add_argument("--latency-ms", type=float, default=0.0,
+                        help="simulated backend latency per tool call")
+    args = parser.parse_args()
+
+    mcp = MockMCPClient({"MOCK_LEDGER_SIZE": args.ledger_size})
+    server = MCPStandInServer(mcp, args.host, args.port, latency=args.latency_ms / 1000)
+    await server.serve_forever()
+
+if __name__ == "__main__":
+    asyncio.run(_main())
@@ -0,0 +1,11 @@
+"""Data models shared across the agent"""
+from pydantic import BaseModel
+
+class Invoice(BaseModel):
+    id: str
+    customer_name: str
+    customer_email: str
+    amount: float
+    due_date: str
+    status: str
+    days_overdue: int = 0
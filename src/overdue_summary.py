@@ -0,0 +1,166 @@
+"""Materialized overdue-invoice summary kept in the agent process"""
+import asyncio
+import time
+from typing import Dict, List, Optional
+from loguru import logger
+
+from constants import MAX_INVOICES_TO_DISPLAY, OVERDUE_SUMMARY_TTL
+from utils.tracing import tracer
+
+class OverdueSummary:
+    """Count, total, per-customer balances and top debtors of past-due invoices
+
+    Seeded from the summarize_invoices and aging_summary aggregates, so
+    only totals, one balance per customer and the largest invoices are
+    held, never the ledger. MCP change events are applied as deltas when
+    the client supports subscribe(); otherwise it is reseeded once older
+    than ttl seconds.
+    """
+
+    def __init__(self, mcp, ttl: float = OVERDUE_SUMMARY_TTL, top_n: int = MAX_INVOICES_TO_DISPLAY):
+        self.mcp = mcp
+        self.ttl = ttl
+        self.top_n = top_n
+        # Headroom so paying off a few of the largest doesn't force a reseed
+        self.keep = 2 * top_n
+        self._top: List[dict] = []  # the len(_top) largest, exactly
+        self._balances: Dict[str, List] = {}  # customer -> [total, invoice count]
+        self.count = 0
+        self.total = 0.0
+        self._refreshed_at: Optional[float] = None
+        self._refresh_lock = asyncio.Lock()
+        self.live = hasattr(mcp, "subscribe")
+        if self.live:
+            mcp.subscribe(self.apply)
+        self.refreshes = 0
+        self.updates = 0
+        self.last_refresh_seconds = 0.0
+
+    @property
+    def age(self) -> Optional[float]:
+        """Seconds since the last seed"""
+        return None if self._refreshed_at is None else time.monotonic() - self._refreshed_at
+
+    @property
+    def stale(self) -> bool:
+        """Never seeded, too few top invoices left, or past ttl when polling"""
+        return (
+            self._refreshed_at is None
+            or len(self._top) < min(self.top_n, self.count)
+            or (not self.live and self.age > self.ttl)
+        )
+
+    async def ensure_fresh(self):
+        """Reseed if stale"""
+        if self.stale:
+            await self.refresh()
+        else:
+            logger.debug(
+                "Overdue summary served from memory (age {:.1f}s, {})",
+                self.age, "live" if self.live else "polling"
+            )
+
+    async def refresh(self):
+        """Reseed from the MCP aggregates"""
+        async with self._refresh_lock:
+            stale_age = self.age
+            start = time.perf_counter()
+            async with tracer.span("overdue.refresh"):
+                summary, aging = await self.mcp.call_tools([
+                    ("stripe", "summarize_invoices", {"status": "past_due", "top_n": self.keep}),
+                    # None: every customer's balance, so events can adjust any of them
+                    ("stripe", "aging_summary", {"status": "past_due", "top_customers": None}),
+                ])
+
+            self.count = summary["count"]
+            self.total = summary["total"]
+            self._top = summary["top"]
+            self._balances = {
+                row["customer_name"]: [row["total"], row["count"]]
+                for row in aging["top_customers"]
+            }
+            self._refreshed_at = time.monotonic()
+            self.refreshes += 1
+            self.last_refresh_seconds = time.perf_counter() - start
+            logger.info(
+                f"Overdue summary refreshed: {self.count} invoices in "
+                f"{self.last_refresh_seconds:.2f}s"
+                + (f" (was {stale_age:.0f}s stale)" if stale_age is not None else "")
+            )
+
+    def apply(self, event: dict):
+        """Apply one invoice change event (created, updated, paid) as a delta"""
+        invoice = event["invoice"]
+        if event["type"] == "invoice.created":
+            was_overdue = False
+        else:
+            previous = event.get("previous_attributes") or {}
+            if "status" not in previous:
+                # No way to tell whether it was counted; reseed on next use
+                self._refreshed_at = None
+                return
+            was_overdue = previous["status"] == "past_due"
+        overdue = invoice["status"] == "past_due"
+        if was_overdue and not overdue:
+            self._remove(invoice)
+        elif overdue and not was_overdue:
+            self._add(invoice)
+        self.updates += 1
+        logger.debug("Overdue summary applied {} for {}", event["type"], invoice["id"])
+
+    def top_invoices(self, n: int) -> List[dict]:
+        """Largest overdue invoices by amount"""
+        return self._top[:n]
+
+    def top_debtors(self, n: int) -> List[dict]:
+        """Customers with the largest overdue balances"""
+        largest = sorted(self._balances.items(), key=lambda item: item[1][0], reverse=True)[:n]
+        return [
+            {"customer_name": name, "total": round(total, 2), "count": count}
+            for name, (total, count) in largest
+        ]
+
+    def snapshot(self, top_n: int) -> dict:
+        """Same shape as the summarize_invoices MCP tool"""
+        return {
+            "count": self.count,
+            "total": round(self.total, 2),
+            "top": self.top_invoices(top_n),
+        }
+
+    def stats(self) -> dict:
+        """Staleness and refresh cost"""
+        return {
+            "count": self.count,
+            "age_s": None if self.age is None else round(self.age, 1),
+            "live": self.live,
+            "refreshes": self.refreshes,
+            "last_refresh_s": round(self.last_refresh_seconds, 3),
+            "incremental_updates": self.updates,
+        }
+
+    def _add(self, invoice: dict):
+        self.count += 1
+        self.total += invoice["amount"]
+        balance = self._balances.setdefault(invoice["customer_name"], [0.0, 0])
+        balance[0] += invoice["amount"]
+        balance[1] += 1
+        # _top holds the exact top len(_top); a newcomer joins if it ranks
+        # above the smallest, or if _top already held every invoice
+        holds_all = len(self._top) == self.count - 1
+        if holds_all or (self._top and invoice["amount"] > self._top[-1]["amount"]):
+            self._top.append(invoice)
+            self._top.sort(key=lambda inv: inv["amount"], reverse=True)
+            del self._top[self.keep:]
+
+    def _remove(self, invoice: dict):
+        self.count -= 1
+        self.total -= invoice["amount"]
+        name = invoice["customer_name"]
+        balance = self._balances.get(name)
+        if balance is not None:
+            balance[0] -= invoice["amount"]
+            balance[1] -= 1
+            if balance[1] <= 0:
+                del self._balances[name]
+        self._top = [inv for inv in self._top if inv["id"] != invoice["id"]]
@@ -0,0 +1,18 @@
+"""Fixed spoken responses"""
+
+class Responses:
+    # Replies that never change; FIXED is pre-synthesized at startup
+    GOODBYE = "Goodbye!"
+    ASK_COMPANY = "Which company should I send a reminder to?"
+    HELP = "I can check invoices or send reminders. What would you like?"
+    NO_OVERDUE = "No overdue invoices!"
+    NO_CUSTOMERS_TO_REMIND = "No overdue customers to remind."
+    BULK_ALREADY_RUNNING = "Reminders to all overdue customers are already being sent."
+    LLM_ERROR = "I'm having trouble understanding. Please try again."
+    MCP_ERROR = "I'm having trouble accessing invoice data. Please try again."
+    UNEXPECTED_ERROR = "An unexpected error occurred. Please try again."
+
+    FIXED = [
+        GOODBYE, ASK_COMPANY, HELP, NO_OVERDUE, NO_CUSTOMERS_TO_REMIND, BULK_ALREADY_RUNNING,
+        LLM_ERROR, MCP_ERROR, UNEXPECTED_ERROR,
+    ]
@@ -1,6 +1,26 @@
 """System Prompts"""
 
 class SystemPrompts:
-    INTENT_CLASSIFICATION = """Classify: "{user_input}"
-Categories: check_invoices, send_reminder, help, other
-Return only the category."""
+    # Add new intents here; the parser prompt and validation pick them up
+    INTENTS = [
+        "check_invoices", "aging_summary", "send_reminder", "remind_all", "help", "other"
+    ]
+
+    COMMAND_PARSING = """{context}Parse the command: "{user_input}"
+Intents: {intents}
+Return only a JSON object with keys: {fields}.
+Use null for anything not mentioned."""
+
+    # Spoken answer for requests no handler covers; streamed into TTS
+    SPOKEN_REPLY = """{context}You are a voice assistant for accounts receivable.
+The user said: "{user_input}"
+Answer in at most two short sentences that read well aloud, without lists or markup.
+If it is not about invoices or payment reminders, say you can check overdue invoices,
+read the aging report or send payment reminders."""
+
+    # Prepended to COMMAND_PARSING and SPOKEN_REPLY when the session has history
+    PARSE_CONTEXT = """Conversation so far:
+{context}
+Resolve words like "them" or "it" from the conversation.
+
+"""
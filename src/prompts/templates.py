@@ -8,3 +8,20 @@ Amount: ${amount}
 Due: {due_date}
 Days Overdue: {days_overdue}
 Keep it under 200 words."""
+
+    CONSOLIDATED_REMINDER = """Write polite payment reminder covering several invoices:
+Customer: {customer_name}
+Invoices:
+{invoice_lines}
+Total Outstanding: ${total}
+Keep it under 250 words."""
+
+    INVOICE_LINE = "- {invoice_id}: ${amount}, due {due_date} ({days_overdue} days overdue)"
+
+    # Sent as-is when the LLM cannot draft the email in time
+    FALLBACK_REMINDER = """Dear {customer_name},
+
+This is a friendly reminder that invoice {invoice_id} for ${amount} was due on {due_date} and is now {days_overdue} days overdue. Please arrange payment at your earliest convenience, or let us know if it has already been sent.
+
+Kind regards,
+Accounts Receivable"""
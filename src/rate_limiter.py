@@ -0,0 +1,138 @@
+"""Token-bucket scheduler for Groq request and token quotas"""
+import asyncio
+import heapq
+import itertools
+import time
+from contextlib import asynccontextmanager
+from typing import List, Optional, Tuple
+from loguru import logger
+
+from constants import (
+    GROQ_REQUESTS_PER_MINUTE, GROQ_TOKENS_PER_MINUTE, GROQ_MAX_CONCURRENCY
+)
+
+class TokenBucket:
+    """Continuously refilling budget"""
+
+    def __init__(self, capacity: float, refill_per_second: float):
+        self.capacity = capacity
+        self.refill_per_second = refill_per_second
+        self.available = capacity
+        self._updated = time.monotonic()
+
+    def _refill(self, now: float):
+        elapsed = now - self._updated
+        self.available = min(self.capacity, self.available + elapsed * self.refill_per_second)
+        self._updated = now
+
+    def wait_time(self, amount: float, now: float) -> float:
+        """Seconds until amount is available (0 if it already is)"""
+        self._refill(now)
+        missing = min(amount, self.capacity) - self.available
+        return max(0.0, missing / self.refill_per_second)
+
+    def consume(self, amount: float):
+        """Take amount from the bucket; may go negative to record debt"""
+        self.available -= amount
+
+class RateLimitScheduler:
+    """Grants LLM calls in priority order within request/token budgets
+    
+    Lower priority values go first. Callers wait in a queue instead of
+    hitting 429s; a 429 that slips through pauses everyone for Retry-After.
+    """
+
+    def __init__(
+        self,
+        requests_per_minute: float = GROQ_REQUESTS_PER_MINUTE,
+        tokens_per_minute: float = GROQ_TOKENS_PER_MINUTE,
+        max_concurrency: int = GROQ_MAX_CONCURRENCY
+    ):
+        self._requests = TokenBucket(requests_per_minute, requests_per_minute / 60)
+        self._tokens = TokenBucket(tokens_per_minute, tokens_per_minute / 60)
+        self.max_concurrency = max_concurrency
+        self._waiters: List[Tuple[int, int, int, asyncio.Future]] = []
+        self._seq = itertools.count()
+        self._active = 0
+        self._paused_until = 0.0
+        self._timer: Optional[asyncio.TimerHandle] = None
+
+    @classmethod
+    def from_config(cls, config) -> "RateLimitScheduler":
+        """Build a scheduler from Config"""
+        return cls(
+            requests_per_minute=config.get("GROQ_REQUESTS_PER_MINUTE", GROQ_REQUESTS_PER_MINUTE),
+            tokens_per_minute=config.get("GROQ_TOKENS_PER_MINUTE", GROQ_TOKENS_PER_MINUTE),
+            max_concurrency=config.get("GROQ_MAX_CONCURRENCY", GROQ_MAX_CONCURRENCY)
+        )
+
+    @property
+    def queued(self) -> int:
+        """Number of calls waiting for a slot"""
+        return sum(1 for *_, future in self._waiters if not future.done())
+
+    @asynccontextmanager
+    async def slot(self, tokens: int, priority: int = 0, timeout: Optional[float] = None):
+        """Hold a request slot charged with an estimated token cost
+        
+        Raises asyncio.TimeoutError if no slot frees up within timeout.
+        """
+        await asyncio.wait_for(self._acquire(tokens, priority), timeout)
+        try:
+            yield
+        finally:
+            self._active -= 1
+            self._dispatch()
+
+    def settle(self, estimated: int, actual: int):
+        """Correct the token bucket once real usage is known"""
+        self._tokens.consume(actual - estimated)
+
+    def penalize(self, seconds: float):
+        """Pause all dispatching, e.g. after a 429 with Retry-After"""
+        self._paused_until = max(self._paused_until, time.monotonic() + seconds)
+        logger.warning(f"Rate limited, pausing LLM calls for {seconds:.1f}s")
+        self._dispatch()
+
+    async def _acquire(self, tokens: int, priority: int):
+        future = asyncio.get_running_loop().create_future()
+        heapq.heappush(self._waiters, (priority, next(self._seq), tokens, future))
+        self._dispatch()
+        try:
+            await future
+        except asyncio.CancelledError:
+            if future.done() and not future.cancelled():
+                # Granted just before cancellation; hand the slot back
+                self._active -= 1
+                self._dispatch()
+            raise
+
+    def _dispatch(self):
+        if self._timer is not None:
+            self._timer.cancel()
+            self._timer = None
+
+        now = time.monotonic()
+        while self._waiters:
+            _, _, tokens, future = self._waiters[0]
+            if future.done():
+                heapq.heappop(self._waiters)
+                continue
+            if self._active >= self.max_concurrency:
+                return  # a release will dispatch again
+
+            wait = max(
+                self._paused_until - now,
+                self._requests.wait_time(1, now),
+                self._tokens.wait_time(tokens, now)
+            )
+            if wait > 0:
+                loop = asyncio.get_running_loop()
+                self._timer = loop.call_later(wait, self._dispatch)
+                return
+
+            heapq.heappop(self._waiters)
+            self._requests.consume(1)
+            self._tokens.consume(tokens)
+            self._active += 1
+            future.set_result(None)
@@ -0,0 +1,118 @@
+"""Deadlines, latency tracking and circuit breaking for remote calls"""
+import time
+from collections import deque
+from typing import Optional
+from loguru import logger
+
+from utils.timing import percentile
+from utils.tracing import tracer
+from constants import (
+    LLM_LATENCY_WINDOW, LLM_BREAKER_FAILURES, LLM_BREAKER_RESET
+)
+
+class Deadline:
+    """Point in time by which a call chain has to answer"""
+
+    __slots__ = ("expires_at",)
+
+    def __init__(self, seconds: float):
+        self.expires_at = time.monotonic() + seconds
+
+    def remaining(self) -> float:
+        return max(0.0, self.expires_at - time.monotonic())
+
+    @property
+    def expired(self) -> bool:
+        return self.remaining() <= 0
+
+    def child(self, seconds: float) -> "Deadline":
+        """A tighter deadline for one stage; never later than this one"""
+        child = Deadline(seconds)
+        child.expires_at = min(child.expires_at, self.expires_at)
+        return child
+
+    def __repr__(self) -> str:
+        return f"Deadline({self.remaining():.2f}s left)"
+
+class LatencyTracker:
+    """Sliding window of successful call latencies"""
+
+    def __init__(self, window: int = LLM_LATENCY_WINDOW):
+        self._samples: deque = deque(maxlen=window)
+
+    def __len__(self) -> int:
+        return len(self._samples)
+
+    def record(self, seconds: float):
+        self._samples.append(seconds)
+
+    def percentile(self, q: float) -> float:
+        return percentile(self._samples, q)
+
+class CircuitBreaker:
+    """Stops calling an endpoint after repeated failures
+
+    Closed: calls pass. After failure_threshold consecutive failures it
+    opens and rejects calls for reset_timeout seconds, then lets a single
+    trial call through (half-open); its outcome closes or reopens it.
+    """
+
+    def __init__(
+        self,
+        name: str,
+        failure_threshold: int = LLM_BREAKER_FAILURES,
+        reset_timeout: float = LLM_BREAKER_RESET
+    ):
+        self.name = name
+        self.failure_threshold = failure_threshold
+        self.reset_timeout = reset_timeout
+        self.failures = 0
+        self.opened_at: Optional[float] = None
+        self._trial_at: Optional[float] = None
+        self.rejected = 0
+
+    @property
+    def state(self) -> str:
+        if self.opened_at is None:
+            return "closed"
+        if time.monotonic() - self.opened_at < self.reset_timeout:
+            return "open"
+        return "half_open"
+
+    def allow(self) -> bool:
+        """Whether a call may go out now"""
+        state = self.state
+        if state == "closed":
+            return True
+        now = time.monotonic()
+        # A trial that never reported back (e.g. cancelled) is retried
+        if state == "half_open" and (
+            self._trial_at is None or now - self._trial_at > self.reset_timeout
+        ):
+            self._trial_at = now
+            return True
+        self.rejected += 1
+        return False
+
+    def record_success(self):
+        if self.opened_at is not None:
+            logger.info(f"Circuit {self.name} closed")
+        self.failures = 0
+        self.opened_at = None
+        self._trial_at = None
+
+    def record_failure(self):
+        self.failures += 1
+        if self._trial_at is not None or (
+            self.opened_at is None and self.failures >= self.failure_threshold
+        ):
+            logger.warning(
+                f"Circuit {self.name} open for {self.reset_timeout:.0f}s "
+                f"after {self.failures} failures"
+            )
+            tracer.count(f"{self.name}.circuit_opened")
+            self.opened_at = time.monotonic()
+            self._trial_at = None
+
+    def stats(self) -> dict:
+        return {"state": self.state, "failures": self.failures, "rejected": self.rejected}
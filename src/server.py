@@ -0,0 +1,159 @@
+"""Multi-session HTTP server for the invoice agent
+
+    python src/server.py
+
+POST /sessions                      -> {"session_id"}
+POST /sessions/<id>/messages        {"text"} -> {"session_id", "turn_id", "response", "latency_ms"}
+DELETE /sessions/<id>
+GET  /health
+GET  /metrics                       Prometheus text; ?format=json for JSON
+
+One InvoiceAgent (and so one LLM provider, MCP client and set of caches)
+serves every session. Messages to an unknown id start a new session.
+"""
+import asyncio
+import re
+import time
+from typing import Optional
+
+from agent import InvoiceAgent
+from session import SessionManager
+from conversation import ConversationContext
+from exceptions import SessionLimitError
+from utils.config import Config
+from utils.http_server import JSONHTTPServer
+from utils.logger import setup_logger
+from utils.tracing import tracer, setup_tracing
+from constants import (
+    SERVER_HOST, SERVER_PORT, SERVER_MAX_SESSIONS, SERVER_MAX_INFLIGHT,
+    SESSION_IDLE_TIMEOUT
+)
+
+_SESSION_ID = re.compile(r"^[A-Za-z0-9_-]{1,64}$")
+_RETRY_AFTER = {"Retry-After": "1"}
+_PROMETHEUS = {"Content-Type": "text/plain; version=0.0.4; charset=utf-8"}
+
+class AgentServer:
+    """Routes HTTP requests to a shared agent with per-session state
+
+    At most max_inflight turns run at once; beyond that requests are
+    rejected with 503 and Retry-After instead of queueing without bound.
+    """
+
+    def __init__(self, agent: InvoiceAgent, config, host: Optional[str] = None, port: Optional[int] = None):
+        self.agent = agent
+        self.sessions = SessionManager(
+            max_sessions=config.get("SERVER_MAX_SESSIONS", SERVER_MAX_SESSIONS),
+            idle_timeout=config.get("SESSION_IDLE_TIMEOUT", SESSION_IDLE_TIMEOUT),
+            context_factory=lambda: ConversationContext.from_config(config)
+        )
+        self.max_inflight = config.get("SERVER_MAX_INFLIGHT", SERVER_MAX_INFLIGHT)
+        self.inflight = 0
+        self.rejected = 0
+        self.http = JSONHTTPServer(
+            self.handle,
+            host or config.get("SERVER_HOST", SERVER_HOST),
+            config.get("SERVER_PORT", SERVER_PORT) if port is None else port
+        )
+        self._eviction: Optional[asyncio.Task] = None
+
+    @property
+    def port(self) -> int:
+        return self.http.port
+
+    async def start(self):
+        await self.agent.warm_up()
+        await self.http.start()
+        self._eviction = asyncio.create_task(self.sessions.run_eviction())
+
+    async def serve_forever(self):
+        await self.start()
+        try:
+            await self.http.serve_forever()
+        finally:
+            await self.close()
+
+    async def close(self):
+        if self._eviction:
+            self._eviction.cancel()
+        await self.http.close()
+        await self.agent.aclose()
+
+    async def handle(self, method: str, path: str, body: Optional[dict]):
+        path, _, query = path.partition("?")
+        parts = path.strip("/").split("/")
+
+        if method == "GET" and parts == ["health"]:
+            return 200, {
+                "status": "ok",
+                "inflight": self.inflight,
+                "rejected": self.rejected,
+                "sessions": self.sessions.stats(),
+                "overdue_summary": self.agent.overdue.stats(),
+            }
+
+        if method == "GET" and parts == ["metrics"]:
+            if "format=json" in query.split("&"):
+                return 200, tracer.snapshot()
+            return 200, tracer.prometheus(), _PROMETHEUS
+
+        if parts[0] != "sessions" or len(parts) > 3:
+            return 404, {"error": f"No route for {path}"}
+        if len(parts) > 1 and not _SESSION_ID.match(parts[1]):
+            return 400, {"error": "Invalid session id"}
+
+        if method == "POST" and len(parts) == 1:
+            try:
+                session = self.sessions.get_or_create()
+            except SessionLimitError as e:
+                return self._reject(str(e))
+            return 200, {"session_id": session.id}
+
+        if method == "DELETE" and len(parts) == 2:
+            if not self.sessions.close(parts[1]):
+                return 404, {"error": "Unknown session"}
+            return 200, {"session_id": parts[1], "closed": True}
+
+        if method == "POST" and len(parts) == 3 and parts[2] == "messages":
+            text = body.get("text") if isinstance(body, dict) else None
+            if not isinstance(text, str):
+                return 400, {"error": "Expected {\"text\": ...}"}
+            return await self._message(parts[1], text)
+
+        return 405, {"error": f"{method} not allowed on {path}"}
+
+    async def _message(self, session_id: str, text: str):
+        if self.inflight >= self.max_inflight:
+            return self._reject("Server busy")
+        try:
+            session = self.sessions.get_or_create(session_id)
+        except SessionLimitError as e:
+            return self._reject(str(e))
+
+        self.inflight += 1
+        start = time.perf_counter()
+        try:
+            async with tracer.turn("server.message") as turn:
+                response = await self.agent.process(text, session)
+        finally:
+            self.inflight -= 1
+        return 200, {
+            "session_id": session.id,
+            "turn_id": turn.turn_id,
+            "response": response,
+            "latency_ms": round((time.perf_counter() - start) * 1000, 1),
+        }
+
+    def _reject(self, reason: str):
+        self.rejected += 1
+        return 503, {"error": reason}, _RETRY_AFTER
+
+async def main():
+    config = Config()
+    setup_logger(config)
+    setup_tracing(config)
+    server = AgentServer(InvoiceAgent(config), config)
+    await server.serve_forever()
+
+if __name__ == "__main__":
+    asyncio.run(main())
@@ -0,0 +1,117 @@
+"""Per-user conversation sessions for the multi-session server"""
+import asyncio
+import time
+import uuid
+from collections import OrderedDict
+from typing import Callable, Optional
+from loguru import logger
+
+from conversation import ConversationContext
+from exceptions import SessionLimitError
+from constants import SERVER_MAX_SESSIONS, SESSION_IDLE_TIMEOUT
+
+class Session:
+    """Lightweight state for one conversation; everything heavy is shared"""
+
+    __slots__ = ("id", "context", "lock", "created_at", "last_active", "turns")
+
+    def __init__(self, session_id: Optional[str] = None, context: Optional[ConversationContext] = None):
+        self.id = session_id or uuid.uuid4().hex
+        self.context = context or ConversationContext()
+        # One turn at a time per session; other sessions run concurrently
+        self.lock = asyncio.Lock()
+        self.created_at = self.last_active = time.monotonic()
+        self.turns = 0
+
+    def touch(self):
+        self.last_active = time.monotonic()
+
+    @property
+    def idle_seconds(self) -> float:
+        return time.monotonic() - self.last_active
+
+    @property
+    def busy(self) -> bool:
+        return self.lock.locked()
+
+class SessionManager:
+    """Bounded session table with idle eviction
+
+    Sessions are kept in least-recently-used order. When the table is full
+    the oldest idle session is evicted; if every session is mid-turn,
+    SessionLimitError is raised so the caller can shed load.
+    """
+
+    def __init__(
+        self,
+        max_sessions: int = SERVER_MAX_SESSIONS,
+        idle_timeout: float = SESSION_IDLE_TIMEOUT,
+        context_factory: Callable[[], ConversationContext] = ConversationContext
+    ):
+        self.max_sessions = max_sessions
+        self.idle_timeout = idle_timeout
+        self.context_factory = context_factory
+        self._sessions: "OrderedDict[str, Session]" = OrderedDict()
+        self.created = 0
+        self.evicted = 0
+
+    def __len__(self) -> int:
+        return len(self._sessions)
+
+    def get(self, session_id: str) -> Optional[Session]:
+        session = self._sessions.get(session_id)
+        if session is not None:
+            self._sessions.move_to_end(session_id)
+            session.touch()
+        return session
+
+    def get_or_create(self, session_id: Optional[str] = None) -> Session:
+        session = self.get(session_id) if session_id else None
+        if session is not None:
+            return session
+        if len(self._sessions) >= self.max_sessions:
+            self._evict_one()
+        session = Session(session_id, self.context_factory())
+        self._sessions[session.id] = session
+        self.created += 1
+        return session
+
+    def close(self, session_id: str) -> bool:
+        return self._sessions.pop(session_id, None) is not None
+
+    def evict_idle(self) -> int:
+        """Drop sessions idle longer than idle_timeout"""
+        expired = [
+            sid for sid, s in self._sessions.items()
+            if not s.busy and s.idle_seconds > self.idle_timeout
+        ]
+        for sid in expired:
+            del self._sessions[sid]
+        self.evicted += len(expired)
+        if expired:
+            logger.info(f"Evicted {len(expired)} idle sessions, {len(self._sessions)} remain")
+        return len(expired)
+
+    async def run_eviction(self, interval: Optional[float] = None):
+        """Background loop calling evict_idle"""
+        interval = interval or max(self.idle_timeout / 4, 1.0)
+        while True:
+            await asyncio.sleep(interval)
+            self.evict_idle()
+
+    def stats(self) -> dict:
+        return {
+            "active": len(self._sessions),
+            "max": self.max_sessions,
+            "created": self.created,
+            "evicted": self.evicted,
+        }
+
+    def _evict_one(self):
+        for sid, session in self._sessions.items():
+            if not session.busy:
+                del self._sessions[sid]
+                self.evicted += 1
+                logger.debug(f"Session table full, evicted least recent {sid}")
+                return
+        raise SessionLimitError(f"All {self.max_sessions} sessions are busy")
@@ -0,0 +1,105 @@
+"""Speculative execution of likely agent stages"""
+import asyncio
+import time
+from typing import Any, Awaitable, Callable, Dict, Optional
+from loguru import logger
+
+from utils.tracing import tracer
+
+class _Guess:
+    __slots__ = ("task", "started", "finished", "taken")
+
+    def __init__(self, task: asyncio.Task):
+        self.task = task
+        self.started = time.perf_counter()
+        self.finished: Optional[float] = None
+        self.taken = False
+
+class Speculator:
+    """Runs guesses alongside the slow path of one turn
+
+    start() launches a named coroutine as a task. take() hands back its
+    result, waiting if it is still running, or runs the fallback when
+    nothing was started under that name or the guess failed. cancel_rest()
+    cancels what the turn did not use, and report() sums up the time saved
+    and the calls wasted.
+    """
+
+    def __init__(self):
+        self._guesses: Dict[str, _Guess] = {}
+        self.saved = 0.0
+        self.wasted = 0.0
+        self.used = []
+        self.unused = []
+
+    def __contains__(self, name: str) -> bool:
+        return name in self._guesses
+
+    def start(self, name: str, coro: Awaitable[Any]):
+        """Begin a guess; a second start under the same name is ignored"""
+        if name in self._guesses:
+            coro.close()
+            return
+        guess = _Guess(asyncio.ensure_future(coro))
+        guess.task.add_done_callback(lambda task: self._done(guess, task))
+        self._guesses[name] = guess
+
+    async def take(self, name: str, fallback: Callable[[], Awaitable[Any]]) -> Any:
+        """Result of the guess called name, else of fallback()"""
+        guess = self._guesses.get(name)
+        if guess is None or guess.taken:
+            return await fallback()
+        guess.taken = True
+        asked = time.perf_counter()
+        try:
+            # Shielded: cancelling this turn must not look like a failed guess
+            result = await asyncio.shield(guess.task)
+        except asyncio.CancelledError:
+            if not guess.task.cancelled():
+                raise
+            return await fallback()
+        except Exception as e:
+            # The real call surfaces the error if it happens again
+            logger.debug("Speculative {} failed ({}), running it again", name, e)
+            tracer.count("speculation.failed")
+            return await fallback()
+        # Work that overlapped the slow path instead of following it
+        self.saved += min(guess.finished or asked, asked) - guess.started
+        self.used.append(name)
+        return result
+
+    def cancel_rest(self):
+        """Stop whatever is still running; untaken guesses count as waste"""
+        now = time.perf_counter()
+        for name, guess in self._guesses.items():
+            guess.task.cancel()
+            if not guess.taken:
+                self.wasted += (guess.finished or now) - guess.started
+                self.unused.append(name)
+
+    def report(self) -> dict:
+        """What speculation bought this turn; also logged and counted"""
+        report = {
+            "started": len(self._guesses),
+            "used": self.used,
+            "wasted": self.unused,
+            "saved_ms": round(self.saved * 1000, 1),
+            "wasted_ms": round(self.wasted * 1000, 1),
+        }
+        if self._guesses:
+            tracer.count("speculation.used", len(self.used))
+            tracer.count("speculation.wasted", len(self.unused))
+            tracer.observe("speculation.saved", self.saved)
+            logger.info(
+                "Speculation: used {} (saved {}ms), wasted {} ({}ms of work)",
+                self.used or "nothing", report["saved_ms"],
+                self.unused or "nothing", report["wasted_ms"]
+            )
+        return report
+
+    @staticmethod
+    def _done(guess: _Guess, task: asyncio.Task):
+        guess.finished = time.perf_counter()
+        # Mark failures retrieved; take() re-raises them if the guess is used
+        if not task.cancelled():
+            task.exception()
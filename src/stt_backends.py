@@ -0,0 +1,194 @@
+"""Speech-to-text backends
+
+Every backend loads its model once, transcribes 16 kHz float32 buffers and
+records how many seconds of audio it gets through per wall-clock second.
+Engines are imported on first use so startup stays cheap.
+
+    python src/stt_backends.py command.wav whisper faster-whisper
+
+compares the given backends on one recording.
+"""
+import sys
+import threading
+import time
+from abc import ABC, abstractmethod
+import numpy as np
+from loguru import logger
+
+from exceptions import ConfigurationError
+from constants import (
+    SAMPLE_RATE, STT_LANGUAGE, STT_BEAM_SIZE, STT_CPU_THREADS, STT_COMPUTE_TYPE
+)
+
+class STTBackend(ABC):
+    """Base class; subclasses implement _load and _transcribe"""
+
+    name = "base"
+
+    def __init__(
+        self,
+        model_size: str = "base",
+        language: str = STT_LANGUAGE,
+        beam_size: int = STT_BEAM_SIZE,
+        cpu_threads: int = STT_CPU_THREADS
+    ):
+        self.model_size = model_size
+        self.language = language
+        self.beam_size = beam_size
+        self.cpu_threads = cpu_threads
+        self.model = None
+        self._load_lock = threading.Lock()
+        self.utterances = 0
+        self.audio_seconds = 0.0
+        self.wall_seconds = 0.0
+
+    def load(self):
+        """Load the model and run one warm-up pass (worker thread, idempotent)"""
+        with self._load_lock:
+            if self.model is not None:
+                return
+            start = time.perf_counter()
+            self.model = self._load()
+            # First inference pays for kernel setup; do it before the user speaks
+            self._transcribe(np.zeros(SAMPLE_RATE, dtype=np.float32))
+            logger.info(
+                f"STT {self.name} ({self.model_size}) loaded and warmed up "
+                f"in {time.perf_counter() - start:.1f}s"
+            )
+
+    def transcribe(self, audio: np.ndarray) -> str:
+        """Transcribe one utterance (worker thread) and record its cost"""
+        if self.model is None:
+            self.load()
+        start = time.perf_counter()
+        text = self._transcribe(audio)
+        elapsed = time.perf_counter() - start
+        duration = len(audio) / SAMPLE_RATE
+        self.utterances += 1
+        self.audio_seconds += duration
+        self.wall_seconds += elapsed
+        logger.debug(
+            "STT {}: {:.2f}s of audio in {:.2f}s ({:.1f}x real time)",
+            self.name, duration, elapsed, duration / elapsed if elapsed else 0.0
+        )
+        return text
+
+    @abstractmethod
+    def _load(self):
+        """Load and return the engine's model"""
+
+    @abstractmethod
+    def _transcribe(self, audio: np.ndarray) -> str:
+        """Transcribe 16 kHz float32 audio"""
+
+    @property
+    def speed(self) -> float:
+        """Audio seconds processed per wall-clock second"""
+        return self.audio_seconds / self.wall_seconds if self.wall_seconds else 0.0
+
+    def stats(self) -> dict:
+        return {
+            "backend": self.name,
+            "model": self.model_size,
+            "utterances": self.utterances,
+            "audio_s": round(self.audio_seconds, 3),
+            "wall_s": round(self.wall_seconds, 3),
+            "speed_x": round(self.speed, 2),
+        }
+
+class WhisperBackend(STTBackend):
+    """openai-whisper on PyTorch, fp32 on CPU"""
+
+    name = "whisper"
+
+    def _load(self):
+        import torch
+        import whisper
+
+        if self.cpu_threads:
+            torch.set_num_threads(self.cpu_threads)
+        return whisper.load_model(self.model_size)
+
+    def _transcribe(self, audio: np.ndarray) -> str:
+        # Whisper takes the buffer directly; no file, no ffmpeg.
+        # A single temperature stops slow re-decoding fallbacks on short commands
+        result = self.model.transcribe(
+            audio,
+            language=self.language,
+            fp16=False,
+            temperature=0.0,
+            beam_size=self.beam_size if self.beam_size > 1 else None,
+            condition_on_previous_text=False
+        )
+        return result["text"].strip()
+
+class FasterWhisperBackend(STTBackend):
+    """Whisper on CTranslate2 with int8 weights, several times faster on CPU"""
+
+    name = "faster-whisper"
+
+    def __init__(self, *args, compute_type: str = STT_COMPUTE_TYPE, **kwargs):
+        super().__init__(*args, **kwargs)
+        self.compute_type = compute_type
+
+    def _load(self):
+        try:
+            from faster_whisper import WhisperModel
+        except ImportError:
+            raise ConfigurationError(
+                "STT_BACKEND=faster-whisper needs the faster-whisper package "
+                "(pip install faster-whisper)"
+            )
+        return WhisperModel(
+            self.model_size,
+            device="cpu",
+            compute_type=self.compute_type,
+            cpu_threads=self.cpu_threads,
+            num_workers=1
+        )
+
+    def _transcribe(self, audio: np.ndarray) -> str:
+        # Audio is already endpointed, so no VAD pass and no timestamps
+        segments, _ = self.model.transcribe(
+            audio,
+            language=self.language,
+            beam_size=self.beam_size,
+            temperature=0.0,
+            condition_on_previous_text=False,
+            without_timestamps=True,
+            vad_filter=False
+        )
+        return " ".join(segment.text.strip() for segment in segments).strip()
+
+    def stats(self) -> dict:
+        return {**super().stats(), "compute_type": self.compute_type}
+
+def create_stt_backend(config) -> STTBackend:
+    """Backend named by STT_BACKEND"""
+    options = dict(
+        model_size=config.get("WHISPER_MODEL", "base"),
+        language=config.get("STT_LANGUAGE", STT_LANGUAGE),
+        beam_size=config.get("STT_BEAM_SIZE", STT_BEAM_SIZE),
+        cpu_threads=config.get("STT_CPU_THREADS", STT_CPU_THREADS)
+    )
+    if config.get("STT_BACKEND", "whisper") == "faster-whisper":
+        return FasterWhisperBackend(
+            compute_type=config.get("STT_COMPUTE_TYPE", STT_COMPUTE_TYPE), **options
+        )
+    return WhisperBackend(**options)
+
+if __name__ == "__main__":
+    import soundfile as sf
+
+    audio, rate = sf.read(sys.argv[1], dtype="float32", always_2d=True)
+    if rate != SAMPLE_RATE:
+        sys.exit(f"{sys.argv[1]} is {rate} Hz; record at {SAMPLE_RATE} Hz")
+    audio = audio.mean(axis=1)
+    for name in sys.argv[2:] or ["whisper"]:
+        try:
+            stt = create_stt_backend({"STT_BACKEND": name})
+            stt.load()
+            text = stt.transcribe(audio)
+            print(f"{stt.stats()} -> {text!r}")
+        except Exception as e:
+            print(f"{name}: unavailable ({e})")
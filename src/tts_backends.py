@@ -0,0 +1,186 @@
+"""Text-to-speech backends
+
+Every backend turns one sentence into (float32 PCM frames x channels,
+sample rate) and records how long synthesis took relative to the audio
+produced. Engines are imported on first use, like whisper in VoiceHandler.
+
+    python src/tts_backends.py gtts piper espeak
+
+compares the given backends on a few typical replies.
+"""
+import io
+import shutil
+import sys
+import subprocess
+import threading
+import time
+from abc import ABC, abstractmethod
+from typing import Tuple
+import numpy as np
+import soundfile as sf
+from loguru import logger
+
+from exceptions import ConfigurationError, VoiceOutputError
+from constants import VOICE_LANGUAGE, PIPER_MODEL, ESPEAK_RATE
+
+Audio = Tuple[np.ndarray, int]
+
+class TTSBackend(ABC):
+    """Base class; subclasses implement _synthesize"""
+
+    name = "base"
+
+    def __init__(self, language: str = VOICE_LANGUAGE):
+        self.language = language
+        self._stats_lock = threading.Lock()
+        self.utterances = 0
+        self.synth_seconds = 0.0
+        self.audio_seconds = 0.0
+
+    @property
+    def voice_id(self) -> str:
+        """Identifies the voice in TTS cache keys"""
+        return self.name
+
+    def synthesize(self, text: str) -> Audio:
+        """Synthesize one sentence (worker thread) and record its cost"""
+        start = time.perf_counter()
+        pcm, sample_rate = self._synthesize(text)
+        elapsed = time.perf_counter() - start
+        duration = len(pcm) / sample_rate
+        with self._stats_lock:
+            self.utterances += 1
+            self.synth_seconds += elapsed
+            self.audio_seconds += duration
+        logger.debug(
+            "TTS {}: {:.2f}s for {:.2f}s of audio (RTF {:.2f})",
+            self.name, elapsed, duration, elapsed / duration if duration else 0.0
+        )
+        return pcm, sample_rate
+
+    @abstractmethod
+    def _synthesize(self, text: str) -> Audio:
+        """Synthesize text into (PCM frames x channels, sample rate)"""
+
+    @property
+    def real_time_factor(self) -> float:
+        """Synthesis time per second of audio; below 1.0 is faster than playback"""
+        return self.synth_seconds / self.audio_seconds if self.audio_seconds else 0.0
+
+    def stats(self) -> dict:
+        return {
+            "backend": self.name,
+            "utterances": self.utterances,
+            "synth_s": round(self.synth_seconds, 3),
+            "audio_s": round(self.audio_seconds, 3),
+            "rtf": round(self.real_time_factor, 3),
+        }
+
+class GTTSBackend(TTSBackend):
+    """Google Translate TTS: good voice, one network round trip per sentence"""
+
+    name = "gtts"
+
+    def _synthesize(self, text: str) -> Audio:
+        from gtts import gTTS
+
+        buffer = io.BytesIO()
+        gTTS(text=text, lang=self.language, slow=False).write_to_fp(buffer)
+        buffer.seek(0)
+        # libsndfile decodes MP3 in-process, so no temp file or ffmpeg spawn
+        return sf.read(buffer, dtype="float32", always_2d=True)
+
+class PiperBackend(TTSBackend):
+    """Piper neural TTS (ONNX) running locally on CPU, no network"""
+
+    name = "piper"
+
+    def __init__(self, model_path: str = PIPER_MODEL, language: str = VOICE_LANGUAGE):
+        super().__init__(language)
+        self.model_path = model_path
+        self._voice = None
+        self._load_lock = threading.Lock()
+
+    @property
+    def voice_id(self) -> str:
+        return f"piper:{self.model_path}"
+
+    def _load(self):
+        with self._load_lock:
+            if self._voice is None:
+                try:
+                    from piper.voice import PiperVoice
+                except ImportError:
+                    raise ConfigurationError(
+                        "TTS_BACKEND=piper needs the piper-tts package "
+                        "(pip install piper-tts)"
+                    )
+                logger.info(f"Loading Piper voice: {self.model_path}")
+                self._voice = PiperVoice.load(self.model_path)
+        return self._voice
+
+    def _synthesize(self, text: str) -> Audio:
+        voice = self._voice or self._load()
+        if hasattr(voice, "synthesize_stream_raw"):
+            # piper-tts 1.2: raw 16-bit mono PCM
+            raw = b"".join(voice.synthesize_stream_raw(text))
+            pcm = np.frombuffer(raw, dtype=np.int16).astype(np.float32) / 32768.0
+            return pcm.reshape(-1, 1), voice.config.sample_rate
+        # piper-tts 1.3+: float chunks per sentence
+        chunks = list(voice.synthesize(text))
+        if not chunks:
+            return np.zeros((0, 1), dtype=np.float32), voice.config.sample_rate
+        pcm = np.concatenate([chunk.audio_float_array for chunk in chunks])
+        return pcm.astype(np.float32).reshape(-1, 1), chunks[0].sample_rate
+
+class EspeakBackend(TTSBackend):
+    """espeak-ng formant synthesizer: robotic but tiny, instant and offline"""
+
+    name = "espeak"
+
+    def __init__(self, language: str = VOICE_LANGUAGE, rate: int = ESPEAK_RATE):
+        super().__init__(language)
+        self.rate = rate
+        self.binary = shutil.which("espeak-ng") or shutil.which("espeak")
+        if self.binary is None:
+            raise ConfigurationError("TTS_BACKEND=espeak needs espeak-ng installed")
+
+    @property
+    def voice_id(self) -> str:
+        return f"espeak:{self.rate}"
+
+    def _synthesize(self, text: str) -> Audio:
+        result = subprocess.run(
+            [self.binary, "-v", self.language, "-s", str(self.rate), "--stdout", "--stdin"],
+            input=text.encode("utf-8"),
+            capture_output=True,
+            timeout=30
+        )
+        if result.returncode != 0:
+            raise VoiceOutputError(f"espeak failed: {result.stderr.decode(errors='replace')}")
+        return sf.read(io.BytesIO(result.stdout), dtype="float32", always_2d=True)
+
+def create_tts_backend(config) -> TTSBackend:
+    """Backend named by TTS_BACKEND"""
+    backend = config.get("TTS_BACKEND", "gtts")
+    if backend == "piper":
+        return PiperBackend(config.get("PIPER_MODEL", PIPER_MODEL))
+    if backend == "espeak":
+        return EspeakBackend()
+    return GTTSBackend()
+
+_SAMPLE_REPLIES = [
+    "You have 12 overdue invoices, totaling 48210 dollars.",
+    "Acme Corp, 500 dollars, due October 07, 2026.",
+    "Email sent to Beta Industries at jane at beta dot com.",
+]
+
+if __name__ == "__main__":
+    for name in sys.argv[1:] or ["gtts"]:
+        try:
+            tts = create_tts_backend({"TTS_BACKEND": name})
+            for reply in _SAMPLE_REPLIES:
+                tts.synthesize(reply)
+            print(tts.stats())
+        except Exception as e:
+            print(f"{name}: unavailable ({e})")
@@ -0,0 +1,177 @@
+"""Content-addressed cache of synthesized speech"""
+import hashlib
+import json
+import os
+import threading
+from collections import OrderedDict
+from pathlib import Path
+from typing import Dict, Optional, Tuple
+import numpy as np
+import soundfile as sf
+from loguru import logger
+
+from constants import TTS_CACHE_MEMORY_MB, TTS_CACHE_DISK_MB
+
+Audio = Tuple[np.ndarray, int]  # (float32 PCM frames x channels, sample rate)
+
+_MB = 1024 * 1024
+
+class TTSCache:
+    """Decoded PCM keyed by (text, voice, language)
+
+    A byte-bounded in-memory LRU sits in front of an optional directory of
+    float WAV files. The disk tier evicts least recently used files once
+    it exceeds its size limit. Safe to use from the TTS worker threads.
+    """
+
+    def __init__(
+        self,
+        max_memory_bytes: int = TTS_CACHE_MEMORY_MB * _MB,
+        path: Optional[str] = None,
+        max_disk_bytes: int = TTS_CACHE_DISK_MB * _MB
+    ):
+        self.max_memory_bytes = max_memory_bytes
+        self.max_disk_bytes = max_disk_bytes
+        self._entries: "OrderedDict[str, Audio]" = OrderedDict()
+        self._memory_bytes = 0
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.disk_hits = 0
+        self.misses = 0
+        self.path = self._open_dir(path) if path else None
+        # file name -> size, oldest use first
+        self._files: "OrderedDict[str, int]" = self._scan() if self.path else OrderedDict()
+
+    @classmethod
+    def from_config(cls, config) -> Optional["TTSCache"]:
+        """Build a cache from Config, or None when disabled"""
+        if not config.get("TTS_CACHE_ENABLED", True):
+            return None
+        return cls(
+            max_memory_bytes=int(config.get("TTS_CACHE_MEMORY_MB", TTS_CACHE_MEMORY_MB) * _MB),
+            path=config.get("TTS_CACHE_PATH") or None,
+            max_disk_bytes=int(config.get("TTS_CACHE_DISK_MB", TTS_CACHE_DISK_MB) * _MB)
+        )
+
+    @staticmethod
+    def make_key(text: str, voice: str, language: str) -> str:
+        raw = json.dumps([text.strip(), voice, language])
+        return hashlib.sha256(raw.encode("utf-8")).hexdigest()
+
+    def get(self, key: str, memory_only: bool = False) -> Optional[Audio]:
+        """Cached audio or None; memory_only skips disk so it never blocks"""
+        with self._lock:
+            audio = self._entries.get(key)
+            if audio is not None:
+                self._entries.move_to_end(key)
+                self.hits += 1
+                return audio
+        if memory_only:
+            return None
+        if self.path is None:
+            self.misses += 1
+            return None
+
+        audio = self._read(key)
+        with self._lock:
+            if audio is None:
+                self.misses += 1
+                return None
+            self.disk_hits += 1
+            self._remember(key, audio)
+        return audio
+
+    def put(self, key: str, audio: Audio):
+        with self._lock:
+            self._remember(key, audio)
+        if self.path is not None:
+            self._write(key, audio)
+
+    def stats(self) -> dict:
+        lookups = self.hits + self.disk_hits + self.misses
+        return {
+            "entries": len(self._entries),
+            "memory_mb": round(self._memory_bytes / _MB, 1),
+            "disk_files": len(self._files),
+            "disk_mb": round(sum(self._files.values()) / _MB, 1),
+            "hits": self.hits,
+            "disk_hits": self.disk_hits,
+            "misses": self.misses,
+            "hit_rate": (self.hits + self.disk_hits) / lookups if lookups else 0.0,
+        }
+
+    def _remember(self, key: str, audio: Audio):
+        previous = self._entries.pop(key, None)
+        if previous is not None:
+            self._memory_bytes -= previous[0].nbytes
+        self._entries[key] = audio
+        self._memory_bytes += audio[0].nbytes
+        while self._memory_bytes > self.max_memory_bytes and len(self._entries) > 1:
+            _, (pcm, _) = self._entries.popitem(last=False)
+            self._memory_bytes -= pcm.nbytes
+
+    def _read(self, key: str) -> Optional[Audio]:
+        name = f"{key}.wav"
+        file = self.path / name
+        try:
+            pcm, sample_rate = sf.read(file, dtype="float32", always_2d=True)
+        except (OSError, RuntimeError):
+            return None
+        with self._lock:
+            if name in self._files:
+                self._files.move_to_end(name)
+        try:
+            os.utime(file)  # keeps LRU order across restarts
+        except OSError:
+            pass
+        return pcm, sample_rate
+
+    def _write(self, key: str, audio: Audio):
+        name = f"{key}.wav"
+        file = self.path / name
+        temp = file.with_suffix(".tmp")
+        try:
+            # Float subtype stores the PCM exactly; rename makes the write atomic
+            sf.write(temp, audio[0], audio[1], subtype="FLOAT", format="WAV")
+            os.replace(temp, file)
+            size = file.stat().st_size
+        except (OSError, RuntimeError) as e:
+            logger.warning(f"TTS disk cache write failed: {e}")
+            return
+        with self._lock:
+            self._files.pop(name, None)
+            self._files[name] = size
+            evicted = self._evict_files()
+        for old in evicted:
+            try:
+                (self.path / old).unlink()
+            except OSError:
+                pass
+
+    def _evict_files(self) -> list:
+        evicted, total = [], sum(self._files.values())
+        while total > self.max_disk_bytes and len(self._files) > 1:
+            name, size = self._files.popitem(last=False)
+            evicted.append(name)
+            total -= size
+        return evicted
+
+    def _scan(self) -> "OrderedDict[str, int]":
+        found: Dict[str, os.stat_result] = {}
+        for file in self.path.glob("*.wav"):
+            try:
+                found[file.name] = file.stat()
+            except OSError:
+                continue
+        ordered = sorted(found.items(), key=lambda item: item[1].st_mtime)
+        return OrderedDict((name, stat.st_size) for name, stat in ordered)
+
+    def _open_dir(self, path: str) -> Optional[Path]:
+        try:
+            directory = Path(path)
+            directory.mkdir(parents=True, exist_ok=True)
+            logger.info(f"TTS cache persisted at {directory}")
+            return directory
+        except OSError as e:
+            logger.warning(f"TTS disk cache unavailable, using memory only: {e}")
+            return None
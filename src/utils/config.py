@@ -3,6 +3,9 @@ import os
 from typing import Any
 from dotenv import load_dotenv
 from exceptions import ConfigurationError
+from constants import (
+    MCP_MODES, TTS_BACKENDS, STT_BACKENDS, LOG_LEVELS, LOG_FORMATS, LOG_DROP_POLICIES
+)
 
 class Config:
     """Application configuration with validation"""
@@ -12,8 +15,59 @@ class Config:
         self._config = {
             "GROQ_API_KEY": os.getenv("GROQ_API_KEY"),
             "PFMCP_BASE_URL": os.getenv("PFMCP_BASE_URL", "http://localhost:8000"),
+            "SERVER_HOST": os.getenv("SERVER_HOST", "127.0.0.1"),
+            "SERVER_PORT": os.getenv("SERVER_PORT", "8080"),
+            "SERVER_MAX_SESSIONS": os.getenv("SERVER_MAX_SESSIONS", "1000"),
+            "SERVER_MAX_INFLIGHT": os.getenv("SERVER_MAX_INFLIGHT", "64"),
+            "SESSION_IDLE_TIMEOUT": os.getenv("SESSION_IDLE_TIMEOUT", "900"),
+            "CONTEXT_WINDOW_TURNS": os.getenv("CONTEXT_WINDOW_TURNS", "4"),
+            "CONTEXT_TOKEN_BUDGET": os.getenv("CONTEXT_TOKEN_BUDGET", "150"),
+            "MCP_MODE": os.getenv("MCP_MODE", "mock"),
+            "MCP_MAX_CONNECTIONS": os.getenv("MCP_MAX_CONNECTIONS", "20"),
             "WHISPER_MODEL": os.getenv("WHISPER_MODEL", "base"),
+            "STT_BACKEND": os.getenv("STT_BACKEND", "whisper"),
+            "STT_LANGUAGE": os.getenv("STT_LANGUAGE", "en"),
+            "STT_BEAM_SIZE": os.getenv("STT_BEAM_SIZE", "1"),
+            "STT_CPU_THREADS": os.getenv("STT_CPU_THREADS", "0"),
+            "STT_COMPUTE_TYPE": os.getenv("STT_COMPUTE_TYPE", "int8"),
             "LOG_LEVEL": os.getenv("LOG_LEVEL", "INFO"),
+            "LOG_FORMAT": os.getenv("LOG_FORMAT", "text"),
+            "LOG_QUEUE_SIZE": os.getenv("LOG_QUEUE_SIZE", "10000"),
+            "LOG_DROP_POLICY": os.getenv("LOG_DROP_POLICY", "drop_new"),
+            "TRACING_ENABLED": os.getenv("TRACING_ENABLED", "true"),
+            "TRACE_RECENT_TURNS": os.getenv("TRACE_RECENT_TURNS", "50"),
+            "FAST_PATH_CONFIDENCE": os.getenv("FAST_PATH_CONFIDENCE", "0.85"),
+            "SPECULATION_ENABLED": os.getenv("SPECULATION_ENABLED", "true"),
+            "LLM_CACHE_ENABLED": os.getenv("LLM_CACHE_ENABLED", "true"),
+            "LLM_CACHE_MAX_ENTRIES": os.getenv("LLM_CACHE_MAX_ENTRIES", "1024"),
+            "LLM_CACHE_TTL": os.getenv("LLM_CACHE_TTL", "3600"),
+            "LLM_CACHE_PATH": os.getenv("LLM_CACHE_PATH", ""),
+            "GROQ_REQUESTS_PER_MINUTE": os.getenv("GROQ_REQUESTS_PER_MINUTE", "30"),
+            "GROQ_TOKENS_PER_MINUTE": os.getenv("GROQ_TOKENS_PER_MINUTE", "6000"),
+            "GROQ_MAX_CONCURRENCY": os.getenv("GROQ_MAX_CONCURRENCY", "8"),
+            "GROQ_FALLBACK_MODEL": os.getenv("GROQ_FALLBACK_MODEL", ""),
+            "LLM_TURN_DEADLINE": os.getenv("LLM_TURN_DEADLINE", "8"),
+            "LLM_PARSE_DEADLINE": os.getenv("LLM_PARSE_DEADLINE", "3"),
+            "LLM_HEDGE_PERCENTILE": os.getenv("LLM_HEDGE_PERCENTILE", "95"),
+            "LLM_BREAKER_FAILURES": os.getenv("LLM_BREAKER_FAILURES", "5"),
+            "LLM_BREAKER_RESET": os.getenv("LLM_BREAKER_RESET", "30"),
+            "TTS_BACKEND": os.getenv("TTS_BACKEND", "gtts"),
+            "PIPER_MODEL": os.getenv("PIPER_MODEL", "data/voices/en_US-lessac-medium.onnx"),
+            "TTS_CACHE_ENABLED": os.getenv("TTS_CACHE_ENABLED", "true"),
+            "TTS_CACHE_MEMORY_MB": os.getenv("TTS_CACHE_MEMORY_MB", "32"),
+            "TTS_CACHE_PATH": os.getenv("TTS_CACHE_PATH", "data/cache/tts"),
+            "TTS_CACHE_DISK_MB": os.getenv("TTS_CACHE_DISK_MB", "256"),
+            "MAX_RECORDING_DURATION": os.getenv("MAX_RECORDING_DURATION", "15"),
+            "VAD_SILENCE_MS": os.getenv("VAD_SILENCE_MS", "700"),
+            "VAD_ENERGY_THRESHOLD": os.getenv("VAD_ENERGY_THRESHOLD", "0.01"),
+            "MOCK_LEDGER_SIZE": os.getenv("MOCK_LEDGER_SIZE", "0"),
+            "OVERDUE_SUMMARY_TTL": os.getenv("OVERDUE_SUMMARY_TTL", "60"),
+            "BULK_REMINDER_CONCURRENCY": os.getenv("BULK_REMINDER_CONCURRENCY", "5"),
+            "BULK_REMINDER_BATCH_SIZE": os.getenv("BULK_REMINDER_BATCH_SIZE", "20"),
+            "BULK_REMINDER_CHECKPOINT_TTL": os.getenv("BULK_REMINDER_CHECKPOINT_TTL", "3600"),
+            "BULK_REMINDER_CHECKPOINT": os.getenv(
+                "BULK_REMINDER_CHECKPOINT", "data/bulk_reminders.json"
+            ),
         }
         self._validate()
     
@@ -31,6 +85,87 @@ class Config:
                 f"Invalid WHISPER_MODEL: {whisper_model}. "
                 f"Must be one of: {valid_whisper_models}"
             )
+        
+        mcp_mode = self._config["MCP_MODE"] = self._config["MCP_MODE"].strip().lower()
+        if mcp_mode not in MCP_MODES:
+            raise ConfigurationError(
+                f"Invalid MCP_MODE: {mcp_mode}. Must be one of: {MCP_MODES}"
+            )
+        
+        stt_backend = self._config["STT_BACKEND"] = self._config["STT_BACKEND"].strip().lower()
+        if stt_backend not in STT_BACKENDS:
+            raise ConfigurationError(
+                f"Invalid STT_BACKEND: {stt_backend}. Must be one of: {STT_BACKENDS}"
+            )
+        
+        tts_backend = self._config["TTS_BACKEND"] = self._config["TTS_BACKEND"].strip().lower()
+        if tts_backend not in TTS_BACKENDS:
+            raise ConfigurationError(
+                f"Invalid TTS_BACKEND: {tts_backend}. Must be one of: {TTS_BACKENDS}"
+            )
+        
+        self._choice("LOG_LEVEL", LOG_LEVELS, str.upper)
+        self._choice("LOG_FORMAT", LOG_FORMATS)
+        self._choice("LOG_DROP_POLICY", LOG_DROP_POLICIES)
+        
+        self._coerce("LOG_QUEUE_SIZE", int, 0)
+        self._coerce("STT_BEAM_SIZE", int, 1)
+        self._coerce("STT_CPU_THREADS", int, 0)
+        self._coerce("MCP_MAX_CONNECTIONS", int, 1)
+        self._coerce("SERVER_PORT", int, 0, 65535)
+        self._coerce("SERVER_MAX_SESSIONS", int, 1)
+        self._coerce("SERVER_MAX_INFLIGHT", int, 1)
+        self._coerce("SESSION_IDLE_TIMEOUT", float, 1.0)
+        self._coerce("CONTEXT_WINDOW_TURNS", int, 1)
+        self._coerce("CONTEXT_TOKEN_BUDGET", int, 0)
+        self._coerce("FAST_PATH_CONFIDENCE", float, 0.0, 1.0)
+        self._coerce_bool("SPECULATION_ENABLED")
+        self._coerce_bool("TRACING_ENABLED")
+        self._coerce("TRACE_RECENT_TURNS", int, 1)
+        self._coerce_bool("LLM_CACHE_ENABLED")
+        self._coerce("LLM_CACHE_MAX_ENTRIES", int, 1)
+        self._coerce("LLM_CACHE_TTL", float, 0.0)
+        self._coerce("GROQ_REQUESTS_PER_MINUTE", float, 1.0)
+        self._coerce("GROQ_TOKENS_PER_MINUTE", float, 1.0)
+        self._coerce("GROQ_MAX_CONCURRENCY", int, 1)
+        self._coerce("LLM_TURN_DEADLINE", float, 0.5)
+        self._coerce("LLM_PARSE_DEADLINE", float, 0.1)
+        self._coerce("LLM_HEDGE_PERCENTILE", float, 0.0, 99.9)
+        self._coerce("LLM_BREAKER_FAILURES", int, 1)
+        self._coerce("LLM_BREAKER_RESET", float, 1.0)
+        self._coerce_bool("TTS_CACHE_ENABLED")
+        self._coerce("TTS_CACHE_MEMORY_MB", float, 1.0)
+        self._coerce("TTS_CACHE_DISK_MB", float, 0.0)
+        self._coerce("MAX_RECORDING_DURATION", float, 1.0)
+        self._coerce("VAD_SILENCE_MS", int, 100)
+        self._coerce("VAD_ENERGY_THRESHOLD", float, 0.0)
+        self._coerce("MOCK_LEDGER_SIZE", int, 0)
+        self._coerce("OVERDUE_SUMMARY_TTL", float, 0.0)
+        self._coerce("BULK_REMINDER_CONCURRENCY", int, 1)
+        self._coerce("BULK_REMINDER_BATCH_SIZE", int, 1)
+        self._coerce("BULK_REMINDER_CHECKPOINT_TTL", float, 0.0)
+    
+    def _choice(self, key: str, choices, normalize=str.lower):
+        """Normalize a setting in place and check it is one of choices"""
+        value = self._config[key] = normalize(str(self._config[key]).strip())
+        if value not in choices:
+            raise ConfigurationError(f"Invalid {key}: {value}. Must be one of: {choices}")
+    
+    def _coerce(self, key: str, cast, minimum=None, maximum=None):
+        """Convert a numeric setting in place and check its range"""
+        try:
+            value = cast(self._config[key])
+        except ValueError:
+            raise ConfigurationError(f"{key} must be a {cast.__name__}")
+        if minimum is not None and value < minimum:
+            raise ConfigurationError(f"{key} must be at least {minimum}")
+        if maximum is not None and value > maximum:
+            raise ConfigurationError(f"{key} must be at most {maximum}")
+        self._config[key] = value
+    
+    def _coerce_bool(self, key: str):
+        """Convert a true/false style setting in place"""
+        self._config[key] = str(self._config[key]).strip().lower() in ("1", "true", "yes", "on")
     
     def get(self, key: str, default: Any = None) -> Any:
         """Get configuration value"""
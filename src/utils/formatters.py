@@ -1,6 +1,15 @@
 """Formatters"""
+import re
 from datetime import datetime
 
+_NON_WORD = re.compile(r"[^a-z0-9&\s]")
+
+# Legal suffixes people drop when speaking a company name
+_COMPANY_SUFFIXES = {
+    "corp", "corporation", "inc", "incorporated", "llc", "ltd", "limited",
+    "co", "company", "plc", "gmbh",
+}
+
 def format_currency_for_voice(amount: float) -> str:
     dollars = int(amount)
     cents = int((amount - dollars) * 100)
@@ -15,3 +24,10 @@ def format_date_for_voice(date_str: str) -> str:
         return date_obj.strftime("%B %d, %Y")
     except:
         return date_str
+
+def normalize_company_name(name: str) -> str:
+    """Lowercase, strip punctuation and legal suffixes"""
+    tokens = _NON_WORD.sub(" ", name.lower()).split()
+    while len(tokens) > 1 and tokens[-1] in _COMPANY_SUFFIXES:
+        tokens.pop()
+    return " ".join(tokens)
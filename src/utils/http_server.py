@@ -0,0 +1,129 @@
+"""Minimal asyncio HTTP/1.1 server for local JSON services"""
+import asyncio
+import json
+from typing import Awaitable, Callable, Dict, Optional, Set, Tuple, Union
+from loguru import logger
+
+# handler(method, path, json_body) -> (status, payload) or (status, payload, headers)
+# A str payload is sent as text/plain unless headers set Content-Type
+Payload = Union[dict, list, str]
+Response = Union[Tuple[int, Payload], Tuple[int, Payload, Dict[str, str]]]
+Handler = Callable[[str, str, Optional[dict]], Awaitable[Response]]
+
+MAX_BODY_BYTES = 8 * 1024 * 1024
+
+_REASONS = {
+    200: "OK",
+    400: "Bad Request",
+    404: "Not Found",
+    405: "Method Not Allowed",
+    413: "Payload Too Large",
+    500: "Internal Server Error",
+    503: "Service Unavailable",
+}
+
+class JSONHTTPServer:
+    """Keep-alive HTTP server that routes every request to one async handler
+
+    Only what local stand-ins and load tests need: JSON bodies with a
+    Content-Length, persistent connections, no TLS or chunked encoding.
+    """
+
+    def __init__(self, handler: Handler, host: str = "127.0.0.1", port: int = 8000):
+        self.handler = handler
+        self.host = host
+        self.port = port
+        self._server: Optional[asyncio.AbstractServer] = None
+        self._connections: Set[asyncio.StreamWriter] = set()
+
+    async def start(self):
+        self._server = await asyncio.start_server(self._serve, self.host, self.port)
+        # Port 0 binds an ephemeral port; report the real one
+        self.port = self._server.sockets[0].getsockname()[1]
+        logger.info(f"Listening on http://{self.host}:{self.port}")
+
+    async def serve_forever(self):
+        if self._server is None:
+            await self.start()
+        async with self._server:
+            await self._server.serve_forever()
+
+    async def close(self):
+        """Stop accepting and drop idle keep-alive connections"""
+        if self._server is None:
+            return
+        self._server.close()
+        for writer in list(self._connections):
+            writer.close()
+        await self._server.wait_closed()
+
+    async def _serve(self, reader: asyncio.StreamReader, writer: asyncio.StreamWriter):
+        self._connections.add(writer)
+        try:
+            while True:
+                request_line = await reader.readline()
+                if not request_line:
+                    break
+                method, path, version = request_line.decode("latin-1").split()
+                headers = {}
+                while True:
+                    line = await reader.readline()
+                    if line in (b"\r\n", b"\n", b""):
+                        break
+                    name, _, value = line.decode("latin-1").partition(":")
+                    headers[name.strip().lower()] = value.strip()
+
+                keep_alive = (
+                    version == "HTTP/1.1"
+                    and headers.get("connection", "").lower() != "close"
+                )
+                length = int(headers.get("content-length", 0))
+                if length > MAX_BODY_BYTES:
+                    response = (413, {"error": "Request body too large"})
+                    keep_alive = False
+                else:
+                    body = await reader.readexactly(length) if length else b""
+                    response = await self._dispatch(method, path, body)
+
+                self._write(writer, *response, keep_alive=keep_alive)
+                await writer.drain()
+                if not keep_alive:
+                    break
+        except (asyncio.IncompleteReadError, ConnectionError, ValueError):
+            pass
+        finally:
+            self._connections.discard(writer)
+            writer.close()
+
+    async def _dispatch(self, method: str, path: str, body: bytes) -> Response:
+        try:
+            data = json.loads(body) if body else None
+        except ValueError:
+            return 400, {"error": "Body is not valid JSON"}
+        try:
+            return await self.handler(method, path, data)
+        except Exception as e:
+            logger.error(f"{method} {path} failed: {e}")
+            return 500, {"error": str(e)}
+
+    @staticmethod
+    def _write(
+        writer: asyncio.StreamWriter,
+        status: int,
+        payload: Payload,
+        headers: Optional[Dict[str, str]] = None,
+        keep_alive: bool = True
+    ):
+        if isinstance(payload, str):
+            body, content_type = payload.encode(), "text/plain; charset=utf-8"
+        else:
+            body, content_type = json.dumps(payload, default=str).encode(), "application/json"
+        headers = dict(headers or {})
+        lines = [
+            f"HTTP/1.1 {status} {_REASONS.get(status, 'Unknown')}",
+            f"Content-Type: {headers.pop('Content-Type', content_type)}",
+            f"Content-Length: {len(body)}",
+            f"Connection: {'keep-alive' if keep_alive else 'close'}",
+        ]
+        lines.extend(f"{name}: {value}" for name, value in headers.items())
+        writer.write(("\r\n".join(lines) + "\r\n\r\n").encode("latin-1") + body)
@@ -1,11 +1,190 @@
-"""Logger"""
+"""Logger
+
+By default sinks are written from a background thread through a bounded
+queue, so the event loop never waits on stdout or disk. When the queue
+is full LOG_DROP_POLICY decides: drop_new discards the incoming message,
+drop_oldest discards the oldest queued one, block waits for room. Drops
+are counted and reported on stderr once the queue drains.
+LOG_QUEUE_SIZE=0 writes synchronously instead.
+
+On hot paths pass {} arguments rather than f-strings: loguru skips the
+formatting when no sink accepts the level. ThrottledLogger caps how
+often a single call site logs.
+"""
+import atexit
+import os
+import queue
 import sys
-from loguru import logger
+import threading
+import time
 from pathlib import Path
+from typing import Callable, Optional
+from loguru import logger
+
+from constants import (
+    LOG_FILE, LOG_ROTATION_MB, LOG_QUEUE_SIZE, LOG_DROP_POLICY, LOG_THROTTLE_INTERVAL
+)
+
+TEXT_FORMAT = "<green>{time:HH:mm:ss}</green> | <level>{level}</level> | <level>{message}</level>"
+
+class RotatingFile:
+    """Append-only log file that keeps one rotated copy (writer thread only)"""
+
+    def __init__(self, path: str, max_bytes: int):
+        self.path = Path(path)
+        self.max_bytes = max_bytes
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        self._file = open(self.path, "a", encoding="utf-8")
+
+    def write(self, message: str):
+        self._file.write(message)
+        if self._file.tell() >= self.max_bytes:
+            self._file.close()
+            os.replace(self.path, self.path.with_name(self.path.name + ".1"))
+            self._file = open(self.path, "a", encoding="utf-8")
+
+    def flush(self):
+        self._file.flush()
+
+class LogWriter:
+    """Bounded queue of formatted messages drained by one thread"""
+
+    def __init__(self, max_size: int = LOG_QUEUE_SIZE, drop_policy: str = LOG_DROP_POLICY):
+        self.queue: queue.Queue = queue.Queue(max_size)
+        self.drop_policy = drop_policy
+        self.dropped = 0
+        self._reported = 0
+        self._reported_at = 0.0
+        self._lock = threading.Lock()
+        self._thread = threading.Thread(target=self._run, name="log-writer", daemon=True)
+        self._thread.start()
+
+    def sink(self, write: Callable[[str], None], flush: Callable[[], None]) -> Callable:
+        """A loguru sink that hands messages to this writer"""
+        def enqueue(message):
+            self._put((write, flush, str(message)))
+        return enqueue
+
+    def _put(self, item):
+        if self.drop_policy == "block":
+            self.queue.put(item)
+            return
+        try:
+            self.queue.put_nowait(item)
+            return
+        except queue.Full:
+            pass
+        if self.drop_policy == "drop_oldest":
+            try:
+                self.queue.get_nowait()
+                self.queue.put_nowait(item)
+            except (queue.Empty, queue.Full):
+                pass
+        with self._lock:
+            self.dropped += 1
+
+    def _run(self):
+        pending = set()
+        while True:
+            item = self.queue.get()
+            if item is None:
+                break
+            write, flush, message = item
+            try:
+                write(message)
+                pending.add(flush)
+                if self.queue.empty():
+                    # Flush once per burst rather than per message
+                    self._flush(pending)
+            except Exception as e:
+                sys.stderr.write(f"Log write failed: {e}\n")
+        self._flush(pending, final=True)
+
+    def _flush(self, pending: set, final: bool = False):
+        for flush in pending:
+            flush()
+        pending.clear()
+        # Drop reports are themselves rate limited
+        now = time.monotonic()
+        if final or now - self._reported_at >= LOG_THROTTLE_INTERVAL:
+            self._reported_at = now
+            self._report_drops()
+
+    def _report_drops(self):
+        with self._lock:
+            dropped, self._reported = self.dropped - self._reported, self.dropped
+        if dropped:
+            sys.stderr.write(f"{dropped} log messages dropped (queue full, {self.drop_policy})\n")
+
+    def close(self, timeout: float = 2.0):
+        """Write out what is queued and stop the thread"""
+        try:
+            self.queue.put(None, timeout=timeout)
+        except queue.Full:
+            pass
+        self._thread.join(timeout)
+
+class ThrottledLogger:
+    """Per-call-site rate limit for high-frequency logs
+
+    Keep one instance per call site. At most one message per interval
+    seconds gets through (and, with every=N, only one call in N); the
+    next message that does notes how many were suppressed.
+    """
+
+    def __init__(self, interval: float = LOG_THROTTLE_INTERVAL, every: int = 1):
+        self.interval = interval
+        self.every = max(1, every)
+        self._calls = 0
+        self._suppressed = 0
+        self._last = float("-inf")
+
+    def debug(self, message: str, *args, **kwargs):
+        self._log("DEBUG", message, args, kwargs)
+
+    def info(self, message: str, *args, **kwargs):
+        self._log("INFO", message, args, kwargs)
+
+    def _log(self, level: str, message: str, args, kwargs):
+        self._calls += 1
+        now = time.monotonic()
+        if self._calls % self.every or now - self._last < self.interval:
+            self._suppressed += 1
+            return
+        self._last = now
+        if self._suppressed:
+            message += f" (+{self._suppressed} suppressed)"
+            self._suppressed = 0
+        logger.opt(depth=2).log(level, message, *args, **kwargs)
+
+_writer: Optional[LogWriter] = None
+
+def _close_writer():
+    global _writer
+    if _writer is not None:
+        _writer.close()
+        _writer = None
+
+atexit.register(_close_writer)
+
+def setup_logger(config=None):
+    """Install the stdout and file sinks; call again with Config to apply it"""
+    global _writer
+    get = config.get if config is not None else (lambda key, default=None: default)
+    level = get("LOG_LEVEL", "INFO")
+    serialize = get("LOG_FORMAT", "text") == "json"
+    queue_size = get("LOG_QUEUE_SIZE", LOG_QUEUE_SIZE)
 
-def setup_logger():
     logger.remove()
-    logger.add(sys.stdout, format="<green>{time:HH:mm:ss}</green> | <level>{level}</level> | <level>{message}</level>", level="INFO", colorize=True)
-    Path("data/logs").mkdir(parents=True, exist_ok=True)
-    logger.add("data/logs/agent.log", rotation="10 MB")
+    _close_writer()
+    console = dict(level=level, format=TEXT_FORMAT, serialize=serialize, colorize=not serialize)
+    if queue_size:
+        _writer = LogWriter(queue_size, get("LOG_DROP_POLICY", LOG_DROP_POLICY))
+        log_file = RotatingFile(LOG_FILE, LOG_ROTATION_MB * 1024 * 1024)
+        logger.add(_writer.sink(sys.stdout.write, sys.stdout.flush), **console)
+        logger.add(_writer.sink(log_file.write, log_file.flush), level=level, serialize=serialize)
+    else:
+        Path(LOG_FILE).parent.mkdir(parents=True, exist_ok=True)
+        logger.add(sys.stdout, **console)
+        logger.add(LOG_FILE, rotation=f"{LOG_ROTATION_MB} MB", level=level, serialize=serialize)
     return logger
@@ -0,0 +1,34 @@
+"""Helpers for streaming text into TTS a sentence at a time"""
+import re
+from typing import AsyncIterable, AsyncIterator
+
+_SENTENCE_END = re.compile(r"[.!?]+[\"')\]]*\s+")
+_ABBREVIATIONS = {"mr", "mrs", "ms", "dr", "inc", "corp", "ltd", "co", "st", "vs", "no"}
+
+async def text_chunks(text: str) -> AsyncIterator[str]:
+    """Wrap a complete string as a one-chunk stream"""
+    yield text
+
+def _split_point(buffer: str) -> int:
+    """Index just past the first sentence boundary in buffer, or -1"""
+    for match in _SENTENCE_END.finditer(buffer):
+        words = buffer[:match.start()].split()
+        if words and words[-1].lower().strip(".") in _ABBREVIATIONS:
+            continue
+        return match.end()
+    return -1
+
+async def iter_sentences(chunks: AsyncIterable[str]) -> AsyncIterator[str]:
+    """Regroup a token stream into whole sentences as soon as each completes"""
+    buffer = ""
+    async for chunk in chunks:
+        buffer += chunk
+        while True:
+            end = _split_point(buffer)
+            if end < 0:
+                break
+            sentence, buffer = buffer[:end].strip(), buffer[end:]
+            if sentence:
+                yield sentence
+    if buffer.strip():
+        yield buffer.strip()
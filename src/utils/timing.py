@@ -0,0 +1,49 @@
+"""Startup phase timing and latency statistics"""
+import time
+from contextlib import contextmanager
+from typing import Awaitable, Dict, Sequence, TypeVar
+from loguru import logger
+
+T = TypeVar("T")
+
+class StartupTimer:
+    """Collect per-phase startup timings; phases may overlap"""
+
+    def __init__(self):
+        self._start = time.perf_counter()
+        self.phases: Dict[str, float] = {}
+
+    @contextmanager
+    def phase(self, name: str):
+        """Time a synchronous phase"""
+        start = time.perf_counter()
+        try:
+            yield
+        finally:
+            self.phases[name] = time.perf_counter() - start
+
+    async def track(self, name: str, awaitable: Awaitable[T]) -> T:
+        """Time an awaitable phase, e.g. one branch of asyncio.gather"""
+        start = time.perf_counter()
+        try:
+            return await awaitable
+        finally:
+            self.phases[name] = time.perf_counter() - start
+
+    def report(self) -> str:
+        """Log and return the per-phase report"""
+        total = time.perf_counter() - self._start
+        parts = [f"{name} {seconds:.2f}s" for name, seconds in self.phases.items()]
+        summary = " | ".join(parts + [f"total {total:.2f}s"])
+        logger.info(f"Startup: {summary}")
+        return summary
+
+def percentile(values: Sequence[float], q: float) -> float:
+    """q-th percentile (0-100) by linear interpolation; 0.0 for no values"""
+    if not values:
+        return 0.0
+    ordered = sorted(values)
+    rank = (len(ordered) - 1) * q / 100
+    low = int(rank)
+    high = min(low + 1, len(ordered) - 1)
+    return ordered[low] + (ordered[high] - ordered[low]) * (rank - low)
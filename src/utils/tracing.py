@@ -0,0 +1,325 @@
+"""Per-turn stage tracing and metrics
+
+    async with tracer.turn("voice.turn"):
+        async with tracer.span("llm.complete"):
+            ...
+        tracer.count("llm.cache_hit")
+
+A turn gets an ID, and every span opened inside it (in the same task or
+tasks it starts) is recorded against that ID, so concurrent sessions
+never mix. Span durations feed one histogram per stage and counters
+track events such as retries and cache hits. prometheus() renders the
+Prometheus text format and snapshot() the same data as JSON, along with
+the breakdown of the most recent turns.
+
+When disabled, span() and turn() return a shared no-op and count() and
+observe() return at once.
+"""
+import itertools
+import threading
+import time
+import uuid
+from bisect import bisect_left
+from collections import deque
+from contextvars import ContextVar
+from typing import Dict, List, Optional
+from loguru import logger
+
+from constants import TRACE_BUCKETS, TRACE_RECENT_TURNS, TRACE_MAX_SPANS_PER_TURN
+
+_current_turn: ContextVar[Optional["Turn"]] = ContextVar("trace_turn", default=None)
+_current_span: ContextVar[Optional[int]] = ContextVar("trace_span", default=None)
+_span_ids = itertools.count(1)
+
+class Histogram:
+    """Fixed-bucket histogram of durations in seconds"""
+
+    __slots__ = ("bounds", "counts", "count", "sum")
+
+    def __init__(self, bounds=TRACE_BUCKETS):
+        self.bounds = bounds
+        self.counts = [0] * (len(bounds) + 1)
+        self.count = 0
+        self.sum = 0.0
+
+    def observe(self, seconds: float):
+        self.counts[bisect_left(self.bounds, seconds)] += 1
+        self.count += 1
+        self.sum += seconds
+
+    def cumulative(self) -> List[int]:
+        return list(itertools.accumulate(self.counts))
+
+    def quantile(self, q: float) -> Optional[float]:
+        """Upper bound of the bucket holding the q-th fraction (0-1)
+
+        None when that is the overflow bucket, which has no upper bound
+        (and float("inf") would not survive JSON encoding).
+        """
+        if not self.count:
+            return 0.0
+        rank = q * self.count
+        for bound, seen in zip(self.bounds, self.cumulative()):
+            if seen >= rank:
+                return bound
+        return None
+
+class Turn:
+    """Spans and counters recorded during one user turn"""
+
+    __slots__ = ("id", "name", "started", "origin", "duration", "spans", "counters", "dropped")
+
+    def __init__(self, name: str, turn_id: Optional[str] = None):
+        self.id = turn_id or uuid.uuid4().hex[:12]
+        self.name = name
+        self.started = time.time()
+        self.origin = time.perf_counter()
+        self.duration = 0.0
+        self.spans: List[dict] = []
+        self.counters: Dict[str, int] = {}
+        self.dropped = 0
+
+    def to_dict(self) -> dict:
+        return {
+            "turn_id": self.id,
+            "name": self.name,
+            "started": self.started,
+            "duration_ms": round(self.duration * 1000, 2),
+            "spans": self.spans,
+            "counters": self.counters,
+            "dropped_spans": self.dropped,
+        }
+
+class _NoopSpan:
+    """What span() and turn() return while tracing is off"""
+
+    turn_id = None
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        return False
+
+    async def __aenter__(self):
+        return self
+
+    async def __aexit__(self, *exc):
+        return False
+
+_NOOP = _NoopSpan()
+
+class Span:
+    """Timed stage; usable with both with and async with"""
+
+    __slots__ = ("tracer", "name", "turn", "id", "parent", "start", "_token")
+
+    def __init__(self, tracer: "Tracer", name: str):
+        self.tracer = tracer
+        self.name = name
+
+    @property
+    def turn_id(self) -> Optional[str]:
+        return self.turn.id if self.turn else None
+
+    def __enter__(self):
+        self.turn = _current_turn.get()
+        self.id = next(_span_ids)
+        self.parent = _current_span.get()
+        self._token = _current_span.set(self.id)
+        self.start = time.perf_counter()
+        return self
+
+    def __exit__(self, exc_type, exc, tb):
+        elapsed = time.perf_counter() - self.start
+        _current_span.reset(self._token)
+        self.tracer._record(self, elapsed, exc_type is not None)
+        return False
+
+    async def __aenter__(self):
+        return self.__enter__()
+
+    async def __aexit__(self, exc_type, exc, tb):
+        return self.__exit__(exc_type, exc, tb)
+
+class TurnScope(Span):
+    """Outermost span of a turn; starts the Turn the inner spans attach to"""
+
+    __slots__ = ("_turn_id", "_turn_token")
+
+    def __init__(self, tracer: "Tracer", name: str, turn_id: Optional[str] = None):
+        super().__init__(tracer, name)
+        self._turn_id = turn_id
+
+    def __enter__(self):
+        self._turn_token = _current_turn.set(Turn(self.name, self._turn_id))
+        return super().__enter__()
+
+    def __exit__(self, exc_type, exc, tb):
+        super().__exit__(exc_type, exc, tb)
+        _current_turn.reset(self._turn_token)
+        self.turn.duration = time.perf_counter() - self.start
+        self.tracer._finish_turn(self.turn, self.id)
+        return False
+
+class Tracer:
+    """Collects stage histograms, event counters and recent turns"""
+
+    def __init__(self, enabled: bool = True, recent_turns: int = TRACE_RECENT_TURNS):
+        self.enabled = enabled
+        self.histograms: Dict[str, Histogram] = {}
+        self.counters: Dict[str, int] = {}
+        self.recent: deque = deque(maxlen=recent_turns)
+        # Spans may close on worker threads
+        self._lock = threading.Lock()
+
+    def configure(self, enabled: bool, recent_turns: int = TRACE_RECENT_TURNS):
+        self.enabled = enabled
+        self.recent = deque(self.recent, maxlen=recent_turns)
+
+    def turn(self, name: str = "turn", turn_id: Optional[str] = None):
+        """Start a turn, or just a span when one is already active"""
+        if not self.enabled:
+            return _NOOP
+        if _current_turn.get() is not None:
+            return Span(self, name)
+        return TurnScope(self, name, turn_id)
+
+    def span(self, name: str):
+        """Time one stage of the current turn"""
+        if not self.enabled:
+            return _NOOP
+        return Span(self, name)
+
+    def count(self, event: str, n: int = 1):
+        """Count an event such as a retry or cache hit"""
+        if not self.enabled:
+            return
+        turn = _current_turn.get()
+        with self._lock:
+            self.counters[event] = self.counters.get(event, 0) + n
+            if turn is not None:
+                turn.counters[event] = turn.counters.get(event, 0) + n
+
+    def observe(self, stage: str, seconds: float):
+        """Record a duration measured elsewhere, e.g. time to first audio"""
+        if not self.enabled:
+            return
+        turn = _current_turn.get()
+        with self._lock:
+            self._histogram(stage).observe(seconds)
+            if turn is not None:
+                self._attach(turn, {
+                    "name": stage, "parent": _current_span.get(),
+                    "duration_ms": round(seconds * 1000, 2),
+                })
+
+    @staticmethod
+    def current_turn_id() -> Optional[str]:
+        turn = _current_turn.get()
+        return turn.id if turn else None
+
+    def _histogram(self, stage: str) -> Histogram:
+        histogram = self.histograms.get(stage)
+        if histogram is None:
+            histogram = self.histograms[stage] = Histogram()
+        return histogram
+
+    def _attach(self, turn: Turn, record: dict):
+        if len(turn.spans) < TRACE_MAX_SPANS_PER_TURN:
+            turn.spans.append(record)
+        else:
+            turn.dropped += 1
+
+    def _record(self, span: Span, elapsed: float, failed: bool):
+        with self._lock:
+            self._histogram(span.name).observe(elapsed)
+            if failed:
+                event = f"{span.name}.error"
+                self.counters[event] = self.counters.get(event, 0) + 1
+            if span.turn is not None:
+                self._attach(span.turn, {
+                    "id": span.id,
+                    "parent": span.parent,
+                    "name": span.name,
+                    "start_ms": round((span.start - span.turn.origin) * 1000, 2),
+                    "duration_ms": round(elapsed * 1000, 2),
+                    "error": failed,
+                })
+
+    def _finish_turn(self, turn: Turn, root: int):
+        with self._lock:
+            self.recent.append(turn)
+        # Built only if a sink takes DEBUG
+        stages = lambda: " | ".join(
+            f"{span['name']} {span['duration_ms']:.0f}ms"
+            for span in turn.spans if span.get("parent") == root
+        )
+        logger.opt(lazy=True).debug(
+            "Turn {} {:.0f}ms: {}", lambda: turn.id, lambda: turn.duration * 1000, stages
+        )
+
+    def snapshot(self, turns: int = 10) -> dict:
+        """Histograms, counters and the last few turns as JSON-ready data"""
+        with self._lock:
+            stages = {
+                name: {
+                    "count": h.count,
+                    "sum_s": round(h.sum, 6),
+                    "mean_ms": round(h.sum / h.count * 1000, 2) if h.count else 0.0,
+                    "p50_le_s": h.quantile(0.50),
+                    "p95_le_s": h.quantile(0.95),
+                    "p99_le_s": h.quantile(0.99),
+                    "buckets": dict(zip([*map(str, h.bounds), "+Inf"], h.cumulative())),
+                }
+                for name, h in sorted(self.histograms.items())
+            }
+            recent = [turn.to_dict() for turn in list(self.recent)[-turns:]] if turns else []
+            return {
+                "enabled": self.enabled,
+                "stages": stages,
+                "counters": dict(sorted(self.counters.items())),
+                "recent_turns": recent,
+            }
+
+    def prometheus(self, prefix: str = "voice_agent") -> str:
+        """Histograms and counters in the Prometheus text exposition format"""
+        with self._lock:
+            lines = [
+                f"# HELP {prefix}_stage_seconds Time spent in each pipeline stage",
+                f"# TYPE {prefix}_stage_seconds histogram",
+            ]
+            for name, h in sorted(self.histograms.items()):
+                label = _escape(name)
+                for bound, seen in zip([*map(str, h.bounds), "+Inf"], h.cumulative()):
+                    lines.append(
+                        f'{prefix}_stage_seconds_bucket{{stage="{label}",le="{bound}"}} {seen}'
+                    )
+                lines.append(f'{prefix}_stage_seconds_sum{{stage="{label}"}} {h.sum:.6f}')
+                lines.append(f'{prefix}_stage_seconds_count{{stage="{label}"}} {h.count}')
+            lines += [
+                f"# HELP {prefix}_events_total Retries, cache hits and other counted events",
+                f"# TYPE {prefix}_events_total counter",
+            ]
+            for event, value in sorted(self.counters.items()):
+                lines.append(f'{prefix}_events_total{{event="{_escape(event)}"}} {value}')
+        return "\n".join(lines) + "\n"
+
+    def reset(self):
+        with self._lock:
+            self.histograms.clear()
+            self.counters.clear()
+            self.recent.clear()
+
+def _escape(value: str) -> str:
+    return value.replace("\\", "\\\\").replace('"', '\\"').replace("\n", "\\n")
+
+# Shared by every module; setup_tracing() applies Config
+tracer = Tracer()
+
+def setup_tracing(config) -> Tracer:
+    tracer.configure(
+        config.get("TRACING_ENABLED", True),
+        config.get("TRACE_RECENT_TURNS", TRACE_RECENT_TURNS)
+    )
+    return tracer
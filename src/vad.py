@@ -0,0 +1,90 @@
+"""Energy-based voice activity detection and endpointing"""
+from collections import deque
+from typing import Optional
+import numpy as np
+
+from constants import (
+    MAX_RECORDING_DURATION, VAD_FRAME_MS, VAD_SILENCE_MS, VAD_PRE_ROLL_MS,
+    VAD_MIN_SPEECH_MS, VAD_ENERGY_THRESHOLD, VAD_NOISE_RATIO
+)
+
+class Endpointer:
+    """Decide when an utterance has started and ended
+    
+    Feed mono float32 blocks of any size; feed() returns True once speech
+    has been followed by silence_ms of quiet or max_duration is reached.
+    Leading silence beyond a short pre-roll is dropped.
+    """
+
+    def __init__(
+        self,
+        sample_rate: int,
+        silence_ms: int = VAD_SILENCE_MS,
+        max_duration: float = MAX_RECORDING_DURATION,
+        energy_threshold: float = VAD_ENERGY_THRESHOLD,
+        frame_ms: int = VAD_FRAME_MS
+    ):
+        self.frame_size = int(sample_rate * frame_ms / 1000)
+        self.energy_threshold = energy_threshold
+        self.max_frames = int(max_duration * 1000 / frame_ms)
+        self.silence_frames = max(1, silence_ms // frame_ms)
+        self.min_speech_frames = max(1, VAD_MIN_SPEECH_MS // frame_ms)
+
+        self._pending = np.zeros(0, dtype=np.float32)
+        self._pre_roll = deque(maxlen=max(1, VAD_PRE_ROLL_MS // frame_ms))
+        self._voiced = []
+        self._noise_floor: Optional[float] = None
+        self._frames_seen = 0
+        self._speech_run = 0
+        self._silence_run = 0
+        self.speech_started = False
+        self.done = False
+
+    def feed(self, block: np.ndarray) -> bool:
+        """Consume a block of samples; True when the utterance is complete"""
+        if self.done:
+            return True
+        self._pending = np.concatenate([self._pending, np.asarray(block, dtype=np.float32).ravel()])
+        while len(self._pending) >= self.frame_size and not self.done:
+            frame = self._pending[:self.frame_size]
+            self._pending = self._pending[self.frame_size:]
+            self._process_frame(frame)
+        return self.done
+
+    def audio(self) -> np.ndarray:
+        """Captured utterance with leading silence trimmed"""
+        if not self._voiced:
+            return np.zeros(0, dtype=np.float32)
+        return np.concatenate(self._voiced)
+
+    def _is_speech(self, frame: np.ndarray) -> bool:
+        rms = float(np.sqrt(np.mean(frame * frame)))
+        floor = self._noise_floor if self._noise_floor is not None else rms
+        speech = rms > max(self.energy_threshold, floor * VAD_NOISE_RATIO)
+        if not speech:
+            # Track background noise so a noisy room doesn't count as speech
+            self._noise_floor = rms if self._noise_floor is None else 0.95 * floor + 0.05 * rms
+        return speech
+
+    def _process_frame(self, frame: np.ndarray):
+        self._frames_seen += 1
+        speech = self._is_speech(frame)
+
+        if not self.speech_started:
+            self._pre_roll.append(frame)
+            self._speech_run = self._speech_run + 1 if speech else 0
+            if self._speech_run >= self.min_speech_frames:
+                self.speech_started = True
+                self._voiced.extend(self._pre_roll)
+                self._pre_roll.clear()
+        else:
+            self._voiced.append(frame)
+            self._silence_run = 0 if speech else self._silence_run + 1
+            if self._silence_run >= self.silence_frames:
+                # Keep a little trailing silence, drop the rest
+                keep = len(self._voiced) - self._silence_run + self._pre_roll.maxlen
+                self._voiced = self._voiced[:keep]
+                self.done = True
+
+        if self._frames_seen >= self.max_frames:
+            self.done = True
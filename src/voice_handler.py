@@ -1,108 +1,305 @@
-"""Voice Handler with proper resource management"""
-import whisper
-from gtts import gTTS
-import sounddevice as sd
+"""Voice Handler with proper resource management
+
+The STT and TTS engines and sounddevice are imported where first
+used so that importing this module stays cheap.
+"""
 import soundfile as sf
-from pydub import AudioSegment
-from pydub.playback import play
 from loguru import logger
-from pathlib import Path
+from concurrent.futures import ThreadPoolExecutor
+from typing import AsyncIterable, AsyncIterator, Iterable, Optional, Tuple
+import numpy as np
+import asyncio
 import atexit
+import time
 
-from constants import MAX_RECORDING_DURATION, SAMPLE_RATE
+from constants import (
+    MAX_RECORDING_DURATION, SAMPLE_RATE, VAD_FRAME_MS,
+    VAD_SILENCE_MS, VAD_ENERGY_THRESHOLD
+)
 from exceptions import VoiceInputError
+from tts_cache import TTSCache
+from tts_backends import create_tts_backend
+from stt_backends import create_stt_backend
+from vad import Endpointer
+from utils.streaming import iter_sentences, text_chunks
+from utils.tracing import tracer
 
 class VoiceHandler:
-    """Handle voice input/output with cleanup"""
+    """Handle voice input/output without blocking the event loop"""
     
     def __init__(self, config):
         self.config = config
-        self.audio_dir = Path("data/audio")
-        self.audio_dir.mkdir(parents=True, exist_ok=True)
-        
-        model_size = config.get("WHISPER_MODEL", "base")
-        logger.info(f"Loading Whisper model: {model_size}...")
-        self.whisper_model = whisper.load_model(model_size)
-        logger.info("Whisper loaded")
+        self.stt = create_stt_backend(config)
+        self._loading: Optional[asyncio.Future] = None
         
         self.sample_rate = SAMPLE_RATE
-        self.duration = MAX_RECORDING_DURATION
+        self.max_duration = config.get("MAX_RECORDING_DURATION", MAX_RECORDING_DURATION)
+        self.silence_ms = config.get("VAD_SILENCE_MS", VAD_SILENCE_MS)
+        self.energy_threshold = config.get("VAD_ENERGY_THRESHOLD", VAD_ENERGY_THRESHOLD)
+        self.block_size = int(self.sample_rate * VAD_FRAME_MS / 1000)
+        
+        # STT models are not thread-safe: one STT worker; TTS can overlap playback
+        self._stt_executor = ThreadPoolExecutor(max_workers=1, thread_name_prefix="stt")
+        self._tts_executor = ThreadPoolExecutor(max_workers=2, thread_name_prefix="tts")
+        self._output_stream = None
+        self._interrupted = False
+        self.tts = create_tts_backend(config)
+        self.tts_cache = TTSCache.from_config(config)
         
         # Register cleanup
         atexit.register(self.cleanup)
     
+    def start_loading(self) -> asyncio.Future:
+        """Load and warm up the STT model in the background (idempotent)"""
+        if self._loading is None:
+            loop = asyncio.get_running_loop()
+            self._loading = loop.run_in_executor(self._stt_executor, self.stt.load)
+        return self._loading
+    
     async def listen(self) -> str:
-        """Record and transcribe with error handling"""
-        audio_path = self.audio_dir / "user_input.wav"
-        
+        """Record from the microphone until the speaker stops, then transcribe"""
+        print("Listening... (speak now)")
+        return await self._listen(self._microphone_blocks())
+    
+    async def listen_from_wav(self, path: str) -> str:
+        """Run a recorded WAV through the same capture path as the microphone"""
+        return await self._listen(self._wav_blocks(path))
+    
+    async def _listen(self, blocks: AsyncIterable[np.ndarray]) -> str:
+        """Endpoint and transcribe with error handling"""
         try:
-            print("Recording... (5 seconds)")
-            
-            audio_data = sd.rec(
-                int(self.duration * self.sample_rate),
-                samplerate=self.sample_rate,
-                channels=1,
-                dtype='float32'
-            )
-            sd.wait()
+            async with tracer.span("voice.capture"):
+                audio_data = await self._capture(blocks)
+            if audio_data.size == 0:
+                logger.info("No speech detected")
+                return ""
             print("Processing...")
             
-            sf.write(audio_path, audio_data, self.sample_rate)
-            result = self.whisper_model.transcribe(
-                str(audio_path),
-                language='en',
-                fp16=False
-            )
-            
-            transcription = result["text"].strip()
+            async with tracer.span("voice.stt"):
+                await self.start_loading()
+                # Cancelling the await leaves the worker to finish in the background
+                loop = asyncio.get_running_loop()
+                transcription = await loop.run_in_executor(
+                    self._stt_executor, self._transcribe, audio_data
+                )
             logger.info(f"Transcribed: {transcription}")
             
             return transcription
-            
+        
         except Exception as e:
             logger.error(f"Voice input error: {e}")
             raise VoiceInputError(f"Failed to process voice input: {str(e)}")
+    
+    def _transcribe(self, audio_data: np.ndarray) -> str:
+        """Run the STT backend on a 16kHz float32 buffer (worker thread)"""
+        return self.stt.transcribe(audio_data)
+    
+    async def _capture(self, blocks: AsyncIterable[np.ndarray]) -> np.ndarray:
+        """Feed audio blocks through VAD until the utterance ends"""
+        endpointer = Endpointer(
+            self.sample_rate,
+            silence_ms=self.silence_ms,
+            max_duration=self.max_duration,
+            energy_threshold=self.energy_threshold
+        )
+        blocks = blocks.__aiter__()
+        try:
+            async for block in blocks:
+                if endpointer.feed(block):
+                    break
         finally:
-            # Cleanup temp file
-            if audio_path.exists():
-                try:
-                    audio_path.unlink()
-                except:
-                    pass
+            # Closing the generator stops the input stream
+            await blocks.aclose()
+        
+        audio = endpointer.audio()
+        logger.debug("Captured {:.2f}s of speech", len(audio) / self.sample_rate)
+        return audio
+    
+    async def _microphone_blocks(self) -> AsyncIterator[np.ndarray]:
+        """Yield microphone blocks handed over from the input stream callback"""
+        import sounddevice as sd
+        
+        loop = asyncio.get_running_loop()
+        blocks: asyncio.Queue = asyncio.Queue()
+        
+        def callback(indata, frames, time_info, status):
+            if status:
+                logger.debug("Input stream status: {}", status)
+            loop.call_soon_threadsafe(blocks.put_nowait, indata[:, 0].copy())
+        
+        with sd.InputStream(
+            samplerate=self.sample_rate,
+            channels=1,
+            dtype='float32',
+            blocksize=self.block_size,
+            callback=callback
+        ):
+            while True:
+                yield await asyncio.wait_for(blocks.get(), timeout=1.0)
+    
+    async def _wav_blocks(self, path: str) -> AsyncIterator[np.ndarray]:
+        """Yield a WAV file in microphone-sized blocks"""
+        audio, sample_rate = sf.read(path, dtype='float32', always_2d=True)
+        audio = audio[:, 0]
+        if sample_rate != self.sample_rate:
+            # Linear resample; fine for speech fixtures
+            positions = np.arange(0, len(audio), sample_rate / self.sample_rate)
+            audio = np.interp(positions, np.arange(len(audio)), audio).astype(np.float32)
+        for start in range(0, len(audio), self.block_size):
+            yield audio[start:start + self.block_size]
     
     async def speak(self, text: str):
-        """Convert text to speech with cleanup"""
-        audio_path = self.audio_dir / "agent_response.mp3"
+        """Convert text to speech, sentence by sentence"""
+        await self.speak_stream(text_chunks(text))
+    
+    async def speak_stream(self, chunks: AsyncIterable[str]):
+        """Speak a text stream, playing each sentence as soon as it is synthesized
+        
+        Synthesis of later sentences overlaps playback of earlier ones, so
+        time to first audio is roughly one sentence of work. Run it as a
+        task to keep working meanwhile; stop_speaking() or cancelling the
+        task cuts playback off immediately.
+        """
+        loop = asyncio.get_running_loop()
+        ready: asyncio.Queue = asyncio.Queue(maxsize=2)
+        self._interrupted = False
+        start = time.perf_counter()
+        first_audio = True
         
+        async def synthesize_all():
+            try:
+                async for sentence in iter_sentences(chunks):
+                    # Memory hits skip the worker thread entirely
+                    audio = self._cached(sentence, memory_only=True)
+                    if audio is None:
+                        async with tracer.span("voice.tts"):
+                            audio = await loop.run_in_executor(
+                                self._tts_executor, self._synthesize_cached, sentence
+                            )
+                    else:
+                        tracer.count("tts.cache_hit")
+                    await ready.put(audio)
+            except Exception:
+                await ready.put(None)
+                raise
+            # Not on cancellation: the consumer is gone and a full queue would never drain
+            await ready.put(None)
+        
+        producer = asyncio.create_task(synthesize_all())
         try:
             print("Speaking...")
+            while not self._interrupted:
+                audio = await ready.get()
+                if audio is None:
+                    break
+                if first_audio:
+                    tracer.observe("voice.first_audio", time.perf_counter() - start)
+                    first_audio = False
+                async with tracer.span("voice.playback"):
+                    await self._play(*audio)
             
-            tts = gTTS(text=text, lang='en', slow=False)
-            tts.save(str(audio_path))
-            
-            audio = AudioSegment.from_mp3(str(audio_path))
-            play(audio)
-            
-            logger.info("Audio playback complete")
-            
+            if self._interrupted:
+                logger.info("Audio playback interrupted")
+            else:
+                await producer
+                logger.info("Audio playback complete")
+        
         except Exception as e:
             logger.error(f"Voice output error: {e}")
         finally:
-            # Cleanup temp file
-            if audio_path.exists():
+            if not producer.done():
+                producer.cancel()
+    
+    def stop_speaking(self):
+        """Interrupt the current utterance"""
+        self._interrupted = True
+        if self._output_stream is not None:
+            self._output_stream.abort()
+    
+    async def presynthesize(self, texts: Iterable[str]):
+        """Fill the TTS cache for fixed replies so they play without synthesis"""
+        if self.tts_cache is None:
+            return
+        loop = asyncio.get_running_loop()
+        count = 0
+        for text in texts:
+            # Split exactly like speak() so the cache keys match
+            async for sentence in iter_sentences(text_chunks(text)):
                 try:
-                    audio_path.unlink()
-                except:
-                    pass
+                    await loop.run_in_executor(
+                        self._tts_executor, self._synthesize_cached, sentence
+                    )
+                    count += 1
+                except Exception as e:
+                    logger.warning(f"Pre-synthesis failed for {sentence!r}: {e}")
+        logger.info(f"Pre-synthesized {count} fixed sentences ({self.tts_cache.stats()})")
+    
+    def _cached(self, sentence: str, memory_only: bool = False) -> Optional[Tuple[np.ndarray, int]]:
+        if self.tts_cache is None:
+            return None
+        key = TTSCache.make_key(sentence, self.tts.voice_id, self.tts.language)
+        return self.tts_cache.get(key, memory_only=memory_only)
+    
+    def _synthesize_cached(self, sentence: str) -> Tuple[np.ndarray, int]:
+        """Disk cache, then synthesis; the result is cached (worker thread)"""
+        audio = self._cached(sentence)
+        if audio is not None:
+            tracer.count("tts.cache_hit")
+        else:
+            audio = self._synthesize(sentence)
+            if self.tts_cache is not None:
+                key = TTSCache.make_key(sentence, self.tts.voice_id, self.tts.language)
+                self.tts_cache.put(key, audio)
+        return audio
+    
+    def _synthesize(self, sentence: str) -> Tuple[np.ndarray, int]:
+        """Synthesize one sentence with the configured backend (worker thread)"""
+        return self.tts.synthesize(sentence)
+    
+    async def _play(self, pcm: np.ndarray, sample_rate: int):
+        """Play PCM from the audio callback; awaiting never blocks the loop"""
+        import sounddevice as sd
+        
+        loop = asyncio.get_running_loop()
+        finished = asyncio.Event()
+        position = 0
+        
+        def callback(outdata, frames, time_info, status):
+            nonlocal position
+            chunk = pcm[position:position + frames]
+            outdata[:len(chunk)] = chunk
+            position += len(chunk)
+            if len(chunk) < frames:
+                outdata[len(chunk):] = 0
+                raise sd.CallbackStop
+        
+        stream = sd.OutputStream(
+            samplerate=sample_rate,
+            channels=pcm.shape[1],
+            dtype='float32',
+            callback=callback,
+            finished_callback=lambda: loop.call_soon_threadsafe(finished.set)
+        )
+        self._output_stream = stream
+        try:
+            with stream:
+                await finished.wait()
+        except asyncio.CancelledError:
+            stream.abort()
+            raise
+        finally:
+            self._output_stream = None
     
     def cleanup(self):
         """Cleanup resources"""
         try:
-            # Clean audio directory
-            for file in self.audio_dir.glob("*.wav"):
-                file.unlink()
-            for file in self.audio_dir.glob("*.mp3"):
-                file.unlink()
+            self.stop_speaking()
+            self._stt_executor.shutdown(wait=False)
+            self._tts_executor.shutdown(wait=False)
+            if self.stt.utterances:
+                logger.info(f"STT stats: {self.stt.stats()}")
+            if self.tts.utterances:
+                logger.info(f"TTS stats: {self.tts.stats()}")
             logger.info("Voice handler cleaned up")
         except Exception as e:
             logger.error(f"Cleanup error: {e}")
@@ -0,0 +1,7 @@
+"""Modules use flat imports from src/; the fakes live in benchmarks/"""
+import sys
+from pathlib import Path
+
+ROOT = Path(__file__).resolve().parent.parent
+sys.path.insert(0, str(ROOT / "src"))
+sys.path.insert(0, str(ROOT / "benchmarks"))
@@ -0,0 +1,62 @@
+"""Bulk reminders resume from their checkpoint and only record confirmed sends"""
+import asyncio
+import json
+
+from bulk_reminders import BulkReminderRunner
+from fakes import FakeGroqProvider
+from models import Invoice
+
+def _invoice(invoice_id: str, customer: str) -> Invoice:
+    return Invoice(
+        id=invoice_id, customer_name=customer, customer_email=f"ap@{customer.lower()}.com",
+        amount=100.0, due_date="2024-01-01", status="past_due", days_overdue=30
+    )
+
+class RecordingMail:
+    """gmail/send_batch that confirms at most max_results messages"""
+
+    def __init__(self, max_results: int = 1000):
+        self.max_results = max_results
+        self.sent_to = []
+
+    async def call_tool(self, server, tool, params=None):
+        messages = params["messages"]
+        self.sent_to.extend(m["to"] for m in messages)
+        return [{"status": "sent", "to": m["to"]} for m in messages][:self.max_results]
+
+def _run(runner, invoices):
+    async def collect():
+        return [outcome async for outcome in runner.run(invoices)]
+    return asyncio.run(collect())
+
+def _runner(mail, checkpoint_path):
+    llm = FakeGroqProvider(latency=0.0, jitter=0.0)
+    return BulkReminderRunner(llm, mail, batch_size=10, checkpoint_path=str(checkpoint_path))
+
+def test_resume_skips_sent_invoices_and_reminds_new_ones(tmp_path):
+    checkpoint = tmp_path / "checkpoint.json"
+    checkpoint.write_text(json.dumps({
+        "run_id": "earlier", "created_at": 4e9, "sent_invoice_ids": ["inv_a", "inv_paid"]
+    }))
+    mail = RecordingMail()
+    # inv_paid was paid since; inv_c fell overdue since
+    outcomes = _run(_runner(mail, checkpoint), [_invoice("inv_a", "Acme"), _invoice("inv_c", "Gamma")])
+
+    assert [o.invoice_ids for o in outcomes] == [["inv_c"]]
+    assert mail.sent_to == ["ap@gamma.com"]
+
+def test_messages_without_a_result_are_failed_and_retried(tmp_path):
+    checkpoint = tmp_path / "checkpoint.json"
+    invoices = [_invoice("inv_a", "Acme"), _invoice("inv_b", "Beta")]
+    outcomes = _run(_runner(RecordingMail(max_results=1), checkpoint), invoices)
+
+    assert sorted(o.status for o in outcomes) == ["failed", "sent"]
+    unconfirmed = next(o for o in outcomes if o.status == "failed")
+    saved = json.loads(checkpoint.read_text())["sent_invoice_ids"]
+    assert unconfirmed.invoice_ids[0] not in saved
+
+    mail = RecordingMail()
+    retried = _run(_runner(mail, checkpoint), invoices)
+    assert [o.invoice_ids for o in retried] == [unconfirmed.invoice_ids]
+    assert retried[0].status == "sent"
+    assert not checkpoint.exists()
@@ -0,0 +1,40 @@
+"""Fast path: obvious commands resolve locally, anything that sends email stays careful"""
+import pytest
+
+from intent_classifier import LocalIntentClassifier
+
+@pytest.fixture
+def classifier():
+    classifier = LocalIntentClassifier(threshold=0.85)
+    classifier.set_customers(["Acme Corp", "Beta Industries"])
+    return classifier
+
+@pytest.mark.parametrize("text, intent, company", [
+    ("send a reminder to Acme Corp", "send_reminder", "Acme Corp"),
+    ("remind Beta Industries", "send_reminder", "Beta Industries"),
+    ("remind all overdue customers", "remind_all", None),
+    ("check invoices", "check_invoices", None),
+    ("show me the invoices", "check_invoices", None),
+    ("any overdue invoices?", "check_invoices", None),
+    ("show me the aging report", "aging_summary", None),
+])
+def test_obvious_commands_resolve(classifier, text, intent, company):
+    command = classifier.try_resolve(text)
+    assert command is not None
+    assert command.intent == intent
+    assert command.company_name == company
+
+@pytest.mark.parametrize("text", [
+    "what is the email for acme corp",
+    "did we email acme corp already",
+    "did we remind acme corp already?",
+    "don't send a reminder to acme corp",
+    "do not remind Beta Industries",
+    "should we remind all customers",
+    "do not remind all overdue customers",
+    "never remind everyone with overdue invoices",
+    "can you remind acme corp?",
+])
+def test_questions_and_negations_go_to_llm(classifier, text):
+    command = classifier.try_resolve(text)
+    assert command is None or command.intent not in ("send_reminder", "remind_all")
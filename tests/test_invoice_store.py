@@ -0,0 +1,137 @@
+"""Indexed ledger: lookups, paging and aggregates agree with a plain scan"""
+import asyncio
+import random
+from datetime import date
+
+import pytest
+
+from exceptions import ValidationError
+from invoice_batch import InvoiceBatch
+from invoice_store import InvoiceStore, generate_invoices
+from mcp_client_mock import MockMCPClient
+
+AS_OF = date(2024, 6, 30)
+
+@pytest.fixture
+def store():
+    return InvoiceStore.from_invoices(generate_invoices(500, seed=3, as_of=AS_OF), as_of=AS_OF)
+
+def _assert_matches(store, expected):
+    """Every index answers exactly what a scan of expected would"""
+    for status in ("past_due", "open", "paid", "void", None):
+        wanted = {i for i, inv in expected.items() if status is None or inv["status"] == status}
+        assert {row["id"] for row in store.list(status)} == wanted
+    for name in {inv["customer_name"] for inv in expected.values()}:
+        wanted = {i for i, inv in expected.items() if inv["customer_name"] == name}
+        assert {row["id"] for row in store.search(name)} == wanted
+    batch = store.batch()
+    assert len(batch) == len(expected)
+    for i in range(len(batch)):
+        record = batch.record(i)
+        assert record == store.get(record["id"])
+        assert (record["status"], record["customer_name"]) == (
+            expected[record["id"]]["status"], expected[record["id"]]["customer_name"]
+        )
+
+def test_indexes_stay_consistent_after_writes(store):
+    expected = {row["id"]: row for row in store.list()}
+    store.batch()  # build the columns so writes patch them
+    rng = random.Random(11)
+    ids = sorted(expected)
+    customers = sorted({(inv["customer_name"], inv["customer_email"]) for inv in expected.values()})
+    for step in range(300):
+        invoice_id = rng.choice(ids)
+        action = step % 4
+        if action == 0:
+            invoice = store.update_status(invoice_id, rng.choice(["past_due", "open", "paid"]))
+        elif action == 1:
+            # What record_payment does
+            invoice = store.update_status(invoice_id, "paid")
+        elif action == 2:
+            # Voiding is how Stripe removes a finalized invoice; the store has no hard delete
+            invoice = store.update_status(invoice_id, "void")
+        else:
+            name, email = rng.choice(customers)
+            invoice = store.add(dict(
+                expected[invoice_id], customer_name=name, customer_email=email, status="past_due"
+            ))
+        expected[invoice_id] = invoice
+    _assert_matches(store, expected)
+
+def test_paging_survives_status_changes_between_pages(store):
+    before = [row["id"] for row in store.list("past_due")]
+    others = [row["id"] for row in store.list("open")]
+    first = store.page("past_due", limit=20)
+    seen = [row["id"] for row in first["data"]]
+    cursor_row = int(first["next_cursor"])
+    ledger = [row["id"] for row in store.list()]
+    paid_early = seen[0]
+    paid_later = before[30]
+    due_later = next(i for i in others if ledger.index(i) > cursor_row)
+    due_earlier = next(i for i in others if ledger.index(i) < cursor_row)
+    for invoice_id, status in [
+        (paid_early, "paid"), (paid_later, "paid"), (due_later, "past_due"), (due_earlier, "past_due")
+    ]:
+        store.update_status(invoice_id, status)
+
+    cursor = first["next_cursor"]
+    while cursor:
+        page = store.page("past_due", limit=20, cursor=cursor)
+        seen.extend(row["id"] for row in page["data"])
+        cursor = page["next_cursor"]
+
+    assert len(seen) == len(set(seen))
+    unchanged = set(before) - {paid_early, paid_later}
+    assert unchanged <= set(seen)
+    assert paid_later not in seen
+    assert due_later in seen
+    # Behind the cursor already: picked up by the next listing, not this one
+    assert due_earlier not in seen
+
+def _scalar_buckets(rows):
+    buckets = {"0-30": [0, 0.0], "31-60": [0, 0.0], "61-90": [0, 0.0], "90+": [0, 0.0]}
+    for row in rows:
+        days = row["days_overdue"]
+        label = "0-30" if days <= 30 else "31-60" if days <= 60 else "61-90" if days <= 90 else "90+"
+        buckets[label][0] += 1
+        buckets[label][1] += row["amount"]
+    return {label: (count, round(total, 2)) for label, (count, total) in buckets.items()}
+
+@pytest.mark.parametrize("writes", [False, True])
+def test_aging_buckets_agree_with_the_scalar_summary(store, writes):
+    if writes:
+        store.batch()
+        for row in store.list("past_due")[:40]:
+            store.update_status(row["id"], "paid")
+        for row in store.list("open")[:40]:
+            store.update_status(row["id"], "past_due")
+    rows = store.list("past_due")
+    summary = store.summarize("past_due", top_n=len(rows))
+    aging = store.aging_summary("past_due", top_customers=None)
+
+    buckets = {b["label"]: (b["count"], b["total"]) for b in aging["buckets"]}
+    assert buckets == _scalar_buckets(rows)
+    assert (aging["count"], aging["total"]) == (summary["count"], summary["total"])
+    assert sum(count for count, _ in buckets.values()) == summary["count"]
+    assert sum(total for _, total in buckets.values()) == pytest.approx(summary["total"], abs=0.05)
+    # Built from plain records, not the store's columns
+    standalone = InvoiceBatch.from_records(rows).aging_buckets()
+    assert {b["label"]: (b["count"], b["total"]) for b in standalone} == buckets
+
+    balances = {}
+    for row in rows:
+        balances[row["customer_name"]] = balances.get(row["customer_name"], 0.0) + row["amount"]
+    assert {c["customer_name"]: c["total"] for c in aging["top_customers"]} == pytest.approx(
+        {name: round(total, 2) for name, total in balances.items()}, abs=0.01
+    )
+
+@pytest.mark.parametrize("cursor", ["abc", "-1", "1.5", 12])
+def test_malformed_cursor_is_rejected(store, cursor):
+    with pytest.raises(ValidationError):
+        store.page("past_due", limit=10, cursor=cursor)
+
+def test_mock_list_invoices_always_returns_a_page():
+    mcp = MockMCPClient({"MOCK_LEDGER_SIZE": 50})
+    page = asyncio.run(mcp.call_tool("stripe", "list_invoices", {"status": "past_due"}))
+    assert set(page) == {"data", "has_more", "next_cursor"}
+    assert [row["id"] for row in page["data"]] == [row["id"] for row in mcp.store.list("past_due")]
@@ -0,0 +1,87 @@
+"""Provider resilience against a seeded fake Groq: fallback, hedging, 429 requeues"""
+import asyncio
+import time
+
+import httpx
+import pytest
+from groq import RateLimitError
+
+from constants import GROQ_MODEL as PRIMARY, GROQ_RATE_LIMIT_REQUEUES, LLM_HEDGE_MIN_SAMPLES
+from exceptions import RateLimitedError
+from fakes import EMAIL_BODY, FakeGroqProvider
+from resilience import Deadline
+
+FALLBACK = "fallback-model"
+
+def _record_models(llm):
+    """Wrap _request to log which model each network call went to"""
+    models, request = [], llm._request
+
+    async def recorded(model, *args):
+        models.append(model)
+        return await request(model, *args)
+
+    llm._request = recorded
+    return models
+
+def test_failing_primary_falls_back_to_the_other_model():
+    llm = FakeGroqProvider(
+        latency=0.01, jitter=0.0, seed=1, error_rate=1.0, fallback_error_rate=0.0, fallback_model=FALLBACK
+    )
+    models = _record_models(llm)
+
+    answer = asyncio.run(llm.complete("Write a reminder", deadline=Deadline(3.0)))
+
+    assert answer == EMAIL_BODY
+    assert models[0] == PRIMARY
+    assert models[-1] == FALLBACK
+    assert llm.errors == models.count(PRIMARY)
+
+def test_tail_latency_call_is_hedged_within_the_deadline():
+    # Seed 3: the first call draws the tail, its hedged copy does not
+    llm = FakeGroqProvider(
+        latency=0.02, jitter=0.0, seed=3, tail_rate=0.5, tail_latency=1.0
+    )
+    for _ in range(LLM_HEDGE_MIN_SAMPLES):
+        llm.latencies[PRIMARY].record(0.02)
+    models = _record_models(llm)
+    deadline = Deadline(0.5)
+
+    start = time.perf_counter()
+    answer = asyncio.run(llm.complete("Write a reminder", deadline=deadline))
+    elapsed = time.perf_counter() - start
+
+    assert answer == EMAIL_BODY
+    assert models == [PRIMARY, PRIMARY]
+    assert elapsed < 0.5
+    assert deadline.remaining() > 0
+
+def _rate_limit() -> RateLimitError:
+    request = httpx.Request("POST", "https://api.groq.com/openai/v1/chat/completions")
+    response = httpx.Response(429, headers={"retry-after": "0"}, request=request)
+    return RateLimitError("rate limited", response=response, body=None)
+
+@pytest.mark.parametrize("limited, succeeds", [(2, True), (GROQ_RATE_LIMIT_REQUEUES, False)])
+def test_rate_limits_are_requeued_not_retried(limited, succeeds):
+    llm = FakeGroqProvider(latency=0.0, jitter=0.0)
+    calls = []
+
+    async def request(model, prompt, max_tokens, temperature):
+        calls.append(model)
+        if len(calls) <= limited:
+            raise _rate_limit()
+        return "ok", None
+
+    llm._request = request
+
+    async def run():
+        return await llm.complete("Write a reminder")
+
+    if succeeds:
+        assert asyncio.run(run()) == "ok"
+        assert len(calls) == limited + 1
+    else:
+        with pytest.raises(RateLimitedError):
+            asyncio.run(run())
+        # Requeued behind the scheduler's pause, never retried on top by tenacity
+        assert len(calls) == GROQ_RATE_LIMIT_REQUEUES
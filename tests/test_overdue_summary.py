@@ -0,0 +1,61 @@
+"""The in-process overdue summary tracks the ledger from aggregates and events"""
+import asyncio
+import random
+
+from mcp_client_mock import MockMCPClient
+from overdue_summary import OverdueSummary
+
+def _amounts(rows):
+    return [row["amount"] for row in rows]
+
+def test_events_keep_the_summary_equal_to_the_ledger():
+    mcp = MockMCPClient({"MOCK_LEDGER_SIZE": 2000})
+    summary = OverdueSummary(mcp, top_n=3)
+    rng = random.Random(7)
+    ids = [row["id"] for row in mcp.store.list()]
+
+    async def run():
+        await summary.ensure_fresh()
+        # Pay off the largest first so the kept top list runs out
+        for row in mcp.store.summarize("past_due", top_n=8)["top"]:
+            await mcp.call_tool("stripe", "record_payment", {"id": row["id"]})
+        for _ in range(500):
+            status = rng.choice(["paid", "past_due", "open"])
+            await mcp.call_tool("stripe", "update_invoice", {"id": rng.choice(ids), "status": status})
+        await summary.ensure_fresh()
+
+    asyncio.run(run())
+    expected = mcp.store.summarize("past_due", top_n=3)
+    snapshot = summary.snapshot(3)
+    assert snapshot["count"] == expected["count"]
+    assert abs(snapshot["total"] - expected["total"]) < 0.01
+    assert _amounts(snapshot["top"]) == _amounts(expected["top"])
+    debtors = mcp.store.aging_summary("past_due", top_customers=3)["top_customers"]
+    assert [c["customer_name"] for c in summary.top_debtors(3)] == [c["customer_name"] for c in debtors]
+    assert summary.refreshes == 2
+
+class PollingMCP:
+    """No subscribe(), like the HTTP MCPClient; records the tools called"""
+
+    def __init__(self, mcp):
+        self._mcp = mcp
+        self.tools = []
+
+    async def call_tools(self, calls, return_exceptions=False):
+        self.tools.extend(tool for _, tool, _ in calls)
+        return await self._mcp.call_tools(calls, return_exceptions)
+
+def test_polling_reseeds_from_aggregates_without_listing_invoices():
+    mcp = PollingMCP(MockMCPClient({"MOCK_LEDGER_SIZE": 2000}))
+    summary = OverdueSummary(mcp, ttl=0.0, top_n=3)
+
+    async def run():
+        await summary.ensure_fresh()
+        await asyncio.sleep(0.01)
+        await summary.ensure_fresh()
+
+    asyncio.run(run())
+    assert not summary.live
+    assert summary.refreshes == 2
+    assert "list_invoices" not in mcp.tools
+    assert summary.snapshot(3)["count"] == mcp._mcp.store.summarize("past_due")["count"]
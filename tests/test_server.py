@@ -0,0 +1,21 @@
+"""Request validation in AgentServer.handle"""
+import asyncio
+
+import pytest
+
+from agent import InvoiceAgent
+from fakes import FakeGroqProvider
+from mcp_client_mock import MockMCPClient
+from server import AgentServer
+
+@pytest.fixture
+def server():
+    config = {"MOCK_LEDGER_SIZE": 20}
+    agent = InvoiceAgent(config, llm=FakeGroqProvider(latency=0.0), mcp=MockMCPClient(config))
+    return AgentServer(agent, config, port=0)
+
+@pytest.mark.parametrize("body", [None, [], "hello", 42, {"text": 5}])
+def test_message_body_must_be_an_object_with_text(server, body):
+    status, payload = asyncio.run(server.handle("POST", "/sessions/abc/messages", body))
+    assert status == 400
+    assert "error" in payload
@@ -0,0 +1,69 @@
+"""Generated replies are spoken sentence by sentence while the LLM is still streaming"""
+import asyncio
+import atexit
+import time
+
+from fakes import SPOKEN_ANSWER, FakeGroqProvider, FakeTTSBackend
+from prompts.system_prompts import SystemPrompts
+from voice_handler import VoiceHandler
+
+def test_first_sentence_is_synthesized_before_the_stream_finishes():
+    llm = FakeGroqProvider(latency=0.01, jitter=0.0, seed=1, token_interval=0.02)
+    voice = VoiceHandler({"STT_BACKEND": "fake", "TTS_BACKEND": "fake", "TTS_CACHE_ENABLED": False})
+    voice.tts = FakeTTSBackend(rtf=0.0)
+    synthesized = []
+    synthesize = voice.tts.synthesize
+
+    def timed_synthesize(text):
+        synthesized.append((time.perf_counter(), text))
+        return synthesize(text)
+
+    async def play(pcm, sample_rate):
+        pass
+
+    voice.tts.synthesize = timed_synthesize
+    voice._play = play
+    streamed = []
+
+    async def reply():
+        prompt = SystemPrompts.SPOKEN_REPLY.format(context="", user_input="what can you do")
+        async for token in llm.stream(prompt, max_tokens=120, fallback="Sorry."):
+            streamed.append(token)
+            yield token
+        streamed.append(time.perf_counter())
+
+    try:
+        asyncio.run(voice.speak_stream(reply()))
+    finally:
+        voice.cleanup()
+        atexit.unregister(voice.cleanup)
+
+    stream_end = streamed.pop()
+    assert "".join(streamed) == SPOKEN_ANSWER
+    assert len(synthesized) == 2
+    first_at, first_sentence = synthesized[0]
+    assert first_sentence == SPOKEN_ANSWER.split(". ")[0] + "."
+    assert first_at < stream_end
+
+def test_failed_playback_does_not_leave_the_synthesizer_blocked():
+    voice = VoiceHandler({"STT_BACKEND": "fake", "TTS_BACKEND": "fake", "TTS_CACHE_ENABLED": False})
+    voice.tts = FakeTTSBackend(rtf=0.0)
+
+    async def play(pcm, sample_rate):
+        # Let synthesis fill the queue before playback fails
+        await asyncio.sleep(0.05)
+        raise RuntimeError("output device lost")
+
+    voice._play = play
+
+    async def run():
+        await asyncio.wait_for(voice.speak("One. Two. Three. Four. Five. Six."), 2)
+        await asyncio.sleep(0.05)
+        return [task for task in asyncio.all_tasks() if task is not asyncio.current_task()]
+
+    try:
+        leftover = asyncio.run(run())
+    finally:
+        voice.cleanup()
+        atexit.unregister(voice.cleanup)
+    assert leftover == []
@@ -0,0 +1,47 @@
+"""WAV fixtures go through the microphone's endpointing path to the STT backend"""
+import asyncio
+import atexit
+
+import numpy as np
+import soundfile as sf
+
+from constants import SAMPLE_RATE
+from fakes import FakeSTTBackend
+from fixtures import load_fixtures
+from voice_handler import VoiceHandler
+
+class RecordingSTT(FakeSTTBackend):
+    """Keeps the utterances it was asked to transcribe, warm-up excluded"""
+
+    def __init__(self):
+        super().__init__(speed=1000.0)
+        self.utterances_heard = []
+
+    def transcribe(self, audio):
+        self.utterances_heard.append(audio)
+        return super().transcribe(audio)
+
+def test_wav_fixture_is_endpointed_and_transcribed(tmp_path):
+    fixtures = load_fixtures(tmp_path)
+    assert len(fixtures) >= 1 and (tmp_path / "fixtures.json").exists()
+    path, transcript = fixtures[0]
+    voice = VoiceHandler({"STT_BACKEND": "fake", "TTS_BACKEND": "fake", "TTS_CACHE_ENABLED": False})
+    voice.stt = RecordingSTT()
+    voice.stt.transcript = transcript
+
+    try:
+        text = asyncio.run(voice.listen_from_wav(str(path)))
+    finally:
+        voice.cleanup()
+        atexit.unregister(voice.cleanup)
+
+    assert text == transcript
+    [utterance] = voice.stt.utterances_heard
+    assert utterance.dtype == np.float32
+    recorded = sf.info(str(path)).duration
+    heard = len(utterance) / SAMPLE_RATE
+    # The fixture's voiced burst, as generated for this many words
+    voiced = 0.35 * len(transcript.split()) + 0.2
+    assert voiced * 0.9 <= heard < recorded - 0.3
+    # Loud where the burst is, so the lead-in noise was not what triggered it
+    assert np.abs(utterance).max() > 0.1